@@ -10,6 +10,8 @@ import time
 from supabase import create_client
 import google.generativeai as genai
 
+from llm_response_cache import get_response_cache
+
 # Load environment - try multiple sources
 from dotenv import load_dotenv
 
@@ -69,8 +71,13 @@ Example output: ["elon musk", "tesla", "electric vehicles", "stock market", "tec
 
 Return ONLY the JSON array, no other text:"""
 
-        response = model.generate_content(prompt)
-        text = response.text.strip()
+        # Reruns of the backfill reuse earlier answers for the same article
+        cache = get_response_cache()
+        if cache is not None:
+            text = cache.get_or_call("gemini-2.5-flash-lite", {'prompt': prompt}, 30 * 24 * 3600,
+                                     lambda: model.generate_content(prompt).text).strip()
+        else:
+            text = model.generate_content(prompt).text.strip()
         
         # Clean up response
         if text.startswith("```"):
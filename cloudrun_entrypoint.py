@@ -21,6 +21,10 @@ RUN_LOCK_TIMEOUT_MINUTES = 30
 # if 03:00 and 03:20 both fall inside the window on reboot / clock drift.
 CLUSTER_REBUILD_HOUR_UTC = 3
 CLUSTER_REBUILD_MIN_AGE_HOURS = 22
+# Nightly rebuilds are incremental (warm-start from current centroids, only
+# changed articles rewritten); a full k-means rebuild runs once a week to
+# undo drift. Monday=0 ... Sunday=6.
+CLUSTER_FULL_REBUILD_WEEKDAY = 6
 
 
 def should_rebuild_clusters(supabase) -> bool:
@@ -55,11 +59,14 @@ def run_cluster_rebuild():
         print(f"🗂️  NIGHTLY CLUSTER REBUILD starting at {datetime.now(timezone.utc).isoformat()}")
         print("=" * 60)
         from services.global_cluster_builder import main as rebuild_main
-        # global_cluster_builder.main() uses argparse; fake empty args so it
-        # runs in default (full-rebuild) mode.
+        # global_cluster_builder.main() uses argparse; fake args so it runs
+        # a full rebuild on the weekly day and an incremental one otherwise.
+        argv = ['global_cluster_builder.py']
+        if datetime.now(timezone.utc).weekday() != CLUSTER_FULL_REBUILD_WEEKDAY:
+            argv.append('--incremental')
         saved_argv = sys.argv
         try:
-            sys.argv = ['global_cluster_builder.py']
+            sys.argv = argv
             rebuild_main()
         finally:
             sys.argv = saved_argv
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+CLUSTER PROCESSING CHECKPOINTS
+==========================================
+Purpose: Persist each step's output for a cluster so a retried cluster
+         resumes from its last valid step instead of starting over.
+
+A worker that dies (or a cluster that fails) after synthesis and component
+generation used to lose all of that paid work; the next cycle fetched,
+synthesized and generated everything again. Now process_single_cluster
+saves a checkpoint after each expensive step (full-text fetch, image
+selection, source validation, synthesis, component selection, context
+search, component generation, verification) to the cluster_checkpoints
+table (migration 081).
+
+Validity is a hash chain:
+  - The chain starts from a hash of the cluster's sources (IDs + URLs), so
+    a cluster that gained or lost sources starts from scratch.
+  - Each checkpoint stores the chain hash it was computed from. Loading it
+    extends the chain with the hash of its payload, so a checkpoint is only
+    reused if every step before it was reused (or recomputed identically).
+  - Checkpoints older than max_age_hours are ignored.
+
+Checkpoints are deleted once the cluster is published or fails for a
+reason a retry with the same sources would hit again (no content, no image,
+duplicate, failed verification, ...); only crashes and API errors keep
+them. prune(), run at the end of every cycle, deletes the rows older than
+max_age_hours left by clusters that were never retried.
+CLUSTER_CHECKPOINTS=0 disables saving and resuming.
+
+Usage:
+    checkpoints = get_checkpoint_store().session(cluster_id, cluster_sources)
+    fetched = checkpoints.resume('fetch')
+    if fetched is None:
+        fetched = ...expensive step...
+        checkpoints.save('fetch', fetched)
+"""
+
+import hashlib
+import json
+import os
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional
+
+
+@dataclass
+class CheckpointConfig:
+    """Configuration for cluster checkpoints"""
+    table: str = 'cluster_checkpoints'
+    max_age_hours: float = 72.0  # Older checkpoints are ignored (sources/context go stale)
+
+
+def checkpoints_enabled() -> bool:
+    return os.getenv('CLUSTER_CHECKPOINTS', '1') != '0'
+
+
+def _digest(*parts: str) -> str:
+    h = hashlib.sha256()
+    for part in parts:
+        h.update(part.encode('utf-8'))
+        h.update(b'\0')
+    return h.hexdigest()
+
+
+def _payload_hash(payload) -> str:
+    return _digest(json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str))
+
+
+def sources_hash(sources: List[Dict]) -> str:
+    """Input hash of a cluster: its source IDs and URLs."""
+    keys = sorted(f"{s.get('id')}|{s.get('url', '')}" for s in sources)
+    return _digest(*keys)
+
+
+class CheckpointSession:
+    """Checkpoints of one cluster for one processing attempt"""
+
+    def __init__(self, store: 'ClusterCheckpointStore', cluster_id: int, sources: List[Dict]):
+        self.store = store
+        self.cluster_id = cluster_id
+        self._chain = sources_hash(sources)
+        self._saved = store.load(cluster_id) if store.enabled else {}
+        self.resumed: List[str] = []
+        self._written = False
+
+    def resume(self, step: str):
+        """Payload of `step` if it was computed from the current chain, else None."""
+        row = self._saved.get(step)
+        if not row or row.get('input_hash') != self._chain:
+            return None
+        payload = row.get('payload')
+        self._chain = _digest(self._chain, _payload_hash(payload))
+        self.resumed.append(step)
+        return payload
+
+    def save(self, step: str, payload):
+        """Persist `step`'s output and extend the chain with it."""
+        input_hash = self._chain
+        self._chain = _digest(self._chain, _payload_hash(payload))
+        if self.store.enabled:
+            self.store.write(self.cluster_id, step, input_hash, payload)
+            self._written = True
+
+    def clear(self):
+        # Rows older than max_age_hours aren't loaded; prune() removes those
+        if self.store.enabled and (self._saved or self._written):
+            self.store.delete(self.cluster_id)
+
+
+class ClusterCheckpointStore:
+    """Supabase-backed checkpoint table access"""
+
+    def __init__(self, get_client: Callable, config: Optional[CheckpointConfig] = None):
+        self._get_client = get_client
+        self.config = config or CheckpointConfig()
+        self.enabled = checkpoints_enabled()
+
+    def session(self, cluster_id: int, sources: List[Dict]) -> CheckpointSession:
+        return CheckpointSession(self, cluster_id, sources)
+
+    def load(self, cluster_id: int) -> Dict[str, Dict]:
+        cutoff = (datetime.now(timezone.utc) - timedelta(hours=self.config.max_age_hours)).isoformat()
+        try:
+            result = self._get_client().table(self.config.table)\
+                .select('step, input_hash, payload')\
+                .eq('cluster_id', cluster_id)\
+                .gte('updated_at', cutoff)\
+                .execute()
+            return {row['step']: row for row in (result.data or [])}
+        except Exception as e:
+            print(f"   ⚠️ [Cluster {cluster_id}] Could not load checkpoints: {e}")
+            return {}
+
+    def write(self, cluster_id: int, step: str, input_hash: str, payload):
+        try:
+            self._get_client().table(self.config.table).upsert({
+                'cluster_id': cluster_id,
+                'step': step,
+                'input_hash': input_hash,
+                'payload': payload,
+                'updated_at': datetime.now(timezone.utc).isoformat(),
+            }, on_conflict='cluster_id,step').execute()
+        except Exception as e:
+            # A missing checkpoint only costs a recompute on retry
+            print(f"   ⚠️ [Cluster {cluster_id}] Could not save checkpoint '{step}': {e}")
+
+    def delete(self, cluster_id: int):
+        try:
+            self._get_client().table(self.config.table).delete().eq('cluster_id', cluster_id).execute()
+        except Exception as e:
+            print(f"   ⚠️ [Cluster {cluster_id}] Could not clear checkpoints: {e}")
+
+    def prune(self):
+        """Delete checkpoints too old to be resumed."""
+        if not self.enabled:
+            return
+        cutoff = (datetime.now(timezone.utc) - timedelta(hours=self.config.max_age_hours)).isoformat()
+        try:
+            self._get_client().table(self.config.table).delete().lt('updated_at', cutoff).execute()
+        except Exception as e:
+            print(f"   ⚠️ Could not prune cluster checkpoints: {e}")
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_checkpoint_store(get_client: Optional[Callable] = None) -> ClusterCheckpointStore:
+    """Process-wide store (the first caller supplies the client getter)."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            if get_client is None:
+                from supabase_pool import get_supabase_client as get_client
+            _store = ClusterCheckpointStore(get_client)
+        return _store
@@ -9,10 +9,10 @@ Rules:
   - Closed clusters don't accept new articles or updates
 """
 
-import os
 from typing import List, Dict, Optional
 from datetime import datetime, timedelta
-from supabase import create_client, Client
+from supabase import Client
+from supabase_pool import get_supabase_client
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -50,14 +50,8 @@ class ClusterLifecycleManager:
         self.config = LifecycleConfig()
     
     def _get_supabase_client(self) -> Client:
-        """Get Supabase client instance"""
-        url = os.getenv('SUPABASE_URL')
-        key = os.getenv('SUPABASE_SERVICE_KEY')
-        
-        if not url or not key:
-            raise ValueError("SUPABASE_URL and SUPABASE_SERVICE_KEY must be set")
-        
-        return create_client(url, key)
+        """Get the shared Supabase client instance"""
+        return get_supabase_client()
     
     def get_active_clusters(self) -> List[Dict]:
         """
@@ -139,12 +133,64 @@ class ClusterLifecycleManager:
         
         return hours_since_creation >= self.config.MAX_LIFETIME_HOURS
     
+    def count_active_clusters(self) -> int:
+        """
+        Count active clusters without fetching their rows.
+        
+        Returns:
+            Number of active clusters (0 on error)
+        """
+        try:
+            result = self.supabase.table('clusters').select(
+                'id', count='exact'
+            ).eq('status', 'active').limit(1).execute()
+            
+            return result.count or 0
+            
+        except Exception as e:
+            print(f"❌ Error counting active clusters: {e}")
+            return 0
+    
+    def close_clusters_older_than(self, column: str, cutoff: datetime, reason: str) -> List[Dict]:
+        """
+        Close every active cluster whose `column` is older than `cutoff`
+        in a single set-based UPDATE (filter evaluated server-side).
+        
+        Args:
+            column: Timestamp column to compare ('created_at' or 'last_updated_at')
+            cutoff: Clusters with column < cutoff are closed
+            reason: Reason for closure (for logging)
+            
+        Returns:
+            List of closed cluster rows (id, event_name)
+        """
+        try:
+            result = self.supabase.table('clusters').update({
+                'status': 'closed',
+                'closed_at': datetime.utcnow().isoformat()
+            }).eq('status', 'active').lt(column, cutoff.isoformat()).execute()
+            
+            closed = result.data if result.data else []
+            for cluster in closed:
+                event_name = (cluster.get('event_name') or '')[:50]
+                print(f"  ✓ Cluster {cluster['id']} closed: {reason} ({event_name})")
+            return closed
+            
+        except Exception as e:
+            print(f"❌ Error closing clusters ({reason}): {e}")
+            return []
+    
     def manage_lifecycle(self) -> Dict:
         """
-        Main lifecycle management: check all active clusters and close stale ones.
+        Main lifecycle management: close all stale active clusters.
+        
+        Eligibility is evaluated by Postgres, not row by row in Python:
+        one UPDATE closes clusters past MAX_LIFETIME_HOURS (priority rule),
+        a second closes the remaining ones past INACTIVITY_HOURS. Cost is
+        two round trips regardless of how many clusters expire at once.
         
         Returns:
-            Statistics dict
+            Statistics dict with per-reason counts
         """
         print(f"\n{'='*60}")
         print(f"CLUSTER LIFECYCLE MANAGEMENT")
@@ -158,49 +204,29 @@ class ClusterLifecycleManager:
         }
         
         try:
-            # Get all active clusters
-            clusters = self.get_active_clusters()
-            stats['active_clusters'] = len(clusters)
+            stats['active_clusters'] = self.count_active_clusters()
             
-            if not clusters:
+            if not stats['active_clusters']:
                 print("No active clusters found")
                 return stats
             
-            print(f"Checking {len(clusters)} active clusters...\n")
+            print(f"Checking {stats['active_clusters']} active clusters...\n")
             
-            for cluster in clusters:
-                cluster_id = cluster['id']
-                event_name = cluster['event_name'][:50]
-                
-                # Check max lifetime (priority check)
-                if self.check_max_lifetime(cluster):
-                    created_hours_ago = (
-                        datetime.utcnow() - 
-                        datetime.fromisoformat(cluster['created_at'].replace('Z', '+00:00')).replace(tzinfo=None)
-                    ).total_seconds() / 3600
-                    
-                    print(f"🕐 {event_name}")
-                    print(f"   Age: {created_hours_ago:.1f}h (max: {self.config.MAX_LIFETIME_HOURS}h)")
-                    
-                    if self.close_cluster(cluster_id, 'max_lifetime_reached'):
-                        stats['closed_max_lifetime'] += 1
-                        stats['total_closed'] += 1
-                    continue
-                
-                # Check inactivity
-                if self.check_inactivity(cluster):
-                    inactive_hours = (
-                        datetime.utcnow() - 
-                        datetime.fromisoformat(cluster['last_updated_at'].replace('Z', '+00:00')).replace(tzinfo=None)
-                    ).total_seconds() / 3600
-                    
-                    print(f"💤 {event_name}")
-                    print(f"   Inactive: {inactive_hours:.1f}h (limit: {self.config.INACTIVITY_HOURS}h)")
-                    
-                    if self.close_cluster(cluster_id, '36h_inactivity'):
-                        stats['closed_inactivity'] += 1
-                        stats['total_closed'] += 1
-                    continue
+            now = datetime.utcnow()
+            
+            # Max lifetime first so a cluster that is both old and idle is
+            # attributed to max_lifetime_reached, as before
+            lifetime_cutoff = now - timedelta(hours=self.config.MAX_LIFETIME_HOURS)
+            print(f"🕐 Closing clusters older than {self.config.MAX_LIFETIME_HOURS}h")
+            closed = self.close_clusters_older_than('created_at', lifetime_cutoff, 'max_lifetime_reached')
+            stats['closed_max_lifetime'] = len(closed)
+            
+            inactivity_cutoff = now - timedelta(hours=self.config.INACTIVITY_HOURS)
+            print(f"💤 Closing clusters inactive for {self.config.INACTIVITY_HOURS}h")
+            closed = self.close_clusters_older_than('last_updated_at', inactivity_cutoff, '36h_inactivity')
+            stats['closed_inactivity'] = len(closed)
+            
+            stats['total_closed'] = stats['closed_max_lifetime'] + stats['closed_inactivity']
             
             print(f"\n{'='*60}")
             print(f"LIFECYCLE MANAGEMENT COMPLETE")
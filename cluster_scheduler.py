@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+CLUSTER PRIORITY SCHEDULER
+==========================================
+Purpose: Decide which cluster a free worker should process next.
+
+Cluster jobs (Steps 2-11) used to be submitted in arbitrary order, so a
+breaking multi-source story could wait behind a dozen single-source ones.
+The scheduler orders jobs by expected value:
+  - source count (more outlets = bigger story)
+  - best Step 1 score among the sources
+  - recency of the newest source
+  - category quota (a category past its per-cycle quota is deprioritized)
+
+Jobs carry a deadline. A job still queued past its deadline, or whose
+newest source is older than stale_source_hours, is cancelled instead of
+processed, and reported through on_cancel(cluster_id, reason, details) so
+the caller can record why the cluster was skipped. Any job can also be
+cancelled explicitly by cluster ID.
+"""
+
+import heapq
+import itertools
+import math
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+
+
+# ==========================================
+# CONFIGURATION
+# ==========================================
+
+@dataclass
+class SchedulerConfig:
+    """Configuration for cluster job prioritization"""
+    source_weight: float = 1.0        # Per log(1 + source_count)
+    score_weight: float = 2.0         # Per (best Step 1 score / 1000)
+    recency_weight: float = 1.5       # Times exp(-age / recency_half_life)
+    recency_half_life_hours: float = 6.0
+    category_quota: int = 8           # Jobs per category per cycle before the penalty applies
+    over_quota_penalty: float = 1.5   # Subtracted once a category is over quota
+    max_queue_wait_s: float = 1800.0  # Deadline: cancel jobs queued longer than this
+    stale_source_hours: float = 48.0  # Cancel jobs whose newest source is older than this
+
+
+@dataclass
+class ClusterJob:
+    """One unit of Steps 2-11 work"""
+    cluster_id: int
+    source_count: int = 1
+    best_score: float = 0.0
+    newest_source_at: Optional[datetime] = None
+    category: str = 'Other'
+    deadline: float = 0.0              # time.time() after which the job is cancelled
+    priority: float = 0.0
+    cancelled: bool = False
+    enqueued_at: float = field(default_factory=time.time)
+
+
+def _parse_ts(value) -> Optional[datetime]:
+    """Parse a Supabase timestamp (naive values are treated as UTC)."""
+    if not value:
+        return None
+    try:
+        ts = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    return ts if ts.tzinfo else ts.replace(tzinfo=timezone.utc)
+
+
+def build_cluster_jobs(supabase_client, cluster_ids: List[int]) -> List[ClusterJob]:
+    """
+    Build jobs for cluster IDs from their source articles in one query.
+
+    Clusters whose sources can't be read still get a (low-priority) job,
+    so a metadata failure never drops work.
+    """
+    jobs = {cid: ClusterJob(cluster_id=cid) for cid in cluster_ids}
+    if not cluster_ids:
+        return []
+
+    try:
+        result = supabase_client.table('source_articles').select(
+            'cluster_id, score, category, published_at'
+        ).in_('cluster_id', list(cluster_ids)).execute()
+        rows = result.data or []
+    except Exception as e:
+        print(f"   ⚠️ Could not load cluster priorities (using FIFO order): {e}")
+        rows = []
+
+    counts = {}
+    categories = {}
+    for row in rows:
+        job = jobs.get(row.get('cluster_id'))
+        if job is None:
+            continue
+        counts[job.cluster_id] = counts.get(job.cluster_id, 0) + 1
+        job.best_score = max(job.best_score, float(row.get('score') or 0))
+        published = _parse_ts(row.get('published_at'))
+        if published and (job.newest_source_at is None or published > job.newest_source_at):
+            job.newest_source_at = published
+        cat = row.get('category') or 'Other'
+        categories.setdefault(job.cluster_id, {})
+        categories[job.cluster_id][cat] = categories[job.cluster_id].get(cat, 0) + 1
+
+    for cid, job in jobs.items():
+        job.source_count = counts.get(cid, 1)
+        if cid in categories:
+            job.category = max(categories[cid].items(), key=lambda kv: kv[1])[0]
+
+    return [jobs[cid] for cid in cluster_ids]
+
+
+# ==========================================
+# SCHEDULER
+# ==========================================
+
+class ClusterScheduler:
+    """
+    Thread-safe priority queue of ClusterJobs.
+
+    Producers call submit(); workers call get(), which blocks until a job is
+    available or the scheduler is closed and drained (then returns None).
+    on_cancel(cluster_id, reason, details) is called for every job dropped
+    for its deadline ('deadline_exceeded') or stale sources ('stale_sources').
+    """
+
+    def __init__(self, config: Optional[SchedulerConfig] = None,
+                 on_cancel: Optional[Callable[[int, str, str], None]] = None):
+        self.config = config or SchedulerConfig()
+        self.on_cancel = on_cancel
+        self._heap = []
+        self._counter = itertools.count()  # FIFO tie-break
+        self._jobs = {}                    # cluster_id -> queued ClusterJob
+        self._category_dispatched = {}
+        self._closed = False
+        self._cond = threading.Condition()
+        self.stats = {
+            'submitted': 0,
+            'dispatched': 0,
+            'cancelled_deadline': 0,
+            'cancelled_stale': 0,
+            'cancelled_manual': 0,
+        }
+
+    def score(self, job: ClusterJob) -> float:
+        """Expected value of processing `job` now (higher first)."""
+        cfg = self.config
+        value = cfg.source_weight * math.log1p(max(job.source_count, 1))
+        value += cfg.score_weight * (job.best_score / 1000.0)
+        if job.newest_source_at is not None:
+            age_h = (datetime.now(timezone.utc) - job.newest_source_at).total_seconds() / 3600
+            value += cfg.recency_weight * math.exp(-max(age_h, 0) / cfg.recency_half_life_hours)
+        if self._category_dispatched.get(job.category, 0) >= cfg.category_quota:
+            value -= cfg.over_quota_penalty
+        return value
+
+    def submit(self, job: ClusterJob) -> bool:
+        """Queue a job. Returns False if the cluster is already queued or closed."""
+        with self._cond:
+            if self._closed or job.cluster_id in self._jobs:
+                return False
+            if not job.deadline:
+                job.deadline = time.time() + self.config.max_queue_wait_s
+            job.priority = self.score(job)
+            self._jobs[job.cluster_id] = job
+            heapq.heappush(self._heap, (-job.priority, next(self._counter), job))
+            self.stats['submitted'] += 1
+            self._cond.notify()
+            return True
+
+    def submit_many(self, jobs: List[ClusterJob]) -> int:
+        return sum(1 for job in jobs if self.submit(job))
+
+    def cancel(self, cluster_id: int) -> bool:
+        """Cancel a queued job. Returns False if it is not queued."""
+        with self._cond:
+            job = self._jobs.get(cluster_id)
+            if job is None or job.cancelled:
+                return False
+            job.cancelled = True
+            self.stats['cancelled_manual'] += 1
+            return True
+
+    def close(self):
+        """No more submissions; get() returns None once the queue drains."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def _is_stale(self, job: ClusterJob) -> bool:
+        if job.newest_source_at is None:
+            return False
+        age_h = (datetime.now(timezone.utc) - job.newest_source_at).total_seconds() / 3600
+        return age_h > self.config.stale_source_hours
+
+    def get(self) -> Optional[ClusterJob]:
+        """Pop the highest-value live job (blocking)."""
+        dropped = []
+        try:
+            return self._pop(dropped)
+        finally:
+            # Reported outside the lock so a slow callback never blocks producers
+            if self.on_cancel is not None:
+                for cluster_id, reason, details in dropped:
+                    try:
+                        self.on_cancel(cluster_id, reason, details)
+                    except Exception as e:
+                        print(f"   ⚠️ Could not record cancellation of cluster {cluster_id}: {e}")
+
+    def _pop(self, dropped: List) -> Optional[ClusterJob]:
+        with self._cond:
+            while True:
+                while not self._heap and not self._closed:
+                    self._cond.wait()
+                if not self._heap:
+                    return None
+
+                neg_priority, _, job = heapq.heappop(self._heap)
+
+                # Category quota changes as jobs are dispatched; re-rank lazily
+                current = self.score(job)
+                if current < -neg_priority - 1e-9 and self._heap and -self._heap[0][0] > current:
+                    job.priority = current
+                    heapq.heappush(self._heap, (-current, next(self._counter), job))
+                    continue
+
+                del self._jobs[job.cluster_id]
+                if job.cancelled:
+                    continue
+                if time.time() > job.deadline:
+                    self.stats['cancelled_deadline'] += 1
+                    details = f"Queued {time.time() - job.enqueued_at:.0f}s, past the {self.config.max_queue_wait_s:.0f}s deadline"
+                    print(f"   ⏭️ Cluster {job.cluster_id} cancelled (queued past deadline)")
+                    dropped.append((job.cluster_id, 'deadline_exceeded', details))
+                    continue
+                if self._is_stale(job):
+                    self.stats['cancelled_stale'] += 1
+                    details = f"Newest source older than {self.config.stale_source_hours:.0f}h"
+                    print(f"   ⏭️ Cluster {job.cluster_id} cancelled (newest source older than {self.config.stale_source_hours:.0f}h)")
+                    dropped.append((job.cluster_id, 'stale_sources', details))
+                    continue
+
+                self._category_dispatched[job.category] = self._category_dispatched.get(job.category, 0) + 1
+                self.stats['dispatched'] += 1
+                return job
+
+
+def run_cluster_jobs(scheduler: ClusterScheduler, process_cluster, max_workers: int) -> Dict:
+    """
+    Drain `scheduler` with `max_workers` threads calling process_cluster(cluster_id).
+
+    Returns once the scheduler is closed and empty.
+
+    Returns:
+        Dict with succeeded/failed counts
+    """
+    results = {'succeeded': 0, 'failed': 0}
+    lock = threading.Lock()
+
+    def worker():
+        while True:
+            job = scheduler.get()
+            if job is None:
+                return
+            try:
+                ok = process_cluster(job.cluster_id)
+            except Exception as e:
+                print(f"   ❌ Cluster {job.cluster_id} exception: {e}")
+                ok = False
+            if ok:
+                print(f"   ✅ Cluster {job.cluster_id} completed successfully")
+            else:
+                print(f"   ⏭️ Cluster {job.cluster_id} skipped or failed")
+            with lock:
+                results['succeeded' if ok else 'failed'] += 1
+
+    threads = [threading.Thread(target=worker, name=f'cluster-worker-{i}', daemon=True)
+               for i in range(max_workers)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results
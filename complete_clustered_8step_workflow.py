@@ -20,7 +20,8 @@ Step 11: Article Tagging (countries + topics for personalization)
 import time
 import re
 import sys
-from datetime import datetime, timedelta
+import calendar
+from datetime import datetime, timedelta, timezone
 import feedparser
 import requests
 from concurrent.futures import ThreadPoolExecutor, as_completed
@@ -40,15 +41,21 @@ from step2_brightdata_full_article_fetching import BrightDataArticleFetcher, fet
 from step3_image_selection import select_best_image_for_cluster, ImageSelector
 from image_quality_checker import ImageQualityChecker, check_and_select_best_image
 # step4_multi_source_synthesis no longer used (was Claude-based, now using inline Gemini synthesis)
-from step5_gemini_component_selection import GeminiComponentSelector
+from step5_gemini_component_selection import GeminiComponentSelector, SelectionBatcher
 from step2_gemini_context_search import search_gemini_context
 from step6_7_claude_component_generation import GeminiComponentWriter
 from step8_fact_verification import FactVerifier
 from step10_article_scoring import score_article_with_references, get_reference_articles, generate_interest_tags
 from step11_article_tagging import tag_article
+from cluster_scheduler import ClusterScheduler, build_cluster_jobs, run_cluster_jobs
+from llm_gateway import get_gateway
+from source_evidence import pack_evidence, evidence_excerpt
+from source_poll_scheduler import SourcePollScheduler, adaptive_polling_enabled
 # Event detection paused (re-enable after app launch)
 # from step6_world_event_detection import detect_world_events
-from supabase import create_client
+from supabase_pool import get_supabase_client
+from pipeline_telemetry import get_telemetry
+from cluster_checkpoints import get_checkpoint_store
 import unicodedata
 
 # ==========================================
@@ -331,109 +338,24 @@ def build_typed_signals(article_countries, interest_tags, ner_result=None, langu
 
 # ==========================================
 # STEP 12: Trinity (KDD 2024) v2 two-level cluster assignment.
-# Reads the active codebook from vq_codebooks (header) + vq_centroids
-# (per-centroid pgvector rows), cached in-process for 5 min, and projects
-# each new article's MiniLM embedding into (vq_primary, vq_secondary).
+# The active codebook (vq_codebooks header + vq_centroids rows) is loaded
+# through vq_codebook.py: version-checked every 5 min, cached on disk as
+# .npy, and each new article's MiniLM embedding is projected into
+# (vq_primary, vq_secondary) with dot products against it.
 # Hierarchical k-means: 256 primary x 8 sub = 2048 secondary.
 # vq_secondary = vq_primary * 8 + nearest sub-cluster index within that primary.
 # ==========================================
 
-_VQ_CODEBOOK_CACHE = {'ts': 0, 'codebook': None}
-_VQ_CACHE_TTL_S = 300
-
-def _l2_normalize(vec):
-    import numpy as np
-    a = np.asarray(vec, dtype=np.float32)
-    n = float(np.linalg.norm(a))
-    if n == 0.0:
-        return a
-    return a / n
-
-def _load_active_codebook(supabase_client):
-    import time as _t
-    now = _t.time()
-    if _VQ_CODEBOOK_CACHE['codebook'] and (now - _VQ_CODEBOOK_CACHE['ts']) < _VQ_CACHE_TTL_S:
-        return _VQ_CODEBOOK_CACHE['codebook']
-    try:
-        # Header
-        resp = (supabase_client.table('vq_codebooks')
-                .select('id, version, parent_map, dim')
-                .eq('is_active', True)
-                .order('trained_at', desc=True)
-                .limit(1)
-                .execute())
-        rows = resp.data or []
-        if not rows:
-            return None
-        import numpy as np
-        cb = rows[0]
-        codebook_id = cb['id']
-        dim = cb['dim']
-        # Centroids (one row per)
-        cent_resp = (supabase_client.table('vq_centroids')
-                     .select('level, idx, vec')
-                     .eq('codebook_id', codebook_id)
-                     .execute())
-        cent_rows = cent_resp.data or []
-        if not cent_rows:
-            print(f"   ⚠️ [Trinity Step 12] codebook {codebook_id} has no centroid rows yet")
-            return None
-
-        def _parse_vec(v):
-            if isinstance(v, list):
-                return v
-            s = str(v).strip().lstrip('[').rstrip(']')
-            return [float(x) for x in s.split(',')] if s else []
-
-        l1_rows = [r for r in cent_rows if r['level'] == 1]
-        l2_rows = [r for r in cent_rows if r['level'] == 2]
-        l1_size = max((r['idx'] for r in l1_rows), default=-1) + 1
-        l2_size = max((r['idx'] for r in l2_rows), default=-1) + 1
-        l1 = np.zeros((l1_size, dim), dtype=np.float32)
-        l2 = np.zeros((l2_size, dim), dtype=np.float32)
-        for r in l1_rows:
-            l1[r['idx']] = _parse_vec(r['vec'])
-        for r in l2_rows:
-            l2[r['idx']] = _parse_vec(r['vec'])
-        cooked = {
-            'id': codebook_id,
-            'version': cb['version'],
-            'l1': l1,
-            'l2': l2,
-            'parent_map': cb['parent_map'],
-            'dim': dim,
-        }
-        _VQ_CODEBOOK_CACHE['ts'] = now
-        _VQ_CODEBOOK_CACHE['codebook'] = cooked
-        return cooked
-    except Exception as e:
-        print(f"   ⚠️ [Trinity Step 12] codebook fetch failed: {e}")
-        return None
-
 def assign_vq_clusters(embedding_minilm, supabase_client):
     """Project a 384-d MiniLM embedding into (vq_primary, vq_secondary)."""
     if embedding_minilm is None:
         return None, None
-    cb = _load_active_codebook(supabase_client)
+    from vq_codebook import get_vq_store
+    cb = get_vq_store(lambda: supabase_client).active()
     if cb is None:
         return None, None
     try:
-        import numpy as np
-        v = _l2_normalize(embedding_minilm)
-        if v.shape[0] != cb['dim']:
-            return None, None
-        # Level 1: nearest centroid
-        d1 = np.linalg.norm(cb['l1'] - v[None, :], axis=1)
-        c1 = int(np.argmin(d1))
-        # Level 2: nearest residual within this c1's 8 sub-slots
-        residual = v - cb['l1'][c1]
-        SUBCODEBOOK_K = 8
-        base = c1 * SUBCODEBOOK_K
-        sub_residuals = cb['l2'][base : base + SUBCODEBOOK_K]
-        d2 = np.linalg.norm(sub_residuals - residual[None, :], axis=1)
-        local = int(np.argmin(d2))
-        c2 = base + local
-        return c1, c2
+        return cb.project(embedding_minilm)
     except Exception as e:
         print(f"   ⚠️ [Trinity Step 12] projection failed: {e}")
         return None, None
@@ -499,82 +421,34 @@ load_dotenv()
 # CLUSTER STATUS TRACKING HELPERS
 # ============================================================================
 
-def get_supabase_client():
-    """Get Supabase client for status updates"""
-    url = os.getenv('NEXT_PUBLIC_SUPABASE_URL') or os.getenv('SUPABASE_URL')
-    key = os.getenv('SUPABASE_SERVICE_KEY') or os.getenv('SUPABASE_KEY')
-    return create_client(url, key)
-
 def update_cluster_status(cluster_id: int, status: str, failure_reason: str = None, 
                           failure_details: str = None, increment_attempt: bool = True):
     """
-    Update cluster publish_status and tracking fields.
+    Record a cluster publish_status change (buffered, see pipeline_telemetry).
     
     Args:
         cluster_id: The cluster ID
         status: 'pending', 'processing', 'published', 'failed', 'skipped'
         failure_reason: 'no_content', 'no_image', 'synthesis_failed', 
-                       'verification_failed', 'duplicate', 'api_error'
+                       'verification_failed', 'duplicate', 'api_error',
+                       'deadline_exceeded', 'stale_sources'
         failure_details: Detailed error message
         increment_attempt: Whether to increment attempt_count
     """
-    try:
-        supabase = get_supabase_client()
-        now = datetime.now().isoformat()
-        
-        # Build update data
-        update_data = {
-            'publish_status': status,
-            'last_attempt_at': now
-        }
-        
-        if failure_reason:
-            update_data['failure_reason'] = failure_reason
-        if failure_details:
-            update_data['failure_details'] = failure_details[:500]  # Limit length
-        
-        # Get current cluster data for history tracking
-        current = supabase.table('clusters').select('attempt_count, first_attempt_at, attempt_history').eq('id', cluster_id).execute()
-        
-        if current.data:
-            cluster_data = current.data[0]
-            current_attempt = cluster_data.get('attempt_count') or 0
-            
-            # Set first_attempt_at if this is the first attempt
-            if not cluster_data.get('first_attempt_at'):
-                update_data['first_attempt_at'] = now
-            
-            # Increment attempt count
-            if increment_attempt:
-                update_data['attempt_count'] = current_attempt + 1
-            
-            # Track if this is a recovery (previously failed, now published)
-            if status == 'published' and current_attempt > 0:
-                update_data['recovered'] = True
-                update_data['attempts_before_success'] = current_attempt + 1
-            
-            # Add to attempt history
-            history = cluster_data.get('attempt_history') or []
-            history_entry = {
-                'attempt': current_attempt + 1,
-                'at': now,
-                'status': status,
-                'reason': failure_reason
-            }
-            history.append(history_entry)
-            update_data['attempt_history'] = history
-        
-        # Update the cluster
-        supabase.table('clusters').update(update_data).eq('id', cluster_id).execute()
-        
-    except Exception as e:
-        print(f"   ⚠️ Could not update cluster status: {e}")
+    get_telemetry(get_supabase_client).record_cluster_status(
+        cluster_id, status, failure_reason=failure_reason,
+        failure_details=failure_details, increment_attempt=increment_attempt
+    )
+
+def record_cancelled_cluster(cluster_id: int, reason: str, details: str):
+    """ClusterScheduler on_cancel hook: a job dropped before any worker took it."""
+    update_cluster_status(cluster_id, 'skipped', reason, details, increment_attempt=False)
 
 def update_source_article_status(source_id: int, content_fetched: bool = None, 
                                   fetch_failure_reason: str = None,
                                   has_image: bool = None, image_quality_score: float = None):
     """
-    Update source article tracking fields.
+    Record source article tracking fields (buffered, see pipeline_telemetry).
     
     Args:
         source_id: The source article ID
@@ -583,76 +457,28 @@ def update_source_article_status(source_id: int, content_fetched: bool = None,
         has_image: Whether the source has a usable image
         image_quality_score: Image quality score from selection
     """
-    try:
-        supabase = get_supabase_client()
-        
-        update_data = {}
-        if content_fetched is not None:
-            update_data['content_fetched'] = content_fetched
-        if fetch_failure_reason:
-            update_data['fetch_failure_reason'] = fetch_failure_reason
-        if has_image is not None:
-            update_data['has_image'] = has_image
-        if image_quality_score is not None:
-            update_data['image_quality_score'] = image_quality_score
-        
-        if update_data:
-            supabase.table('source_articles').update(update_data).eq('id', source_id).execute()
-            
-    except Exception as e:
-        print(f"   ⚠️ Could not update source article status: {e}")
+    update_data = {}
+    if content_fetched is not None:
+        update_data['content_fetched'] = content_fetched
+    if fetch_failure_reason:
+        update_data['fetch_failure_reason'] = fetch_failure_reason
+    if has_image is not None:
+        update_data['has_image'] = has_image
+    if image_quality_score is not None:
+        update_data['image_quality_score'] = image_quality_score
+    
+    get_telemetry(get_supabase_client).record_source_status(source_id, update_data)
 
 def update_source_reliability(source_domain: str, success: bool, failure_reason: str = None):
     """
-    Track source domain reliability for analytics.
+    Track source domain reliability for analytics (buffered, see pipeline_telemetry).
     
     Args:
         source_domain: The domain (e.g., 'bbc.com', 'reuters.com')
         success: Whether the fetch was successful
         failure_reason: Why it failed (if applicable)
     """
-    try:
-        supabase = get_supabase_client()
-        now = datetime.now().isoformat()
-        
-        # Check if domain exists
-        existing = supabase.table('source_reliability').select('*').eq('source_domain', source_domain).execute()
-        
-        if existing.data:
-            # Update existing record
-            record = existing.data[0]
-            update_data = {
-                'total_attempts': (record.get('total_attempts') or 0) + 1,
-                'last_attempt_at': now
-            }
-            if success:
-                update_data['successful_fetches'] = (record.get('successful_fetches') or 0) + 1
-                update_data['last_success_at'] = now
-            else:
-                update_data['failed_fetches'] = (record.get('failed_fetches') or 0) + 1
-                if failure_reason:
-                    update_data['common_failure_reason'] = failure_reason
-            
-            supabase.table('source_reliability').update(update_data).eq('id', record['id']).execute()
-        else:
-            # Create new record
-            insert_data = {
-                'source_domain': source_domain,
-                'total_attempts': 1,
-                'successful_fetches': 1 if success else 0,
-                'failed_fetches': 0 if success else 1,
-                'first_seen_at': now,
-                'last_attempt_at': now,
-                'common_failure_reason': failure_reason if not success else None
-            }
-            if success:
-                insert_data['last_success_at'] = now
-            
-            supabase.table('source_reliability').insert(insert_data).execute()
-            
-    except Exception as e:
-        # Don't fail the pipeline for analytics errors
-        pass
+    get_telemetry(get_supabase_client).record_reliability(source_domain, success, failure_reason)
 
 def extract_domain(url: str) -> str:
     """Extract domain from URL for reliability tracking"""
@@ -949,14 +775,7 @@ def needs_og_image_scrape(source_url: str) -> bool:
         return False
     return any(domain in source_url.lower() for domain in SOURCES_NEEDING_OG_IMAGE_SCRAPE)
 
-# Initialize clients
-def get_supabase_client():
-    url = os.getenv('SUPABASE_URL')
-    key = os.getenv('SUPABASE_SERVICE_KEY')
-    if not url or not key:
-        raise ValueError("SUPABASE_URL and SUPABASE_SERVICE_KEY must be set")
-    return create_client(url, key)
-
+# Initialize clients (one shared Supabase client for the whole process)
 supabase = get_supabase_client()
 clustering_engine = EventClusteringEngine()
 
@@ -971,6 +790,10 @@ if not all([gemini_key, brightdata_key]):
 brightdata_fetcher = BrightDataArticleFetcher(api_key=brightdata_key)
 
 component_selector = GeminiComponentSelector(api_key=gemini_key)
+# Step 6 calls from concurrent cluster workers share batched requests
+# (COMPONENT_SELECTION_BATCHING=0 restores one request per cluster)
+if os.getenv('COMPONENT_SELECTION_BATCHING', '1') != '0':
+    component_selector = SelectionBatcher(component_selector)
 component_writer = GeminiComponentWriter(api_key=gemini_key)  # Using Gemini (Claude API limit reached)
 fact_verifier = FactVerifier(api_key=gemini_key)  # Using Gemini (Claude API limit reached)
 
@@ -984,6 +807,20 @@ except Exception as _pub_err:
     print(f"⚠️ Could not load publishers (will skip assignment): {_pub_err}")
 
 
+# Parallel workers for Steps 2-11 (one cluster per worker)
+MAX_PARALLEL_CLUSTERS = 10
+
+# Streaming mode (see streaming_pipeline.py): PIPELINE_STREAMING=1 lets
+# articles flow Step 0 -> 1 -> 1.5 in micro-batches through bounded queues
+# instead of waiting for each stage to finish. A ready cluster goes to the
+# workers once a micro-batch leaves it unchanged (or when Step 1.5 drains),
+# so clusters still gaining sources are not published early.
+PIPELINE_STREAMING = os.getenv('PIPELINE_STREAMING', '0') == '1'
+STREAM_RSS_BATCH_SIZE = 60  # Fetched articles per Step 0 micro-batch
+STREAM_RSS_MAX_WAIT_S = 5   # Flush a partial micro-batch after this long
+STREAM_QUEUE_SIZE = 4       # Max micro-batches buffered between stages
+
+
 # ==========================================
 # STEP 0: RSS FEED COLLECTION
 # ==========================================
@@ -1003,71 +840,147 @@ def normalize_url(url):
     normalized = urlunparse((parsed.scheme, domain, parsed.path, parsed.params, clean_query, ''))
     return normalized
 
-def fetch_rss_articles(max_articles_per_source=10):
-    """Step 0: Fetch NEW articles from 171 RSS sources with deduplication"""
-    from article_deduplication import get_new_articles_only, mark_article_as_processed
-    
-    print(f"\n{'='*80}")
-    print(f"📡 STEP 0: RSS FEED COLLECTION")
-    print(f"{'='*80}")
-    print(f"Fetching from {len(ALL_SOURCES)} premium sources...")
-    
-    all_fetched_articles = []
-    source_counts = {}
+def _fetch_rss_source(source_name, url, max_articles_per_source=10):
+    """
+    Fetch and parse one RSS feed.
     
-    def fetch_one_source(source_name, url):
-        try:
-            headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
-            response = requests.get(url, timeout=5, headers=headers, verify=False)
-            feed = feedparser.parse(response.content)
-            
-            source_articles = []
-            for entry in feed.entries[:max_articles_per_source]:
-                article_url = entry.get('link', '')
-                if not article_url:
-                    continue
-                
-                # Handle published date properly
-                published_date = entry.get('published', None)
-                if published_date == '':
-                    published_date = None
-                
-                # Extract image URL from RSS entry using improved extraction
-                # Pass source URL for source-specific handling (e.g., Guardian width selection)
-                image_url = extract_image_url(entry, source_url=url)
-                
-                # Check if this source needs og:image scraping (BBC, DW)
-                needs_scrape = needs_og_image_scrape(url)
-                
-                source_articles.append({
-                    'url': article_url,
-                    'title': entry.get('title', ''),
-                    'description': entry.get('description', ''),
-                    'source': source_name,
-                    'published_date': published_date,
-                    'image_url': image_url,
-                    'needs_og_scrape': needs_scrape,  # Flag for BBC/DW og:image extraction
-                    'source_feed_url': url  # Original RSS feed URL
-                })
+    Returns (source_name, articles, entry_times); entry_times (epoch publish
+    times of all feed entries, for the poll scheduler) is None on error.
+    """
+    try:
+        headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
+        response = requests.get(url, timeout=5, headers=headers, verify=False)
+        response.raise_for_status()
+        feed = feedparser.parse(response.content)
+        if feed.bozo and not feed.entries:
+            return (source_name, [], None)
+        
+        entry_times = []
+        for entry in feed.entries:
+            parsed = entry.get('published_parsed') or entry.get('updated_parsed')
+            if parsed:
+                try:
+                    entry_times.append(float(calendar.timegm(parsed)))
+                except (TypeError, ValueError, OverflowError):
+                    pass
+        
+        source_articles = []
+        for entry in feed.entries[:max_articles_per_source]:
+            article_url = entry.get('link', '')
+            if not article_url:
+                continue
             
-            return (source_name, source_articles)
-        except Exception as e:
-            return (source_name, [])
+            # Handle published date properly
+            published_date = entry.get('published', None)
+            if published_date == '':
+                published_date = None
+            
+            # Extract image URL from RSS entry using improved extraction
+            # Pass source URL for source-specific handling (e.g., Guardian width selection)
+            image_url = extract_image_url(entry, source_url=url)
+            
+            # Check if this source needs og:image scraping (BBC, DW)
+            needs_scrape = needs_og_image_scrape(url)
+            
+            source_articles.append({
+                'url': article_url,
+                'title': entry.get('title', ''),
+                'description': entry.get('description', ''),
+                'source': source_name,
+                'published_date': published_date,
+                'image_url': image_url,
+                'needs_og_scrape': needs_scrape,  # Flag for BBC/DW og:image extraction
+                'source_feed_url': url  # Original RSS feed URL
+            })
+        
+        return (source_name, source_articles, entry_times)
+    except Exception as e:
+        return (source_name, [], None)
+
+
+def _ts_to_epoch(value):
+    if not value:
+        return None
+    try:
+        ts = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=timezone.utc)
+    return ts.timestamp()
+
+
+def _epoch_to_ts(value):
+    return datetime.fromtimestamp(value, timezone.utc).isoformat() if value else None
+
+
+def _load_poll_schedule():
+    """
+    Load the adaptive poll schedule and the sources due this cycle.
     
-    # Parallel fetch from all sources
-    with ThreadPoolExecutor(max_workers=50) as executor:
-        futures = [executor.submit(fetch_one_source, name, url) for name, url, *_ in ALL_SOURCES]
-        for future in as_completed(futures):
-            source_name, source_articles = future.result()
-            if source_articles:
-                all_fetched_articles.extend(source_articles)
-                source_counts[source_name] = len(source_articles)
+    Returns (schedule, due_sources). Falls back to (None, ALL_SOURCES) if
+    adaptive polling is off or the schedule can't be read.
+    """
+    if not adaptive_polling_enabled():
+        return None, ALL_SOURCES
+    try:
+        rows = supabase.table('rss_source_schedule').select(
+            'source_name, mean_gap_s, consecutive_failures, last_polled_at, next_poll_at, newest_entry_at'
+        ).execute().data or []
+    except Exception as e:
+        print(f"⚠️  Could not load RSS poll schedule (polling all sources): {e}")
+        return None, ALL_SOURCES
     
-    print(f"\n📊 Fetched {len(all_fetched_articles)} articles from {len(source_counts)} sources")
+    for row in rows:
+        for key in ('last_polled_at', 'next_poll_at', 'newest_entry_at'):
+            row[key] = _ts_to_epoch(row.get(key))
+    schedule = SourcePollScheduler.from_rows(rows)
+    due = schedule.due_sources(ALL_SOURCES)
+    info = schedule.summary(ALL_SOURCES)
+    print(f"🗓️  Adaptive polling: {len(due)}/{len(ALL_SOURCES)} sources due, "
+          f"{info['backing_off']} backing off")
+    return schedule, due
+
+
+def _record_poll_result(schedule, source_name, entry_times):
+    if schedule is None:
+        return
+    if entry_times is None:
+        schedule.record_failure(source_name)
+    else:
+        schedule.record_success(source_name, entry_times)
+
+
+def _save_poll_schedule(schedule):
+    """Upsert schedule rows changed this cycle."""
+    if schedule is None:
+        return
+    rows = []
+    now = datetime.now(timezone.utc).isoformat()
+    for row in schedule.dirty_rows():
+        for key in ('last_polled_at', 'next_poll_at', 'newest_entry_at'):
+            row[key] = _epoch_to_ts(row[key])
+        row['updated_at'] = now
+        rows.append(row)
+    try:
+        for i in range(0, len(rows), 200):
+            supabase.table('rss_source_schedule')\
+                .upsert(rows[i:i+200], on_conflict='source_name')\
+                .execute()
+    except Exception as e:
+        print(f"⚠️  Could not save RSS poll schedule: {e}")
+
+
+def _dedup_and_mark_processed(fetched_articles):
+    """
+    Drop already-processed articles and record the new ones in
+    processed_articles so later batches/cycles skip them.
+    """
+    from article_deduplication import get_new_articles_only, mark_article_as_processed
     
     # Apply deduplication (time-based + database check)
     # Use 24-hour window to catch articles when system is offline for extended periods
-    new_articles = get_new_articles_only(all_fetched_articles, supabase, time_window=1440)  # 24 hours
+    new_articles = get_new_articles_only(fetched_articles, supabase, time_window=1440)  # 24 hours
     
     # Mark new articles as processed (batched for speed)
     if new_articles:
@@ -1097,6 +1010,35 @@ def fetch_rss_articles(max_articles_per_source=10):
             for article in new_articles:
                 mark_article_as_processed(article, supabase)
     
+    return new_articles
+
+
+def fetch_rss_articles(max_articles_per_source=10):
+    """Step 0: Fetch NEW articles from 171 RSS sources with deduplication"""
+    print(f"\n{'='*80}")
+    print("📡 STEP 0: RSS FEED COLLECTION")
+    print(f"{'='*80}")
+    schedule, sources = _load_poll_schedule()
+    print(f"Fetching from {len(sources)} premium sources...")
+    
+    all_fetched_articles = []
+    source_counts = {}
+    
+    # Parallel fetch from all due sources
+    with ThreadPoolExecutor(max_workers=50) as executor:
+        futures = [executor.submit(_fetch_rss_source, name, url, max_articles_per_source) for name, url, *_ in sources]
+        for future in as_completed(futures):
+            source_name, source_articles, entry_times = future.result()
+            _record_poll_result(schedule, source_name, entry_times)
+            if source_articles:
+                all_fetched_articles.extend(source_articles)
+                source_counts[source_name] = len(source_articles)
+    _save_poll_schedule(schedule)
+    
+    print(f"\n📊 Fetched {len(all_fetched_articles)} articles from {len(source_counts)} sources")
+    
+    new_articles = _dedup_and_mark_processed(all_fetched_articles)
+    
     # Show which sources had new articles
     new_by_source = {}
     for article in new_articles:
@@ -1110,96 +1052,88 @@ def fetch_rss_articles(max_articles_per_source=10):
     return new_articles
 
 
-# ==========================================
-# COMPLETE PIPELINE
-# ==========================================
-
-def run_complete_pipeline():
-    """Run the complete 9-step clustered news workflow"""
-
-    print("\n" + "="*80)
-    print("🚀 COMPLETE 10-STEP CLUSTERED NEWS WORKFLOW")
-    print("="*80)
-    print(f"Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    print("="*80)
-
-    # PRE-CHECK: Verify Gemini API key exists
-    if not gemini_key:
-        print("⚠️  Aborting pipeline - GEMINI_API_KEY not set")
-        return
-
-    # STEP 0: RSS Feed Collection
-    articles = fetch_rss_articles()
-    if not articles:
-        print("⚠️  No new articles - ending cycle")
-        return
-    
-    # STEP 1: Gemini Scoring & Filtering
-    print(f"\n{'='*80}")
-    print(f"🎯 STEP 1: GEMINI SCORING & FILTERING")
-    print(f"{'='*80}")
-    print(f"Scoring {len(articles)} articles...")
-    
-    scoring_result = score_news_articles_step1(articles, gemini_key)
-    approved_articles = scoring_result.get('approved', [])
-    filtered_articles = scoring_result.get('filtered', [])
-    filtered_count = len(filtered_articles)
-
-    print(f"\n✅ Step 1 Complete: {len(approved_articles)} approved, {filtered_count} filtered")
-    
-    # SAVE FILTERED ARTICLES TO SUPABASE (for analysis)
-    if filtered_articles:
-        try:
-            filtered_to_save = []
-            for article in filtered_articles:
-                filtered_to_save.append({
-                    'title': article.get('title', 'Unknown'),
-                    'score': article.get('score', 0),
-                    'source': article.get('source', 'Unknown'),
-                    'url': article.get('url', ''),
-                    'category': article.get('category', 'Other'),
-                    'path': article.get('path', 'DISQUALIFIED'),
-                    'disqualifier': article.get('disqualifier', None),
-                    'filtered_at': datetime.now().isoformat()
-                })
-            
-            # Insert in batches of 50
-            for i in range(0, len(filtered_to_save), 50):
-                batch = filtered_to_save[i:i+50]
-                supabase.table('filtered_articles').insert(batch).execute()
-            
-            print(f"   📊 Saved {len(filtered_to_save)} filtered articles to Supabase")
-        except Exception as e:
-            print(f"   ⚠️ Could not save filtered articles: {e}")
+def iter_rss_article_batches(max_articles_per_source=10, batch_size=None, max_wait_s=None):
+    """
+    Step 0 (streaming): yield NEW articles in micro-batches as feeds complete.
     
-    if not approved_articles:
-        print("⚠️  No articles approved - ending cycle")
-        return
+    A batch is flushed once `batch_size` fetched articles have accumulated or
+    `max_wait_s` seconds have passed since the last flush, so fast sources
+    reach Step 1 without waiting for the slowest feed. Each batch goes
+    through the same deduplication as fetch_rss_articles().
+    """
+    batch_size = batch_size or STREAM_RSS_BATCH_SIZE
+    max_wait_s = max_wait_s if max_wait_s is not None else STREAM_RSS_MAX_WAIT_S
     
-    # STEP 1.5: Event Clustering
     print(f"\n{'='*80}")
-    print(f"🔗 STEP 1.5: EVENT CLUSTERING (NEW)")
+    print("📡 STEP 0: RSS FEED COLLECTION (STREAMING)")
     print(f"{'='*80}")
-    print(f"Clustering {len(approved_articles)} articles...")
+    schedule, sources = _load_poll_schedule()
+    print(f"Fetching from {len(sources)} premium sources...")
     
-    clustering_result = clustering_engine.cluster_articles(approved_articles)
+    buffer = []
+    last_flush = time.time()
+    total_new = 0
     
-    print(f"\n✅ Step 1.5 Complete:")
-    print(f"   📊 New clusters: {clustering_result['new_clusters_created']}")
-    print(f"   🔗 Matched existing: {clustering_result['matched_to_existing']}")
-    if clustering_result.get('failed', 0) > 0:
-        print(f"   ⚠️  Failed: {clustering_result['failed']}")
+    with ThreadPoolExecutor(max_workers=50) as executor:
+        futures = [executor.submit(_fetch_rss_source, name, url, max_articles_per_source) for name, url, *_ in sources]
+        for future in as_completed(futures):
+            source_name, source_articles, entry_times = future.result()
+            _record_poll_result(schedule, source_name, entry_times)
+            buffer.extend(source_articles)
+            if len(buffer) >= batch_size or (buffer and time.time() - last_flush >= max_wait_s):
+                new_articles = _dedup_and_mark_processed(buffer)
+                buffer = []
+                last_flush = time.time()
+                if new_articles:
+                    total_new += len(new_articles)
+                    yield new_articles
     
-    # ONLY process NEW/UPDATED clusters from THIS cycle (not old ones)
-    clusters_to_process = []
+    _save_poll_schedule(schedule)
     
-    # Get cluster IDs that were created or updated in Step 1.5
-    affected_cluster_ids = clustering_result.get('cluster_ids', [])
+    if buffer:
+        new_articles = _dedup_and_mark_processed(buffer)
+        if new_articles:
+            total_new += len(new_articles)
+            yield new_articles
     
-    if not affected_cluster_ids:
-        print(f"   🎯 No clusters to process this cycle")
-        print("⚠️  No new clusters created - ending cycle")
+    print(f"\n✅ Step 0 Complete: {total_new} NEW articles (after deduplication)")
+
+
+# ==========================================
+# STAGE HELPERS (shared by barrier and streaming modes)
+# ==========================================
+
+def save_filtered_articles(filtered_articles):
+    """Save Step 1 rejects to filtered_articles (for analysis)."""
+    if not filtered_articles:
         return
+    try:
+        filtered_to_save = []
+        for article in filtered_articles:
+            filtered_to_save.append({
+                'title': article.get('title', 'Unknown'),
+                'score': article.get('score', 0),
+                'source': article.get('source', 'Unknown'),
+                'url': article.get('url', ''),
+                'category': article.get('category', 'Other'),
+                'path': article.get('path', 'DISQUALIFIED'),
+                'disqualifier': article.get('disqualifier', None),
+                'filtered_at': datetime.now().isoformat()
+            })
+        
+        # Insert in batches of 50
+        for i in range(0, len(filtered_to_save), 50):
+            batch = filtered_to_save[i:i+50]
+            supabase.table('filtered_articles').insert(batch).execute()
+        
+        print(f"   📊 Saved {len(filtered_to_save)} filtered articles to Supabase")
+    except Exception as e:
+        print(f"   ⚠️ Could not save filtered articles: {e}")
+
+
+def select_clusters_to_process(affected_cluster_ids):
+    """Return the affected clusters that are unpublished and have 1+ sources."""
+    clusters_to_process = []
     
     # For each affected cluster, check if it's ready (not yet published)
     for cluster_id in affected_cluster_ids:
@@ -1222,21 +1156,49 @@ def run_complete_pipeline():
         if len(sources.data) >= 1:
             clusters_to_process.append(cluster_id)
     
-    print(f"   🎯 Clusters ready for processing: {len(clusters_to_process)} (NEW this cycle)")
+    return clusters_to_process
+
+
+# ==========================================
+# COMPLETE PIPELINE
+# ==========================================
+
+def run_complete_pipeline(streaming: Optional[bool] = None):
+    """
+    Run the complete 9-step clustered news workflow.
     
-    if not clusters_to_process:
-        print("⚠️  No clusters ready - ending cycle")
+    Args:
+        streaming: Overlap Steps 0/1/1.5 and cluster processing through
+                   bounded queues (defaults to PIPELINE_STREAMING)
+    """
+    if streaming is None:
+        streaming = PIPELINE_STREAMING
+
+    print("\n" + "="*80)
+    print("🚀 COMPLETE 10-STEP CLUSTERED NEWS WORKFLOW")
+    print("="*80)
+    print(f"Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print("="*80)
+
+    # PRE-CHECK: Verify Gemini API key exists
+    if not gemini_key:
+        print("⚠️  Aborting pipeline - GEMINI_API_KEY not set")
         return
-    
+
+    # Fresh LLM retry budget + metrics for this cycle
+    get_gateway().start_cycle()
+
     # ==========================================
     # PARALLEL CLUSTER PROCESSING (3 workers)
     # ==========================================
     import threading
     
-    # Gemini rate limiter - allows max 2 concurrent Gemini API calls
-    # This prevents 429 errors without adding any artificial delay.
-    # Workers only wait if 2 other workers are already mid-Gemini-call.
-    gemini_semaphore = threading.Semaphore(5)
+    # Gemini admission goes through the process-wide LLM gateway, which
+    # adapts concurrency to observed latency/429s (AIMD) instead of a fixed
+    # Semaphore(5). Steps 1/5/6/7/8 route their own calls through it; this
+    # slot covers the remaining inline Gemini calls (image check, source
+    # validation, scoring/tagging, NER). Slots are reentrant per thread.
+    gemini_semaphore = get_gateway().slot('publish')
     
     # Thread-safe counter for published articles
     published_lock = threading.Lock()
@@ -1315,174 +1277,219 @@ def run_complete_pipeline():
             cluster_sources = sources.data
             print(f"   [Cluster {cluster_id}] Sources in cluster: {len(cluster_sources)}")
             
+            # Resume a retried cluster from its last valid step (see cluster_checkpoints)
+            checkpoints = get_checkpoint_store(get_supabase_client).session(cluster_id, cluster_sources)
+            
             # STEP 2: Bright Data Full Article Fetching (all sources)
             print(f"\n📡 [Cluster {cluster_id}] STEP 2: BRIGHT DATA FULL ARTICLE FETCHING")
-            print(f"   Fetching full text for {len(cluster_sources)} sources...")
+            fetched = checkpoints.resume('fetch')
+            if fetched is not None:
+                print(f"   ♻️ [Cluster {cluster_id}] Full texts resumed from checkpoint")
+                for source in cluster_sources:
+                    saved = fetched.get(str(source.get('id')), {})
+                    source['full_text'] = saved.get('full_text', source.get('content', ''))
+                    if saved.get('image_url'):
+                        source['image_url'] = saved['image_url']
+            else:
+                print(f"   Fetching full text for {len(cluster_sources)} sources...")
             
-            urls = [s['url'] for s in cluster_sources]
-            full_articles = fetch_articles_parallel(urls, max_workers=5)
+                urls = [s['url'] for s in cluster_sources]
+                full_articles = fetch_articles_parallel(urls, max_workers=5)
             
-            # Build URL mappings for text and og:image
-            url_to_text = {a['url']: a.get('text', '') for a in full_articles if a.get('text')}
-            url_to_og_image = {a['url']: a.get('og_image') for a in full_articles if a.get('og_image')}
+                # Build URL mappings for text and og:image
+                url_to_text = {a['url']: a.get('text', '') for a in full_articles if a.get('text')}
+                url_to_og_image = {a['url']: a.get('og_image') for a in full_articles if a.get('og_image')}
             
-            # Add full text and fetch/upgrade images for ALL sources without images
-            for source in cluster_sources:
-                source['full_text'] = url_to_text.get(source['url'], source.get('content', ''))
+                # Add full text and fetch/upgrade images for ALL sources without images
+                for source in cluster_sources:
+                    source['full_text'] = url_to_text.get(source['url'], source.get('content', ''))
                 
-                # Check if source has no image or needs upgrade (fetch og:image from Bright Data)
-                current_image = source.get('image_url')
-                has_no_image = not current_image or not current_image.strip()
+                    # Check if source has no image or needs upgrade (fetch og:image from Bright Data)
+                    current_image = source.get('image_url')
+                    has_no_image = not current_image or not current_image.strip()
                 
-                # Sources that need og:image upgrade (low-quality RSS images)
-                source_url = source.get('url', '').lower()
-                source_name = source.get('source_name', source.get('source', '')).lower()
-                needs_upgrade = any(domain in source_url or domain in source_name 
-                                   for domain in ['bbc.co.uk', 'bbc.com', 'dw.com', 'deutsche welle', 'cbc.ca', 'lemonde.fr', 'venturebeat.com', 'venturebeat'])
+                    # Sources that need og:image upgrade (low-quality RSS images)
+                    source_url = source.get('url', '').lower()
+                    source_name = source.get('source_name', source.get('source', '')).lower()
+                    needs_upgrade = any(domain in source_url or domain in source_name 
+                                       for domain in ['bbc.co.uk', 'bbc.com', 'dw.com', 'deutsche welle', 'cbc.ca', 'lemonde.fr', 'venturebeat.com', 'venturebeat'])
                 
-                # Use og:image from scraped page if source has no image OR needs upgrade
-                if (has_no_image or needs_upgrade) and source['url'] in url_to_og_image:
-                    og_image = url_to_og_image[source['url']]
-                    if og_image:
-                        source['image_url'] = og_image
-                        if has_no_image:
-                            print(f"   📸 [Cluster {cluster_id}] Fetched image for {source.get('source_name', source.get('source', 'Unknown'))}: {og_image[:60]}...")
-                        else:
-                            print(f"   📸 [Cluster {cluster_id}] Upgraded image for {source.get('source_name', source.get('source', 'Unknown'))}: {og_image[:60]}...")
+                    # Use og:image from scraped page if source has no image OR needs upgrade
+                    if (has_no_image or needs_upgrade) and source['url'] in url_to_og_image:
+                        og_image = url_to_og_image[source['url']]
+                        if og_image:
+                            source['image_url'] = og_image
+                            if has_no_image:
+                                print(f"   📸 [Cluster {cluster_id}] Fetched image for {source.get('source_name', source.get('source', 'Unknown'))}: {og_image[:60]}...")
+                            else:
+                                print(f"   📸 [Cluster {cluster_id}] Upgraded image for {source.get('source_name', source.get('source', 'Unknown'))}: {og_image[:60]}...")
             
-            # Track source article status for analytics
-            for source in cluster_sources:
-                source_id = source.get('id')
-                if source_id:
-                    content_ok = bool(source.get('full_text') and len(source.get('full_text', '')) > 100)
-                    image_ok = bool(source.get('image_url'))
+                # Track source article status for analytics
+                for source in cluster_sources:
+                    source_id = source.get('id')
+                    if source_id:
+                        content_ok = bool(source.get('full_text') and len(source.get('full_text', '')) > 100)
+                        image_ok = bool(source.get('image_url'))
                     
-                    # Update source article tracking
-                    update_source_article_status(
-                        source_id,
-                        content_fetched=content_ok,
-                        fetch_failure_reason='blocked' if not content_ok else None,
-                        has_image=image_ok
-                    )
+                        # Update source article tracking
+                        update_source_article_status(
+                            source_id,
+                            content_fetched=content_ok,
+                            fetch_failure_reason='blocked' if not content_ok else None,
+                            has_image=image_ok
+                        )
                     
-                    # Track domain reliability
-                    domain = extract_domain(source.get('url', ''))
-                    if domain:
-                        update_source_reliability(domain, success=content_ok, 
-                            failure_reason='blocked' if not content_ok else None)
-            
+                        # Track domain reliability
+                        domain = extract_domain(source.get('url', ''))
+                        if domain:
+                            update_source_reliability(domain, success=content_ok, 
+                                failure_reason='blocked' if not content_ok else None)
+
             success_count = len([s for s in cluster_sources if s.get('full_text') and len(s.get('full_text', '')) > 100])
             print(f"   ✅ [Cluster {cluster_id}] Fetched full text: {success_count}/{len(cluster_sources)}")
             
             # STRICT: Require actual article content - no description fallback
             if success_count == 0:
                 print(f"   ❌ [Cluster {cluster_id}] ELIMINATED: No article content fetched")
+                checkpoints.clear()
                 update_cluster_status(cluster_id, 'failed', 'no_content', 
                     f'All {len(cluster_sources)} sources blocked or failed to fetch')
                 return False
             
+            if fetched is None:
+                checkpoints.save('fetch', {
+                    str(source.get('id')): {'full_text': source.get('full_text', ''), 'image_url': source.get('image_url')}
+                    for source in cluster_sources
+                })
+            
             # STEP 3: Smart Image Selection
             print(f"\n📸 [Cluster {cluster_id}] STEP 3: SMART IMAGE SELECTION")
             
-            selector = ImageSelector(debug=True)
-            all_candidates = []
-            for source in cluster_sources:
-                image_url = source.get('image_url') or source.get('urlToImage')
-                if not image_url:
-                    continue
-                all_candidates.append({
-                    'url': image_url,
-                    'source_name': source.get('source_name', source.get('source', 'Unknown')),
-                    'source_url': source.get('url', ''),
-                    'article_score': source.get('score', 50),
-                    'width': source.get('image_width', 0),
-                    'height': source.get('image_height', 0)
-                })
-            
-            # Fetch real dimensions for candidates missing width/height
-            for candidate in all_candidates:
-                if candidate.get('width', 0) == 0 or candidate.get('height', 0) == 0:
-                    try:
-                        resp = requests.get(candidate['url'], timeout=5, stream=True, headers={
-                            'User-Agent': 'Mozilla/5.0 (compatible; TenNewsBot/1.0)'
-                        })
-                        resp.raise_for_status()
-                        # Read up to 512KB to get image header
-                        chunk = resp.raw.read(524288)
-                        resp.close()
-                        img = Image.open(BytesIO(chunk))
-                        candidate['width'], candidate['height'] = img.size
-                    except Exception:
-                        pass  # Keep width=0, height=0 — filter will handle it
-
-            valid_candidates = []
-            for candidate in all_candidates:
-                if selector._is_valid_image(candidate):
-                    candidate['quality_score'] = selector._calculate_image_score(candidate)
-                    valid_candidates.append(candidate)
+            selected_image = checkpoints.resume('image')
+            if selected_image is not None:
+                print(f"   ♻️ [Cluster {cluster_id}] Image resumed from checkpoint ({selected_image['source_name']})")
+            else:
+                selector = ImageSelector(debug=True)
+                all_candidates = []
+                for source in cluster_sources:
+                    image_url = source.get('image_url') or source.get('urlToImage')
+                    if not image_url:
+                        continue
+                    all_candidates.append({
+                        'url': image_url,
+                        'source_name': source.get('source_name', source.get('source', 'Unknown')),
+                        'source_url': source.get('url', ''),
+                        'article_score': source.get('score', 50),
+                        'width': source.get('image_width', 0),
+                        'height': source.get('image_height', 0)
+                    })
             
-            if not valid_candidates:
-                print(f"   ❌ [Cluster {cluster_id}] ELIMINATED: No image found")
-                update_cluster_status(cluster_id, 'failed', 'no_image',
-                    f'No usable image found in {len(cluster_sources)} sources')
-                return False
+                # Fetch real dimensions for candidates missing width/height
+                for candidate in all_candidates:
+                    if candidate.get('width', 0) == 0 or candidate.get('height', 0) == 0:
+                        try:
+                            resp = requests.get(candidate['url'], timeout=5, stream=True, headers={
+                                'User-Agent': 'Mozilla/5.0 (compatible; TenNewsBot/1.0)'
+                            })
+                            resp.raise_for_status()
+                            # Read up to 512KB to get image header
+                            chunk = resp.raw.read(524288)
+                            resp.close()
+                            img = Image.open(BytesIO(chunk))
+                            candidate['width'], candidate['height'] = img.size
+                        except Exception:
+                            pass  # Keep width=0, height=0 — filter will handle it
+
+                valid_candidates = []
+                for candidate in all_candidates:
+                    if selector._is_valid_image(candidate):
+                        candidate['quality_score'] = selector._calculate_image_score(candidate)
+                        valid_candidates.append(candidate)
+            
+                if not valid_candidates:
+                    print(f"   ❌ [Cluster {cluster_id}] ELIMINATED: No image found")
+                    checkpoints.clear()
+                    update_cluster_status(cluster_id, 'failed', 'no_image',
+                        f'No usable image found in {len(cluster_sources)} sources')
+                    return False
             
-            valid_candidates.sort(key=lambda x: x['quality_score'], reverse=True)
+                valid_candidates.sort(key=lambda x: x['quality_score'], reverse=True)
             
-            # STEP 3.1: AI Image Quality Check (Gemini 2.0 Flash)
-            print(f"\n🔍 [Cluster {cluster_id}] STEP 3.1: AI IMAGE QUALITY CHECK")
+                # STEP 3.1: AI Image Quality Check (Gemini 2.0 Flash)
+                print(f"\n🔍 [Cluster {cluster_id}] STEP 3.1: AI IMAGE QUALITY CHECK")
             
-            selected_image = None
-            try:
-                with gemini_semaphore:
-                    ai_approved = check_and_select_best_image(valid_candidates, min_confidence=70)
-                if ai_approved:
-                    selected_image = {
-                        'url': ai_approved['url'],
-                        'source_name': ai_approved['source_name'],
-                        'quality_score': ai_approved['quality_score']
-                    }
-                    print(f"   ✅ [Cluster {cluster_id}] AI-approved image from {selected_image['source_name']}")
-                else:
-                    print(f"   ⚠️  [Cluster {cluster_id}] No images passed AI quality check")
-            except Exception as e:
-                print(f"   ⚠️  [Cluster {cluster_id}] AI quality check failed: {str(e)[:80]}")
+                selected_image = None
+                try:
+                    with gemini_semaphore:
+                        ai_approved = check_and_select_best_image(valid_candidates, min_confidence=70)
+                    if ai_approved:
+                        selected_image = {
+                            'url': ai_approved['url'],
+                            'source_name': ai_approved['source_name'],
+                            'quality_score': ai_approved['quality_score']
+                        }
+                        print(f"   ✅ [Cluster {cluster_id}] AI-approved image from {selected_image['source_name']}")
+                    else:
+                        print(f"   ⚠️  [Cluster {cluster_id}] No images passed AI quality check")
+                except Exception as e:
+                    print(f"   ⚠️  [Cluster {cluster_id}] AI quality check failed: {str(e)[:80]}")
             
-            if not selected_image:
-                print(f"   ❌ [Cluster {cluster_id}] No images passed AI quality check — skipping article")
-                update_cluster_status(cluster_id, 'failed', 'no_quality_image',
-                    f'All {len(valid_candidates)} candidate images failed AI quality check')
-                return False
+                if not selected_image:
+                    print(f"   ❌ [Cluster {cluster_id}] No images passed AI quality check — skipping article")
+                    checkpoints.clear()
+                    update_cluster_status(cluster_id, 'failed', 'no_quality_image',
+                        f'All {len(valid_candidates)} candidate images failed AI quality check')
+                    return False
+                checkpoints.save('image', selected_image)
             
             # STEP 3.5: VALIDATE CLUSTER SOURCES (removes unrelated articles)
-            if len(cluster_sources) > 2:
-                with gemini_semaphore:
-                    cluster_sources = validate_cluster_sources(
-                        cluster_sources, 
-                        cluster.get('event_name', f'Cluster {cluster_id}')
-                    )
+            validated_ids = checkpoints.resume('validation')
+            if validated_ids is not None:
+                validated_ids = set(validated_ids)
+                cluster_sources = [s for s in cluster_sources if s.get('id') in validated_ids]
+            else:
+                if len(cluster_sources) > 2:
+                    with gemini_semaphore:
+                        cluster_sources = validate_cluster_sources(
+                            cluster_sources, 
+                            cluster.get('event_name', f'Cluster {cluster_id}')
+                        )
                 
-                if not cluster_sources:
-                    print(f"   ❌ [Cluster {cluster_id}] No valid sources after validation")
-                    update_cluster_status(cluster_id, 'failed', 'validation_failed',
-                        'All sources were unrelated after validation')
-                    return False
+                    if not cluster_sources:
+                        print(f"   ❌ [Cluster {cluster_id}] No valid sources after validation")
+                        checkpoints.clear()
+                        update_cluster_status(cluster_id, 'failed', 'validation_failed',
+                            'All sources were unrelated after validation')
+                        return False
+                checkpoints.save('validation', [s.get('id') for s in cluster_sources])
             
             # STEP 4: MULTI-SOURCE SYNTHESIS
             print(f"\n✍️  [Cluster {cluster_id}] STEP 4: MULTI-SOURCE SYNTHESIS")
             print(f"   Synthesizing article from {len(cluster_sources)} sources...")
             
-            synthesized = synthesize_multisource_article(cluster_sources, cluster_id)
-            
-            if not synthesized:
-                print(f"   ❌ [Cluster {cluster_id}] Synthesis failed")
-                update_cluster_status(cluster_id, 'failed', 'synthesis_failed',
-                    'Gemini API failed to synthesize article from sources')
-                return False
+            # Deduplicated, budgeted evidence shared by Steps 4, 5 and 8
+            evidence_sources, evidence_stats = pack_evidence(cluster_sources)
+            print(f"   📦 [Cluster {cluster_id}] Evidence: {evidence_stats['sources_out']}/{evidence_stats['sources_in']} sources, "
+                  f"{evidence_stats['chars_in']:,} → {evidence_stats['chars_out']:,} chars "
+                  f"({evidence_stats['duplicate_paragraphs']} duplicate paragraphs dropped)")
             
-            synthesized['image_url'] = selected_image['url']
-            synthesized['image_source'] = selected_image['source_name']
-            synthesized['image_score'] = selected_image['quality_score']
+            synthesized = checkpoints.resume('synthesis')
+            if synthesized is not None:
+                print(f"   ♻️ [Cluster {cluster_id}] Synthesis resumed from checkpoint")
+            else:
+                synthesized = synthesize_multisource_article(evidence_sources, cluster_id)
+                
+                if not synthesized:
+                    print(f"   ❌ [Cluster {cluster_id}] Synthesis failed")
+                    checkpoints.clear()
+                    update_cluster_status(cluster_id, 'failed', 'synthesis_failed',
+                        'Gemini API failed to synthesize article from sources')
+                    return False
+                
+                synthesized['image_url'] = selected_image['url']
+                synthesized['image_source'] = selected_image['source_name']
+                synthesized['image_score'] = selected_image['quality_score']
+                checkpoints.save('synthesis', synthesized)
             
             print(f"   ✅ [Cluster {cluster_id}] Synthesized: {synthesized['title_news'][:60]}...")
             
@@ -1502,55 +1509,64 @@ def run_complete_pipeline():
                 'summary_bullets_news': synthesized.get('summary_bullets_news', synthesized.get('summary_bullets', []))
             }
 
-            selected = []
-            component_result = {}
-            try:
-                with gemini_semaphore:
+            component_result = checkpoints.resume('selection')
+            if component_result is not None:
+                selected = component_result.get('components', [])
+                print(f"   ♻️ [Cluster {cluster_id}] Selection resumed from checkpoint: [{', '.join(selected) if selected else 'none'}]")
+            else:
+                selected = []
+                component_result = {}
+                try:
                     component_result = component_selector.select_components(article_for_selection)
-                selected = component_result.get('components', []) if isinstance(component_result, dict) else []
-                print(f"   ✅ [Cluster {cluster_id}] Step 6 Complete: [{', '.join(selected) if selected else 'none'}]")
-            except Exception as comp_error:
-                print(f"   ⚠️ [Cluster {cluster_id}] Step 6 Failed: {comp_error}")
-                selected = ['details']
-                component_result = {'components': selected, 'emoji': '📰'}
+                    selected = component_result.get('components', []) if isinstance(component_result, dict) else []
+                    print(f"   ✅ [Cluster {cluster_id}] Step 6 Complete: [{', '.join(selected) if selected else 'none'}]")
+                    checkpoints.save('selection', component_result)
+                except Exception as comp_error:
+                    print(f"   ⚠️ [Cluster {cluster_id}] Step 6 Failed: {comp_error}")
+                    selected = ['details']
+                    component_result = {'components': selected, 'emoji': '📰'}
 
             # --- STEP 5: Context search ONLY if components need it ---
             # Components that need Google Search grounding: timeline, details, graph, map
             # Components that DON'T need search: scorecard, recipe, or empty []
             components_needing_search = [c for c in selected if c in ('timeline', 'details', 'graph', 'map')]
 
-            gemini_result = None
-            context_data = {}
+            context_data = checkpoints.resume('context')
+            if context_data is not None:
+                if context_data:
+                    print(f"\n♻️  [Cluster {cluster_id}] STEP 5: context resumed from checkpoint")
+            else:
+                gemini_result = None
+                context_data = {}
 
-            if components_needing_search and gemini_key:
-                print(f"\n🔍 [Cluster {cluster_id}] STEP 5: GEMINI CONTEXT SEARCH (for: {', '.join(components_needing_search)})")
+                if components_needing_search and gemini_key:
+                    print(f"\n🔍 [Cluster {cluster_id}] STEP 5: GEMINI CONTEXT SEARCH (for: {', '.join(components_needing_search)})")
 
-                full_article_text = ""
-                for source in cluster_sources:
-                    if source.get('full_text') and len(source.get('full_text', '')) > 100:
-                        full_article_text = source['full_text'][:3000]
-                        break
+                    full_article_text = evidence_excerpt(evidence_sources, 3000)
 
-                try:
-                    with gemini_semaphore:
+                    try:
                         gemini_result = search_gemini_context(
                             synthesized['title_news'],
                             bullets_text,
                             full_article_text,
-                            selected_components=components_needing_search
+                            selected_components=components_needing_search,
+                            supabase_client=supabase
                         )
-                    search_context_text = gemini_result.get('results', '') if gemini_result else ""
-                    print(f"   ✅ [Cluster {cluster_id}] Step 5 Complete: ({len(search_context_text)} chars)")
-                except Exception as search_error:
-                    print(f"   ⚠️ [Cluster {cluster_id}] Step 5 Failed: {search_error}")
-
-                if gemini_result:
-                    for component in selected:
-                        context_data[component] = gemini_result
-            elif not components_needing_search and selected:
-                print(f"\n⏭️  [Cluster {cluster_id}] STEP 5: SKIPPED (components [{', '.join(selected)}] don't need web search)")
-            elif not selected:
-                print(f"\n⏭️  [Cluster {cluster_id}] STEP 5: SKIPPED (no components selected)")
+                        search_context_text = gemini_result.get('results', '') if gemini_result else ""
+                        print(f"   ✅ [Cluster {cluster_id}] Step 5 Complete: ({len(search_context_text)} chars)")
+                    except Exception as search_error:
+                        print(f"   ⚠️ [Cluster {cluster_id}] Step 5 Failed: {search_error}")
+
+                    if gemini_result:
+                        for component in selected:
+                            context_data[component] = gemini_result
+                elif not components_needing_search and selected:
+                    print(f"\n⏭️  [Cluster {cluster_id}] STEP 5: SKIPPED (components [{', '.join(selected)}] don't need web search)")
+                elif not selected:
+                    print(f"\n⏭️  [Cluster {cluster_id}] STEP 5: SKIPPED (no components selected)")
+                # A failed search is not checkpointed, so a retry searches again
+                if gemini_result or not components_needing_search:
+                    checkpoints.save('context', context_data)
             
             # ==========================================
             # STEP 7: COMPONENT GENERATION (with retry)
@@ -1560,9 +1576,14 @@ def run_complete_pipeline():
             components = {}
             map_locations = component_result.get('map_locations', []) if isinstance(component_result, dict) else []
             
-            if selected:
-                max_component_retries = 3
-                for comp_attempt in range(max_component_retries):
+            resumed_components = checkpoints.resume('components')
+            if resumed_components is not None:
+                components = resumed_components
+                print(f"   ♻️ [Cluster {cluster_id}] Components resumed from checkpoint: [{', '.join(components.keys())}]")
+            else:
+                if selected:
+                    # Each component is generated, validated and retried on its own
+                    # inside the writer, so a missing component never regenerates the rest
                     try:
                         article_for_components = {
                             'title_news': synthesized['title_news'],
@@ -1571,98 +1592,110 @@ def run_complete_pipeline():
                             'context_data': context_data,
                             'map_locations': map_locations
                         }
-                        with gemini_semaphore:
-                            generation_result = component_writer.write_components(article_for_components)
-
-                        if generation_result:
-                            components = {
-                                'timeline': generation_result.get('timeline'),
-                                'details': generation_result.get('details'),
-                                'graph': generation_result.get('graph'),
-                                'map': generation_result.get('map'),
-                                'scorecard': generation_result.get('scorecard'),
-                                'recipe': generation_result.get('recipe')
-                            }
-                            components = {k: v for k, v in components.items() if v is not None}
-
-                            missing_components = [c for c in selected if c not in components]
-                            if missing_components and comp_attempt < max_component_retries - 1:
-                                print(f"   ⚠️ [Cluster {cluster_id}] Missing: {missing_components} - retrying ({comp_attempt + 2}/{max_component_retries})...")
-                                time.sleep(2)
-                                continue
-
-                            print(f"   ✅ [Cluster {cluster_id}] Step 7 Complete: [{', '.join(components.keys())}]")
-                            break
+                        generation_result = component_writer.write_components(article_for_components) or {}
+
+                        components = {
+                            'timeline': generation_result.get('timeline'),
+                            'details': generation_result.get('details'),
+                            'graph': generation_result.get('graph'),
+                            'map': generation_result.get('map'),
+                            'scorecard': generation_result.get('scorecard'),
+                            'recipe': generation_result.get('recipe')
+                        }
+                        components = {k: v for k, v in components.items() if v is not None}
 
-                        if comp_attempt < max_component_retries - 1:
-                            print(f"   ⚠️ [Cluster {cluster_id}] No components - retrying ({comp_attempt + 2}/{max_component_retries})...")
-                            time.sleep(2)
-                            continue
-                        components = {}
+                        missing_components = [c for c in selected if c not in components]
+                        if missing_components:
+                            print(f"   ⚠️ [Cluster {cluster_id}] Missing after retries: {missing_components}")
+                        print(f"   ✅ [Cluster {cluster_id}] Step 7 Complete: [{', '.join(components.keys())}]")
 
                     except Exception as comp_gen_error:
-                        if comp_attempt < max_component_retries - 1:
-                            print(f"   ⚠️ [Cluster {cluster_id}] Component error: {comp_gen_error} - retrying ({comp_attempt + 2}/{max_component_retries})...")
-                            time.sleep(2)
-                            continue
                         print(f"   ⚠️ [Cluster {cluster_id}] Step 7 Failed: {comp_gen_error}")
                         components = {}
+                if components or not selected:
+                    checkpoints.save('components', components)
             
             # STEP 8: Fact Verification
             print(f"\n🔍 [Cluster {cluster_id}] STEP 8: FACT VERIFICATION")
             
-            max_verification_attempts = 3
-            verification_passed = False
-            verification_feedback = None
-            
-            for attempt in range(max_verification_attempts):
-                if attempt > 0:
-                    print(f"\n   🔄 [Cluster {cluster_id}] REGENERATING (Attempt {attempt + 1}/{max_verification_attempts})")
-                    
-                    synthesized = synthesize_multisource_article(
-                        cluster_sources, 
-                        cluster_id,
-                        verification_feedback=verification_feedback
-                    )
-                    
-                    if not synthesized:
-                        print(f"      ❌ [Cluster {cluster_id}] Regeneration failed")
-                        continue
-                    
-                    if selected_image:
-                        synthesized['image_url'] = selected_image['url']
-                        synthesized['image_source'] = selected_image['source_name']
-                        synthesized['image_score'] = selected_image['quality_score']
+            verified_article = checkpoints.resume('verification')
+            if verified_article is not None:
+                synthesized = verified_article
+                print(f"   ♻️ [Cluster {cluster_id}] Verified article resumed from checkpoint")
+            else:
+                max_verification_attempts = 3
+                verification_passed = False
+                verification_feedback = None
+            
+                for attempt in range(max_verification_attempts):
+                    verify_spans = None
+                    if attempt > 0:
+                        # Targeted repair first: patch the flagged title/bullets and
+                        # re-verify every flagged span. Keeps the Step 7 components
+                        # consistent. If any flagged span comes back unpatched,
+                        # repair_article returns None and we re-synthesize.
+                        repaired = None
+                        if synthesized and verification_feedback and verification_feedback.get('discrepancies'):
+                            print(f"\n   🩹 [Cluster {cluster_id}] REPAIRING (Attempt {attempt + 1}/{max_verification_attempts})")
+                            repaired = fact_verifier.repair_article(synthesized, verification_feedback['discrepancies'])
+                            if repaired:
+                                bullet_chars = sum(len(b) for b in repaired[0].get('summary_bullets', []))
+                                if not 150 <= bullet_chars <= 550:
+                                    print(f"      ⚠️ [Cluster {cluster_id}] Repaired bullets out of range ({bullet_chars} chars)")
+                                    repaired = None
                     
-                    print(f"      ✅ [Cluster {cluster_id}] New article: {synthesized.get('title_news', '')[:50]}...")
+                        if repaired:
+                            synthesized, verify_spans = repaired
+                            print(f"      ✅ [Cluster {cluster_id}] Repaired {', '.join(verify_spans)}: {synthesized.get('title_news', '')[:50]}...")
+                        else:
+                            print(f"\n   🔄 [Cluster {cluster_id}] REGENERATING (Attempt {attempt + 1}/{max_verification_attempts})")
+                        
+                            synthesized = synthesize_multisource_article(
+                                evidence_sources, 
+                                cluster_id,
+                                verification_feedback=verification_feedback
+                            )
+                        
+                            if not synthesized:
+                                print(f"      ❌ [Cluster {cluster_id}] Regeneration failed")
+                                continue
+                        
+                            if selected_image:
+                                synthesized['image_url'] = selected_image['url']
+                                synthesized['image_source'] = selected_image['source_name']
+                                synthesized['image_score'] = selected_image['quality_score']
+                        
+                            print(f"      ✅ [Cluster {cluster_id}] New article: {synthesized.get('title_news', '')[:50]}...")
                 
-                with gemini_semaphore:
                     verified, discrepancies, verification_summary = fact_verifier.verify_article(
-                        cluster_sources, 
-                        synthesized
+                        evidence_sources, 
+                        synthesized,
+                        spans=verify_spans
                     )
                 
-                if verified:
-                    verification_passed = True
-                    print(f"   ✅ [Cluster {cluster_id}] Verification PASSED: {verification_summary}")
-                    break
-                else:
-                    print(f"   ⚠️  [Cluster {cluster_id}] Verification FAILED (Attempt {attempt + 1}/{max_verification_attempts})")
-                    if discrepancies:
-                        for i, d in enumerate(discrepancies[:3], 1):
-                            issue = d.get('issue', 'Unknown')
-                            print(f"         {i}. {issue[:80]}...")
+                    if verified:
+                        verification_passed = True
+                        print(f"   ✅ [Cluster {cluster_id}] Verification PASSED: {verification_summary}")
+                        break
+                    else:
+                        print(f"   ⚠️  [Cluster {cluster_id}] Verification FAILED (Attempt {attempt + 1}/{max_verification_attempts})")
+                        if discrepancies:
+                            for i, d in enumerate(discrepancies[:3], 1):
+                                issue = d.get('issue', 'Unknown')
+                                print(f"         {i}. {issue[:80]}...")
                     
-                    verification_feedback = {
-                        'discrepancies': discrepancies,
-                        'summary': verification_summary
-                    }
+                        verification_feedback = {
+                            'discrepancies': discrepancies,
+                            'summary': verification_summary
+                        }
             
-            if not verification_passed:
-                print(f"\n   ❌ [Cluster {cluster_id}] ELIMINATED: Failed verification after {max_verification_attempts} attempts")
-                update_cluster_status(cluster_id, 'failed', 'verification_failed',
-                    f'Failed fact verification after {max_verification_attempts} attempts')
-                return False
+                if not verification_passed:
+                    print(f"\n   ❌ [Cluster {cluster_id}] ELIMINATED: Failed verification after {max_verification_attempts} attempts")
+                    checkpoints.clear()
+                    update_cluster_status(cluster_id, 'failed', 'verification_failed',
+                        f'Failed fact verification after {max_verification_attempts} attempts')
+                    return False
+                checkpoints.save('verification', synthesized)
             
             synthesized['image_url'] = selected_image['url']
             synthesized['image_source'] = selected_image['source_name']
@@ -1727,6 +1760,7 @@ def run_complete_pipeline():
                 print(f"   ⚠️ [Cluster {cluster_id}] Duplicate check error: {e}")
             
             if is_duplicate:
+                checkpoints.clear()
                 update_cluster_status(cluster_id, 'skipped', 'duplicate',
                     f'Duplicate detected: {skip_reason}')
                 return False
@@ -2051,6 +2085,7 @@ Example: ["Current solar panels max out at 25% efficiency commercially", "The th
                 })
             
             # Mark cluster as successfully published
+            checkpoints.clear()
             update_cluster_status(cluster_id, 'published')
             
             return True
@@ -2061,36 +2096,128 @@ Example: ["Current solar panels max out at 25% efficiency commercially", "The th
             return False
     
     # ==========================================
-    # EXECUTE CLUSTERS IN PARALLEL (3 workers)
+    # STEPS 0 -> 1.5 -> CLUSTER WORKERS
     # ==========================================
-    MAX_PARALLEL_CLUSTERS = 10
-    print(f"\n⚡ Processing {len(clusters_to_process)} clusters with {MAX_PARALLEL_CLUSTERS} parallel workers...")
+    if streaming:
+        from streaming_pipeline import StreamingPipeline
+        
+        def _score_batch(batch):
+            print(f"\n🎯 STEP 1 (stream): scoring {len(batch)} articles...")
+            scoring_result = score_news_articles_step1(batch, gemini_key)
+            save_filtered_articles(scoring_result.get('filtered', []))
+            return scoring_result.get('approved', [])
+        
+        def _cluster_batch(batch):
+            print(f"\n🔗 STEP 1.5 (stream): clustering {len(batch)} articles...")
+            return clustering_engine.cluster_articles(batch).get('cluster_ids', [])
+        
+        print(f"\n⚡ Streaming mode: clusters start once a micro-batch leaves them unchanged ({MAX_PARALLEL_CLUSTERS} workers)")
+        stream_stats = StreamingPipeline(
+            fetch_batches=iter_rss_article_batches,
+            score_batch=_score_batch,
+            cluster_batch=_cluster_batch,
+            select_clusters=select_clusters_to_process,
+            process_cluster=process_single_cluster,
+            build_jobs=lambda ids: build_cluster_jobs(supabase, ids),
+            scheduler=ClusterScheduler(on_cancel=record_cancelled_cluster),
+            max_workers=MAX_PARALLEL_CLUSTERS,
+            queue_size=STREAM_QUEUE_SIZE,
+        ).run()
+        articles_count = stream_stats['articles_fetched']
+        approved_count = stream_stats['articles_approved']
+        clusters_count = stream_stats['clusters_dispatched']
+        if not clusters_count:
+            print("⚠️  No clusters ready - ending cycle")
+            return
+    else:
+        # STEP 0: RSS Feed Collection
+        articles = fetch_rss_articles()
+        if not articles:
+            print("⚠️  No new articles - ending cycle")
+            return
     
-    with ThreadPoolExecutor(max_workers=MAX_PARALLEL_CLUSTERS) as cluster_executor:
-        future_to_cluster = {
-            cluster_executor.submit(process_single_cluster, cid): cid 
-            for cid in clusters_to_process
-        }
+        # STEP 1: Gemini Scoring & Filtering
+        print(f"\n{'='*80}")
+        print("🎯 STEP 1: GEMINI SCORING & FILTERING")
+        print(f"{'='*80}")
+        print(f"Scoring {len(articles)} articles...")
+    
+        scoring_result = score_news_articles_step1(articles, gemini_key)
+        approved_articles = scoring_result.get('approved', [])
+        filtered_articles = scoring_result.get('filtered', [])
+        filtered_count = len(filtered_articles)
+
+        print(f"\n✅ Step 1 Complete: {len(approved_articles)} approved, {filtered_count} filtered")
+    
+        # SAVE FILTERED ARTICLES TO SUPABASE (for analysis)
+        save_filtered_articles(filtered_articles)
+    
+        if not approved_articles:
+            print("⚠️  No articles approved - ending cycle")
+            return
+    
+        # STEP 1.5: Event Clustering
+        print(f"\n{'='*80}")
+        print("🔗 STEP 1.5: EVENT CLUSTERING (NEW)")
+        print(f"{'='*80}")
+        print(f"Clustering {len(approved_articles)} articles...")
+    
+        clustering_result = clustering_engine.cluster_articles(approved_articles)
+    
+        print("\n✅ Step 1.5 Complete:")
+        print(f"   📊 New clusters: {clustering_result['new_clusters_created']}")
+        print(f"   🔗 Matched existing: {clustering_result['matched_to_existing']}")
+        if clustering_result.get('failed', 0) > 0:
+            print(f"   ⚠️  Failed: {clustering_result['failed']}")
+    
+        # ONLY process NEW/UPDATED clusters from THIS cycle (not old ones)
+        # Get cluster IDs that were created or updated in Step 1.5
+        affected_cluster_ids = clustering_result.get('cluster_ids', [])
+    
+        if not affected_cluster_ids:
+            print("   🎯 No clusters to process this cycle")
+            print("⚠️  No new clusters created - ending cycle")
+            return
+    
+        clusters_to_process = select_clusters_to_process(affected_cluster_ids)
+    
+        print(f"   🎯 Clusters ready for processing: {len(clusters_to_process)} (NEW this cycle)")
+    
+        if not clusters_to_process:
+            print("⚠️  No clusters ready - ending cycle")
+            return
+    
+        # ==========================================
+        # EXECUTE CLUSTERS IN PARALLEL (3 workers)
+        # ==========================================
+        print(f"\n⚡ Processing {len(clusters_to_process)} clusters with {MAX_PARALLEL_CLUSTERS} parallel workers...")
+    
+        # Highest-value clusters first (sources, score, recency, category quota)
+        scheduler = ClusterScheduler(on_cancel=record_cancelled_cluster)
+        scheduler.submit_many(build_cluster_jobs(supabase, clusters_to_process))
+        scheduler.close()
+        run_cluster_jobs(scheduler, process_single_cluster, MAX_PARALLEL_CLUSTERS)
         
-        for future in as_completed(future_to_cluster):
-            cid = future_to_cluster[future]
-            try:
-                result = future.result()
-                if result:
-                    print(f"   ✅ Cluster {cid} completed successfully")
-                else:
-                    print(f"   ⏭️ Cluster {cid} skipped or failed")
-            except Exception as e:
-                print(f"   ❌ Cluster {cid} exception: {e}")
+        articles_count = len(articles)
+        approved_count = len(approved_articles)
+        clusters_count = len(clusters_to_process)
+    
+    # Write buffered status/reliability telemetry before reporting
+    flushed = get_telemetry(get_supabase_client).flush()
+    if flushed:
+        print(f"   📝 Telemetry flushed: {flushed}")
+    # Drop checkpoints of clusters that were never retried
+    get_checkpoint_store(get_supabase_client).prune()
     
     # Summary
     print(f"\n{'='*80}")
     print(f"✅ PIPELINE COMPLETE")
     print(f"{'='*80}")
-    print(f"   Articles fetched: {len(articles)}")
-    print(f"   Approved (Step 1): {len(approved_articles)}")
-    print(f"   Clusters processed: {len(clusters_to_process)}")
+    print(f"   Articles fetched: {articles_count}")
+    print(f"   Approved (Step 1): {approved_count}")
+    print(f"   Clusters processed: {clusters_count}")
     print(f"   Articles published: {published_count}")
+    get_gateway().print_metrics()
     print(f"{'='*80}\n")
 
     # ── NER health check ──
@@ -2110,9 +2237,9 @@ Example: ["Current solar panels max out at 25% efficiency commercially", "The th
             sys.exit(1)  # fail the Cloud Run job so it retries fresh
 
     return {
-        'articles_processed': len(articles),
+        'articles_processed': articles_count,
         'articles_published': published_count,
-        'clusters_found': len(clusters_to_process),
+        'clusters_found': clusters_count,
         'errors': []
     }
 
@@ -2126,7 +2253,7 @@ def synthesize_multisource_article(sources: List[Dict], cluster_id: int, verific
     Synthesize one article from multiple sources using Gemini.
 
     Args:
-        sources: List of source articles
+        sources: List of source articles (packed evidence from source_evidence.pack_evidence)
         cluster_id: Cluster ID
         verification_feedback: Optional dict with 'discrepancies' and 'summary' from failed verification
     """
@@ -2406,13 +2533,14 @@ Return ONLY valid JSON, no markdown, no explanations."""
                 }
             }
 
-            response = requests.post(gemini_synthesis_url, json=request_data, timeout=60)
+            response = get_gateway().post(gemini_synthesis_url, json=request_data, timeout=60,
+                                          stage='step4_synthesis', max_retries=0)
 
-            # Handle rate limiting with exponential backoff
+            # Rate limited: back off through the gateway (shared retry budget)
             if response.status_code == 429:
-                wait_time = (2 ** attempt) * 10  # 10s, 20s, 40s, 80s, 160s
-                print(f"   ⚠️  Rate limited (attempt {attempt + 1}/5) - waiting {wait_time}s...")
-                time.sleep(wait_time)
+                print(f"   ⚠️  Rate limited (attempt {attempt + 1}/5)")
+                if not get_gateway().backoff('step4_synthesis', attempt, throttled=True):
+                    return None
                 continue
 
             if response.status_code >= 400:
@@ -2575,6 +2703,9 @@ def run_single_cycle():
             'clusters_found': 0,
             'errors': [str(e)]
         }
+    finally:
+        # Cloud Run may freeze the instance after the response; don't leave writes buffered
+        get_telemetry(get_supabase_client).flush()
 
 
 # ==========================================
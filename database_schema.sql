@@ -83,6 +83,25 @@ CREATE TABLE IF NOT EXISTS source_markers (
     last_published_date TEXT
 );
 
+-- Rolling per-source set of recently seen entries: packed 8-byte
+-- blake2b hashes of entry GUIDs (URL when a feed has no GUIDs), oldest first
+CREATE TABLE IF NOT EXISTS source_seen_entries (
+    source TEXT PRIMARY KEY,
+    entry_hashes BLOB,
+    updated_at TEXT
+);
+
+-- Adaptive polling: learned publish cadence and backoff per source
+-- (timestamps are epoch seconds, see source_poll_scheduler.py)
+CREATE TABLE IF NOT EXISTS source_schedule (
+    source TEXT PRIMARY KEY,
+    mean_gap_s REAL,
+    consecutive_failures INTEGER DEFAULT 0,
+    last_polled_at REAL,
+    next_poll_at REAL,
+    newest_entry_at REAL
+);
+
 -- Index for performance
 CREATE INDEX IF NOT EXISTS idx_published ON articles(published, published_at);
 CREATE INDEX IF NOT EXISTS idx_category ON articles(category);
@@ -14,12 +14,13 @@ from datetime import datetime, timezone
 from typing import Dict, Optional, List
 
 import google.generativeai as genai
-from supabase import create_client, Client
+from supabase import Client
+from supabase_pool import get_supabase_client
 
 # Initialize Supabase
 SUPABASE_URL = os.environ.get('NEXT_PUBLIC_SUPABASE_URL') or os.environ.get('SUPABASE_URL')
 SUPABASE_KEY = os.environ.get('SUPABASE_SERVICE_KEY') or os.environ.get('SUPABASE_KEY')
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY) if SUPABASE_URL and SUPABASE_KEY else None
+supabase: Client = get_supabase_client(SUPABASE_URL, SUPABASE_KEY) if SUPABASE_URL and SUPABASE_KEY else None
 
 
 # ==========================================
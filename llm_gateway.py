@@ -0,0 +1,370 @@
+#!/usr/bin/env python3
+"""
+LLM CALL GATEWAY
+==========================================
+Purpose: One process-wide entry point for Gemini calls so concurrency,
+         retries and rate limiting are tuned from observed behaviour
+         instead of hard-coded semaphores and sleep loops.
+
+Concurrency (AIMD):
+  - The number of in-flight calls is capped by a floating limit.
+  - Every call that finishes without throttling grows the limit by
+    ADDITIVE_INCREASE / limit (about +1 per limit-sized window).
+  - A 429, or a call much slower than its stage's moving-average latency,
+    shrinks the limit multiplicatively (at most once per cooldown).
+
+Priority:
+  - Waiting calls are admitted by pipeline stage, later stages first, so
+    clusters already close to publishing are not starved by new scoring
+    batches.
+
+Retry budget:
+  - Retries (429, 5xx, network errors) draw from a shared per-cycle budget.
+    start_cycle() resets it; once it is spent, calls fail fast and the
+    step's own fallback takes over.
+
+Response cache:
+  - post(..., cache_ttl_s=...) opts a call into the content-addressed
+    response cache (llm_response_cache). Hits return without taking a slot.
+
+Metrics:
+  - Per stage: calls, throttles, errors, retries, cache hits, and time spent
+    waiting for a slot (queue) versus inside the call (service).
+
+Usage:
+    from llm_gateway import get_gateway
+    response = get_gateway().post(url, json=payload, timeout=60, stage='step8_verification')
+
+    with get_gateway().slot('step6_selection'):
+        response = model.generate_content(prompt)
+"""
+
+import heapq
+import itertools
+import os
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+import requests
+
+from llm_response_cache import cache_key, get_response_cache, model_from_url
+
+
+# Lower value = admitted first. Later pipeline stages win ties for a slot.
+STAGE_PRIORITY = {
+    'step8_verification': 0,
+    'step7_components': 1,
+    'step5_context': 2,
+    'step6_selection': 3,
+    'step4_synthesis': 4,
+    'publish': 5,
+    'step1_5_clustering': 6,
+    'world_events': 6,
+    'sports': 6,
+    'step1_scoring': 7,
+}
+DEFAULT_STAGE_PRIORITY = 5
+
+
+@dataclass
+class GatewayConfig:
+    """Configuration for the LLM call gateway"""
+    initial_limit: float = float(os.getenv('LLM_INITIAL_CONCURRENCY', '5'))
+    min_limit: float = 1.0
+    max_limit: float = float(os.getenv('LLM_MAX_CONCURRENCY', '20'))
+    additive_increase: float = 1.0
+    multiplicative_decrease: float = 0.5
+    decrease_cooldown_s: float = 5.0      # Min time between two decreases
+    slow_call_factor: float = 3.0         # Call > factor x stage EWMA latency = congestion
+    latency_ewma_alpha: float = 0.2
+    retry_budget_per_cycle: int = int(os.getenv('LLM_RETRY_BUDGET', '200'))
+    base_backoff_s: float = 1.0
+    throttle_backoff_s: float = 5.0
+    max_backoff_s: float = 60.0
+
+
+def _is_throttle_error(exc: BaseException) -> bool:
+    """True if an SDK exception looks like a rate limit (429 / quota)."""
+    text = f"{type(exc).__name__} {exc}"
+    return '429' in text or 'ResourceExhausted' in text or 'RESOURCE_EXHAUSTED' in text
+
+
+class _StageMetrics:
+    __slots__ = ('calls', 'throttled', 'errors', 'retries', 'cache_hits', 'queue_s', 'service_s',
+                 'max_queue_s', 'ewma_latency_s')
+
+    def __init__(self):
+        self.calls = 0
+        self.throttled = 0
+        self.errors = 0
+        self.retries = 0
+        self.cache_hits = 0
+        self.queue_s = 0.0
+        self.service_s = 0.0
+        self.max_queue_s = 0.0
+        self.ewma_latency_s = None
+
+
+class _Slot:
+    """
+    Context manager holding one gateway slot for a stage.
+
+    Reentrant per thread: a call made while the same thread already holds a
+    slot does not take a second one (avoids self-deadlock when a step that
+    is wrapped in a slot calls a gateway-routed helper).
+    """
+
+    def __init__(self, gateway: 'LLMGateway', stage: str):
+        self.gateway = gateway
+        self.stage = stage
+        self._local = threading.local()
+
+    def __enter__(self):
+        depth = getattr(self._local, 'depth', 0)
+        self._local.depth = depth + 1
+        if depth == 0 and not self.gateway._held():
+            self._local.owner = True
+            self._local.start = self.gateway._acquire(self.stage)
+        else:
+            self._local.owner = False
+        self._local.throttled = False
+        return self
+
+    def mark_throttled(self):
+        self._local.throttled = True
+
+    def __exit__(self, exc_type, exc, tb):
+        self._local.depth -= 1
+        if self._local.depth == 0 and self._local.owner:
+            throttled = self._local.throttled or (exc is not None and _is_throttle_error(exc))
+            self.gateway._release(self.stage, self._local.start, throttled, error=exc is not None)
+        return False
+
+
+class LLMGateway:
+    """Adaptive, prioritized admission control for LLM calls"""
+
+    def __init__(self, config: Optional[GatewayConfig] = None):
+        self.config = config or GatewayConfig()
+        self.limit = self.config.initial_limit
+        self._in_flight = 0
+        self._waiters = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._last_decrease = 0.0
+        self._retry_budget = self.config.retry_budget_per_cycle
+        self._metrics: Dict[str, _StageMetrics] = {}
+        self._holders = threading.local()
+
+    # ------------------------------------------
+    # Admission
+    # ------------------------------------------
+
+    def _held(self) -> bool:
+        return getattr(self._holders, 'count', 0) > 0
+
+    def _stage(self, stage: str) -> _StageMetrics:
+        m = self._metrics.get(stage)
+        if m is None:
+            m = self._metrics[stage] = _StageMetrics()
+        return m
+
+    def _acquire(self, stage: str) -> float:
+        """Block until admitted. Returns the service start time."""
+        enqueued = time.time()
+        ticket = (STAGE_PRIORITY.get(stage, DEFAULT_STAGE_PRIORITY), next(self._seq))
+        with self._cond:
+            heapq.heappush(self._waiters, ticket)
+            while not (self._waiters[0] == ticket and self._in_flight < max(int(self.limit), 1)):
+                self._cond.wait()
+            heapq.heappop(self._waiters)
+            self._in_flight += 1
+            started = time.time()
+            m = self._stage(stage)
+            waited = started - enqueued
+            m.queue_s += waited
+            m.max_queue_s = max(m.max_queue_s, waited)
+            # Next waiter may also fit under the limit
+            self._cond.notify_all()
+        self._holders.count = getattr(self._holders, 'count', 0) + 1
+        return started
+
+    def _release(self, stage: str, started: float, throttled: bool, error: bool = False):
+        self._holders.count -= 1
+        service = time.time() - started
+        cfg = self.config
+        with self._cond:
+            self._in_flight -= 1
+            m = self._stage(stage)
+            m.calls += 1
+            m.service_s += service
+            if error and not throttled:
+                m.errors += 1
+
+            slow = m.ewma_latency_s is not None and service > cfg.slow_call_factor * m.ewma_latency_s
+            if throttled:
+                m.throttled += 1
+            elif not error:
+                m.ewma_latency_s = service if m.ewma_latency_s is None else (
+                    cfg.latency_ewma_alpha * service + (1 - cfg.latency_ewma_alpha) * m.ewma_latency_s
+                )
+
+            now = time.time()
+            if throttled or slow:
+                if now - self._last_decrease >= cfg.decrease_cooldown_s:
+                    self.limit = max(cfg.min_limit, self.limit * cfg.multiplicative_decrease)
+                    self._last_decrease = now
+            elif not error:
+                self.limit = min(cfg.max_limit, self.limit + cfg.additive_increase / max(self.limit, 1.0))
+            self._cond.notify_all()
+
+    def slot(self, stage: str) -> _Slot:
+        """Context manager that holds one slot while an SDK call runs."""
+        return _Slot(self, stage)
+
+    # ------------------------------------------
+    # Retries
+    # ------------------------------------------
+
+    def start_cycle(self):
+        """Reset the per-cycle retry budget and metrics."""
+        with self._cond:
+            self._retry_budget = self.config.retry_budget_per_cycle
+            self._metrics = {}
+
+    def backoff(self, stage: str, attempt: int, throttled: bool = False) -> bool:
+        """
+        Spend one unit of retry budget and sleep before the next attempt.
+
+        Returns:
+            False if the budget is exhausted (caller should give up now)
+        """
+        with self._cond:
+            if self._retry_budget <= 0:
+                print(f"   ⚠️ LLM retry budget exhausted ({stage}) - failing fast")
+                return False
+            self._retry_budget -= 1
+            self._stage(stage).retries += 1
+        base = self.config.throttle_backoff_s if throttled else self.config.base_backoff_s
+        delay = min(self.config.max_backoff_s, base * (2 ** attempt))
+        time.sleep(delay * (0.5 + random.random() / 2))
+        return True
+
+    def post(self, url: str, json: Dict, timeout: float, stage: str,
+             max_retries: int = 2, cache_ttl_s: Optional[float] = None,
+             cache_refresh: bool = False) -> requests.Response:
+        """
+        POST to an LLM REST endpoint through the gateway.
+
+        Retries 429 / 5xx / network errors with jittered backoff while the
+        cycle's retry budget lasts. Returns the last response (callers keep
+        their own raise_for_status / parsing); re-raises the last network
+        error if no response was ever received.
+
+        With cache_ttl_s, a 200 response is stored in the response cache and
+        an identical request (same model, prompt and generation config)
+        within the TTL is answered from it. cache_refresh skips the lookup
+        but stores the new answer (for retries after a cached answer failed
+        the caller's validation).
+        """
+        cache = get_response_cache() if cache_ttl_s else None
+        if cache is not None:
+            model = model_from_url(url)
+            key = cache_key(model, json)
+            if not cache_refresh:
+                body = cache.get(key)
+                if body is not None:
+                    with self._cond:
+                        self._stage(stage).cache_hits += 1
+                    return _cached_response(body)
+            response = self._post(url, json, timeout, stage, max_retries)
+            if response.status_code == 200:
+                cache.put(key, response.text, cache_ttl_s, model)
+            return response
+        return self._post(url, json, timeout, stage, max_retries)
+
+    def _post(self, url: str, json: Dict, timeout: float, stage: str,
+              max_retries: int) -> requests.Response:
+        attempt = 0
+        while True:
+            response = None
+            error = None
+            with self.slot(stage) as s:
+                try:
+                    response = requests.post(url, json=json, timeout=timeout)
+                except requests.exceptions.RequestException as e:
+                    error = e
+                if response is not None and response.status_code == 429:
+                    s.mark_throttled()
+
+            throttled = response is not None and response.status_code == 429
+            retryable = error is not None or throttled or (response is not None and response.status_code >= 500)
+            if not retryable:
+                return response
+            if attempt >= max_retries or not self.backoff(stage, attempt, throttled=throttled):
+                if response is None:
+                    raise error
+                return response
+            attempt += 1
+
+    # ------------------------------------------
+    # Metrics
+    # ------------------------------------------
+
+    def metrics(self) -> Dict[str, Dict]:
+        """Per-stage snapshot: counts plus mean queue vs service time."""
+        with self._cond:
+            snapshot = {}
+            for stage, m in self._metrics.items():
+                n = max(m.calls, 1)
+                snapshot[stage] = {
+                    'calls': m.calls,
+                    'throttled': m.throttled,
+                    'errors': m.errors,
+                    'retries': m.retries,
+                    'cache_hits': m.cache_hits,
+                    'avg_queue_s': round(m.queue_s / n, 3),
+                    'max_queue_s': round(m.max_queue_s, 3),
+                    'avg_service_s': round(m.service_s / n, 3),
+                }
+            snapshot['_gateway'] = {
+                'limit': round(self.limit, 2),
+                'in_flight': self._in_flight,
+                'retry_budget_left': self._retry_budget,
+            }
+            return snapshot
+
+    def print_metrics(self):
+        snapshot = self.metrics()
+        gw = snapshot.pop('_gateway')
+        print(f"   🤖 LLM gateway: limit={gw['limit']} retry budget left={gw['retry_budget_left']}")
+        for stage, m in sorted(snapshot.items(), key=lambda kv: STAGE_PRIORITY.get(kv[0], DEFAULT_STAGE_PRIORITY)):
+            print(f"      {stage:<20} calls={m['calls']:<4} 429={m['throttled']:<3} retries={m['retries']:<3} "
+                  f"cached={m['cache_hits']:<3} queue={m['avg_queue_s']:.2f}s (max {m['max_queue_s']:.1f}s) service={m['avg_service_s']:.2f}s")
+
+
+def _cached_response(body: str) -> requests.Response:
+    """A 200 response carrying a cached body (callers parse it as usual)."""
+    response = requests.Response()
+    response.status_code = 200
+    response._content = body.encode('utf-8')
+    response.encoding = 'utf-8'
+    response.headers['Content-Type'] = 'application/json'
+    return response
+
+
+_gateway = None
+_gateway_lock = threading.Lock()
+
+
+def get_gateway() -> LLMGateway:
+    """Process-wide gateway instance."""
+    global _gateway
+    if _gateway is None:
+        with _gateway_lock:
+            if _gateway is None:
+                _gateway = LLMGateway()
+    return _gateway
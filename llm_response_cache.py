@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+LLM RESPONSE CACHE
+==========================================
+Purpose: Content-addressed cache for idempotent LLM calls, so replays
+         (retries and re-runs within a process, rescore/backfill scripts)
+         don't pay twice for the same answer.
+
+Key:
+  sha256 of (model, canonical JSON of the request payload). The payload
+  holds the prompt and the generation config (temperature, max tokens,
+  mime type), so any change to either is a different entry. API keys are
+  never part of the key.
+
+Storage:
+  - One local SQLite file (LLM_CACHE_PATH), safe to share between threads
+    and processes on the same machine.
+  - Each entry has its own TTL, chosen by the call site.
+  - Total size is bounded (LLM_CACHE_MAX_MB); the least recently used
+    entries are evicted first.
+
+Cloud Run:
+  Every execution of the Cloud Run Job starts with a fresh, in-memory
+  filesystem, so the default file only serves repeats within one execution
+  (a crashed execution's answers are gone) and its pages count against the
+  container's memory. There the default cap is 32 MB. Reuse across
+  executions needs LLM_CACHE_PATH on a mounted persistent volume, with
+  LLM_CACHE_MAX_MB raised to match.
+
+Opt-in:
+  Nothing is cached unless the call site asks for it, either with
+  get_gateway().post(..., cache_ttl_s=...) for REST calls or
+  get_response_cache().get_or_call(...) for SDK calls. Creative steps
+  (synthesis, components) don't opt in, since their retries are meant to
+  re-sample. LLM_RESPONSE_CACHE=0 disables the cache everywhere.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional
+
+
+# Cloud Run Jobs set CLOUD_RUN_JOB, services K_SERVICE
+ON_CLOUD_RUN = bool(os.getenv('CLOUD_RUN_JOB') or os.getenv('K_SERVICE'))
+
+
+@dataclass
+class ResponseCacheConfig:
+    """Configuration for the LLM response cache"""
+    path: str = os.getenv('LLM_CACHE_PATH', os.path.join('.cache', 'llm_responses.sqlite'))
+    # In-memory filesystem on Cloud Run: keep the default small
+    max_bytes: int = int(os.getenv('LLM_CACHE_MAX_MB', '32' if ON_CLOUD_RUN else '256')) * 1024 * 1024
+    evict_fraction: float = 0.1  # Share of max_bytes freed per eviction pass
+
+
+def response_cache_enabled() -> bool:
+    return os.getenv('LLM_RESPONSE_CACHE', '1') != '0'
+
+
+def cache_key(model: str, payload: Dict) -> str:
+    """Content address of one request: model + prompt + generation config."""
+    canonical = json.dumps(payload, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(f"{model}\n{canonical}".encode('utf-8')).hexdigest()
+
+
+def model_from_url(url: str) -> str:
+    """'.../models/gemini-2.5-flash-lite:generateContent?key=...' -> model name."""
+    path = url.split('?', 1)[0]
+    if '/models/' in path:
+        return path.split('/models/', 1)[1].split(':', 1)[0]
+    return path
+
+
+class LLMResponseCache:
+    """TTL + size-bounded response store (SQLite)"""
+
+    def __init__(self, config: Optional[ResponseCacheConfig] = None):
+        self.config = config or ResponseCacheConfig()
+        self._lock = threading.Lock()
+        self._conn = None
+        self.stats = {'hits': 0, 'misses': 0, 'writes': 0, 'evicted': 0}
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.config.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.config.path, timeout=10, check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    model TEXT,
+                    body TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    expires_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+            """)
+            conn.execute('CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at)')
+            self._conn = conn
+        return self._conn
+
+    def get(self, key: str) -> Optional[str]:
+        """Cached body, or None if missing/expired (or the cache is unusable)."""
+        now = time.time()
+        try:
+            with self._lock:
+                db = self._db()
+                row = db.execute('SELECT body, expires_at FROM responses WHERE key = ?', (key,)).fetchone()
+                if row is None or row[1] < now:
+                    if row is not None:
+                        db.execute('DELETE FROM responses WHERE key = ?', (key,))
+                        db.commit()
+                    self.stats['misses'] += 1
+                    return None
+                db.execute('UPDATE responses SET accessed_at = ? WHERE key = ?', (now, key))
+                db.commit()
+                self.stats['hits'] += 1
+                return row[0]
+        except sqlite3.Error as e:
+            print(f"   ⚠️ LLM cache read failed: {e}")
+            return None
+
+    def put(self, key: str, body: str, ttl_s: float, model: str = ''):
+        now = time.time()
+        size = len(body.encode('utf-8'))
+        if size > self.config.max_bytes:
+            return
+        try:
+            with self._lock:
+                db = self._db()
+                db.execute(
+                    'INSERT OR REPLACE INTO responses (key, model, body, size, expires_at, accessed_at) '
+                    'VALUES (?, ?, ?, ?, ?, ?)',
+                    (key, model, body, size, now + ttl_s, now)
+                )
+                self.stats['writes'] += 1
+                self._evict(db, now)
+                db.commit()
+        except sqlite3.Error as e:
+            print(f"   ⚠️ LLM cache write failed: {e}")
+
+    def _evict(self, db: sqlite3.Connection, now: float):
+        """Drop expired entries, then least recently used until under max_bytes."""
+        total = db.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+        if total <= self.config.max_bytes:
+            return
+        self.stats['evicted'] += db.execute('DELETE FROM responses WHERE expires_at < ?', (now,)).rowcount
+        total = db.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+        target = self.config.max_bytes * (1 - self.config.evict_fraction)
+        if total <= target:
+            return
+        freed = 0
+        doomed = []
+        for key, size in db.execute('SELECT key, size FROM responses ORDER BY accessed_at'):
+            doomed.append((key,))
+            freed += size
+            if total - freed <= target:
+                break
+        db.executemany('DELETE FROM responses WHERE key = ?', doomed)
+        self.stats['evicted'] += len(doomed)
+
+    def get_or_call(self, model: str, payload: Dict, ttl_s: float, call: Callable[[], str],
+                    refresh: bool = False) -> str:
+        """
+        Cached text for (model, payload), calling `call` on a miss.
+
+        Args:
+            refresh: Skip the lookup but store the new answer (use on retries
+                     after a cached answer failed the caller's validation)
+        """
+        key = cache_key(model, payload)
+        if not refresh:
+            cached = self.get(key)
+            if cached is not None:
+                return cached
+        text = call()
+        if text:
+            self.put(key, text, ttl_s, model)
+        return text
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> Optional[LLMResponseCache]:
+    """Process-wide cache, or None when LLM_RESPONSE_CACHE=0."""
+    global _cache
+    if not response_cache_enabled():
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = LLMResponseCache()
+    return _cache
@@ -0,0 +1,42 @@
+-- Compact cluster centroid state for Step 1.5 clustering.
+--
+-- clusters.embedding holds the centroid as a JSONB array of 3072 float64
+-- numbers (~60KB per row over REST) and was re-read for every active cluster
+-- every cycle. The clustering engine now stores the centroid as base64-encoded
+-- float16 bytes (~8KB) in clusters.centroid, weighted by the existing
+-- source_count, and loads active clusters with a column projection that
+-- skips the JSON column.
+--
+-- update_cluster_centroids() applies a batch of incremental centroid updates
+-- in one set-based UPDATE instead of one REST call per cluster.
+--   p_rows: [{"id": 1, "centroid": "<base64>", "source_count": 3,
+--             "last_updated_at": "2026-01-01T00:00:00" | null}, ...]
+-- NULL source_count / last_updated_at leave the existing value unchanged.
+--
+-- clusters.embedding is left in place; rows without a centroid are read from
+-- it once and migrated by the clustering engine. Idempotent.
+
+ALTER TABLE public.clusters
+  ADD COLUMN IF NOT EXISTS centroid text;
+
+COMMENT ON COLUMN public.clusters.centroid IS
+  'Cluster centroid (mean of member title embeddings, gemini-embedding-001, 3072 dims) as base64-encoded little-endian float16 bytes.';
+
+CREATE OR REPLACE FUNCTION public.update_cluster_centroids(p_rows jsonb)
+RETURNS integer
+LANGUAGE sql
+AS $$
+  WITH upd AS (
+    UPDATE public.clusters c
+    SET centroid        = r.centroid,
+        source_count    = COALESCE(r.source_count, c.source_count),
+        last_updated_at = COALESCE(r.last_updated_at, c.last_updated_at)
+    FROM jsonb_to_recordset(p_rows)
+      AS r(id bigint, centroid text, source_count integer, last_updated_at timestamptz)
+    WHERE c.id = r.id
+    RETURNING 1
+  )
+  SELECT count(*)::integer FROM upd;
+$$;
+
+GRANT EXECUTE ON FUNCTION public.update_cluster_centroids(jsonb) TO service_role;
@@ -0,0 +1,27 @@
+-- Adaptive RSS polling schedule for Step 0 of the clustered workflow.
+--
+-- Every RSS source used to be fetched on every cycle. The workflow now keeps
+-- one row per source with its learned publish cadence (mean gap between
+-- entries) and failure count, and only fetches sources whose next_poll_at
+-- has passed. Fast wire feeds stay due every cycle; slow blogs and failing
+-- feeds back off (see source_poll_scheduler.py). Sources without a row are
+-- always due, so an empty table means "poll everything". Idempotent.
+
+CREATE TABLE IF NOT EXISTS public.rss_source_schedule (
+    source_name TEXT PRIMARY KEY,
+    mean_gap_s DOUBLE PRECISION,
+    consecutive_failures INT NOT NULL DEFAULT 0,
+    last_polled_at TIMESTAMPTZ,
+    next_poll_at TIMESTAMPTZ,
+    newest_entry_at TIMESTAMPTZ,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_rss_source_schedule_next_poll
+    ON public.rss_source_schedule(next_poll_at);
+
+-- Allow service role full access
+ALTER TABLE public.rss_source_schedule ENABLE ROW LEVEL SECURITY;
+DROP POLICY IF EXISTS "Service role full access" ON public.rss_source_schedule;
+CREATE POLICY "Service role full access" ON public.rss_source_schedule
+    FOR ALL USING (true) WITH CHECK (true);
@@ -0,0 +1,50 @@
+-- ANN candidate search for world-event historical backfill.
+--
+-- When a new world event is created, step6_world_event_detection used to find
+-- related history with up to five sequential ILIKE '%keyword%' scans over 90
+-- days of published_articles. It now embeds the event's name + topic_prompt
+-- with MiniLM and retrieves the nearest articles through the existing HNSW
+-- index on embedding_minilm_vec (migration 020). Unlike
+-- match_articles_personal_minilm this applies no shelf-life filter: expired
+-- articles are exactly what a timeline backfill wants.
+--
+-- Returns the columns the backfill needs so no second round trip is required
+-- (casts keep RETURN QUERY independent of the exact column types).
+
+-- Left VOLATILE (like 058/059): SET LOCAL is rejected inside a STABLE function.
+CREATE OR REPLACE FUNCTION public.match_articles_for_event_minilm(
+  query_embedding float8[],
+  match_count int DEFAULT 60,
+  days_window int DEFAULT 90,
+  min_similarity float8 DEFAULT 0.35
+)
+RETURNS TABLE (
+  id bigint,
+  title_news text,
+  summary_bullets_news jsonb,
+  published_at timestamptz,
+  created_at timestamptz,
+  similarity float8
+)
+LANGUAGE plpgsql
+AS $function$
+BEGIN
+  SET LOCAL hnsw.ef_search = 200;
+  RETURN QUERY
+    SELECT
+      pa.id::bigint,
+      pa.title_news::text,
+      to_jsonb(pa.summary_bullets_news),
+      pa.published_at::timestamptz,
+      pa.created_at::timestamptz,
+      (1 - (pa.embedding_minilm_vec <=> query_embedding::vector(384)))::float8 AS similarity
+    FROM published_articles pa
+    WHERE pa.created_at >= NOW() - make_interval(days => days_window)
+      AND pa.embedding_minilm_vec IS NOT NULL
+      AND 1 - (pa.embedding_minilm_vec <=> query_embedding::vector(384)) >= min_similarity
+    ORDER BY pa.embedding_minilm_vec <=> query_embedding::vector(384)
+    LIMIT match_count;
+END;
+$function$;
+
+GRANT EXECUTE ON FUNCTION public.match_articles_for_event_minilm(float8[], int, int, float8) TO service_role;
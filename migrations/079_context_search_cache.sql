@@ -0,0 +1,69 @@
+-- Semantic cache for Step 5 (Google-Search-grounded context search).
+--
+-- Ongoing stories trigger near-identical grounded queries cycle after cycle.
+-- step2_gemini_context_search stores each grounded result with the MiniLM
+-- embedding of the article's title + bullets and a per-component fetch time.
+-- A new request reuses the closest entry that covers its components while
+-- every component is within its freshness TTL, and refreshes only the stale
+-- components with a smaller "what's new since" query. Idempotent.
+
+CREATE TABLE IF NOT EXISTS public.context_search_cache (
+    id BIGSERIAL PRIMARY KEY,
+    title TEXT,
+    components TEXT[] NOT NULL,
+    embedding_minilm_vec vector(384) NOT NULL,
+    results TEXT NOT NULL,
+    citations JSONB NOT NULL DEFAULT '[]'::jsonb,
+    component_fetched_at JSONB NOT NULL,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_context_search_cache_embedding
+    ON public.context_search_cache USING hnsw (embedding_minilm_vec vector_cosine_ops);
+CREATE INDEX IF NOT EXISTS idx_context_search_cache_created_at
+    ON public.context_search_cache(created_at);
+
+-- Allow service role full access
+ALTER TABLE public.context_search_cache ENABLE ROW LEVEL SECURITY;
+DROP POLICY IF EXISTS "Service role full access" ON public.context_search_cache;
+CREATE POLICY "Service role full access" ON public.context_search_cache
+    FOR ALL USING (true) WITH CHECK (true);
+
+-- Left VOLATILE (like 058/059): SET LOCAL is rejected inside a STABLE function.
+CREATE OR REPLACE FUNCTION public.match_context_search_cache(
+  query_embedding float8[],
+  match_count int DEFAULT 5,
+  min_similarity float8 DEFAULT 0.88,
+  max_age_hours float8 DEFAULT 168
+)
+RETURNS TABLE (
+  id bigint,
+  components text[],
+  results text,
+  citations jsonb,
+  component_fetched_at jsonb,
+  created_at timestamptz,
+  similarity float8
+)
+LANGUAGE plpgsql
+AS $function$
+BEGIN
+  SET LOCAL hnsw.ef_search = 100;
+  RETURN QUERY
+    SELECT
+      c.id,
+      c.components,
+      c.results,
+      c.citations,
+      c.component_fetched_at,
+      c.created_at,
+      (1 - (c.embedding_minilm_vec <=> query_embedding::vector(384)))::float8 AS similarity
+    FROM context_search_cache c
+    WHERE c.created_at >= NOW() - make_interval(secs => max_age_hours * 3600)
+      AND 1 - (c.embedding_minilm_vec <=> query_embedding::vector(384)) >= min_similarity
+    ORDER BY c.embedding_minilm_vec <=> query_embedding::vector(384)
+    LIMIT match_count;
+END;
+$function$;
+
+GRANT EXECUTE ON FUNCTION public.match_context_search_cache(float8[], int, float8, float8) TO service_role;
@@ -0,0 +1,130 @@
+-- Batched, atomic telemetry writes for the clustered workflow.
+--
+-- Cluster workers used to write tracking rows inline: one UPDATE per source
+-- article, a SELECT + UPDATE/INSERT per source domain on source_reliability
+-- (lost increments when two workers raced on the same domain) and a
+-- SELECT + UPDATE per cluster status change to append attempt_history.
+-- pipeline_telemetry.TelemetryBuffer now aggregates those writes in memory
+-- and flushes them through the three functions below, one call per table.
+-- Counters are applied as increments inside the database and cluster rows
+-- are locked while their history is appended, so concurrent flushes don't
+-- lose updates. Idempotent.
+
+-- 1. source_articles fetch/image flags: rows = [{id, content_fetched?, fetch_failure_reason?, has_image?, image_quality_score?}]
+CREATE OR REPLACE FUNCTION public.update_source_article_status_batch(rows jsonb)
+RETURNS void
+LANGUAGE sql
+AS $function$
+  UPDATE source_articles s SET
+    content_fetched = COALESCE((r->>'content_fetched')::boolean, s.content_fetched),
+    fetch_failure_reason = COALESCE(r->>'fetch_failure_reason', s.fetch_failure_reason),
+    has_image = COALESCE((r->>'has_image')::boolean, s.has_image),
+    image_quality_score = COALESCE((r->>'image_quality_score')::float, s.image_quality_score)
+  FROM jsonb_array_elements(rows) r
+  WHERE s.id = (r->>'id')::bigint;
+$function$;
+
+-- 2. source_reliability counters: rows = [{source_domain, attempts, successes, failures,
+--    last_attempt_at, last_success_at, failure_reason}] (one row per domain)
+CREATE OR REPLACE FUNCTION public.record_source_reliability_batch(rows jsonb)
+RETURNS void
+LANGUAGE sql
+AS $function$
+  INSERT INTO source_reliability AS sr (
+    source_domain, total_attempts, successful_fetches, failed_fetches,
+    first_seen_at, last_attempt_at, last_success_at, common_failure_reason
+  )
+  SELECT
+    r->>'source_domain',
+    (r->>'attempts')::int,
+    (r->>'successes')::int,
+    (r->>'failures')::int,
+    (r->>'last_attempt_at')::timestamptz,
+    (r->>'last_attempt_at')::timestamptz,
+    (r->>'last_success_at')::timestamptz,
+    r->>'failure_reason'
+  FROM jsonb_array_elements(rows) r
+  ON CONFLICT (source_domain) DO UPDATE SET
+    total_attempts = COALESCE(sr.total_attempts, 0) + EXCLUDED.total_attempts,
+    successful_fetches = COALESCE(sr.successful_fetches, 0) + EXCLUDED.successful_fetches,
+    failed_fetches = COALESCE(sr.failed_fetches, 0) + EXCLUDED.failed_fetches,
+    last_attempt_at = GREATEST(sr.last_attempt_at, EXCLUDED.last_attempt_at),
+    last_success_at = GREATEST(sr.last_success_at, EXCLUDED.last_success_at),
+    common_failure_reason = COALESCE(EXCLUDED.common_failure_reason, sr.common_failure_reason);
+$function$;
+
+-- 3. Cluster status transitions: rows = [{id, events: [{status, reason, details, increment, at}]}]
+--    Same semantics as the old per-call update_cluster_status, applied in order.
+CREATE OR REPLACE FUNCTION public.record_cluster_status_batch(rows jsonb)
+RETURNS void
+LANGUAGE plpgsql
+AS $function$
+DECLARE
+  r jsonb;
+  e jsonb;
+  c record;
+  cnt int;
+  hist jsonb;
+  v_recovered boolean;
+  v_before_success int;
+  v_reason text;
+  v_details text;
+  v_status text;
+  v_at timestamptz;
+BEGIN
+  FOR r IN SELECT * FROM jsonb_array_elements(rows) LOOP
+    SELECT attempt_count, first_attempt_at, attempt_history, failure_reason, failure_details,
+           recovered, attempts_before_success
+      INTO c
+      FROM clusters
+     WHERE id = (r->>'id')::bigint
+       FOR UPDATE;
+    IF NOT FOUND THEN
+      CONTINUE;
+    END IF;
+
+    cnt := COALESCE(c.attempt_count, 0);
+    hist := COALESCE(c.attempt_history, '[]'::jsonb);
+    v_recovered := c.recovered;
+    v_before_success := c.attempts_before_success;
+    v_reason := c.failure_reason;
+    v_details := c.failure_details;
+
+    FOR e IN SELECT * FROM jsonb_array_elements(r->'events') LOOP
+      hist := hist || jsonb_build_array(jsonb_build_object(
+        'attempt', cnt + 1,
+        'at', e->>'at',
+        'status', e->>'status',
+        'reason', e->'reason'
+      ));
+      IF e->>'status' = 'published' AND cnt > 0 THEN
+        v_recovered := TRUE;
+        v_before_success := cnt + 1;
+      END IF;
+      IF (e->>'increment')::boolean THEN
+        cnt := cnt + 1;
+      END IF;
+      v_reason := COALESCE(e->>'reason', v_reason);
+      v_details := COALESCE(e->>'details', v_details);
+      v_status := e->>'status';
+      v_at := (e->>'at')::timestamptz;
+    END LOOP;
+
+    UPDATE clusters SET
+      publish_status = v_status,
+      last_attempt_at = v_at,
+      first_attempt_at = COALESCE(c.first_attempt_at, (r->'events'->0->>'at')::timestamptz),
+      attempt_count = cnt,
+      attempt_history = hist,
+      recovered = v_recovered,
+      attempts_before_success = v_before_success,
+      failure_reason = v_reason,
+      failure_details = v_details
+    WHERE id = (r->>'id')::bigint;
+  END LOOP;
+END;
+$function$;
+
+GRANT EXECUTE ON FUNCTION public.update_source_article_status_batch(jsonb) TO service_role;
+GRANT EXECUTE ON FUNCTION public.record_source_reliability_batch(jsonb) TO service_role;
+GRANT EXECUTE ON FUNCTION public.record_cluster_status_batch(jsonb) TO service_role;
@@ -0,0 +1,30 @@
+-- Per-cluster processing checkpoints (see cluster_checkpoints.py).
+--
+-- process_single_cluster saves each expensive step's output here (full
+-- texts, selected image, validated sources, synthesis, component selection,
+-- context, components, verified article) with the hash of the inputs it was
+-- computed from. A retried cluster resumes from its last valid checkpoint
+-- instead of re-fetching and re-generating everything. Rows are deleted when
+-- the cluster is published or fails for good, and ignored after 72h; the
+-- workflow prunes those at the end of every cycle. Idempotent.
+
+CREATE TABLE IF NOT EXISTS public.cluster_checkpoints (
+    cluster_id BIGINT NOT NULL REFERENCES public.clusters(id) ON DELETE CASCADE,
+    step TEXT NOT NULL,
+    input_hash TEXT NOT NULL,
+    payload JSONB,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (cluster_id, step)
+);
+
+CREATE INDEX IF NOT EXISTS idx_cluster_checkpoints_updated_at
+    ON public.cluster_checkpoints(updated_at);
+
+-- Allow service role full access
+ALTER TABLE public.cluster_checkpoints ENABLE ROW LEVEL SECURITY;
+DROP POLICY IF EXISTS "Service role full access" ON public.cluster_checkpoints;
+CREATE POLICY "Service role full access" ON public.cluster_checkpoints
+    FOR ALL USING (true) WITH CHECK (true);
+
+-- Housekeeping for abandoned clusters (safe to run any time)
+DELETE FROM public.cluster_checkpoints WHERE updated_at < NOW() - INTERVAL '7 days';
@@ -0,0 +1,55 @@
+-- Set-based bulk writes for the nightly global cluster rebuild
+-- (see services/global_cluster_builder.py).
+--
+-- write_article_clusters used to issue one REST UPDATE per article (75k+
+-- round trips). These functions take a chunk of rows as a jsonb array and
+-- apply it as a single UPDATE ... FROM, so a rebuild writes in a few dozen
+-- calls. The builder retries failed chunks and falls back to per-row
+-- updates if the functions are missing. Idempotent.
+
+-- rows: [{"id": 1, "super_cluster_id": 3, "leaf_cluster_id": 7,
+--         "cluster_assignments": [{"super": 3, "leaf": 7, "weight": 0.6}, ...]}, ...]
+CREATE OR REPLACE FUNCTION public.bulk_update_article_clusters(rows jsonb)
+RETURNS integer
+LANGUAGE sql
+AS $$
+    WITH src AS (
+        SELECT (r->>'id')::bigint               AS id,
+               (r->>'super_cluster_id')::int    AS super_cluster_id,
+               (r->>'leaf_cluster_id')::int     AS leaf_cluster_id,
+               r->'cluster_assignments'         AS cluster_assignments
+        FROM jsonb_array_elements(rows) AS r
+    ), updated AS (
+        UPDATE public.published_articles pa
+        SET super_cluster_id = src.super_cluster_id,
+            leaf_cluster_id = src.leaf_cluster_id,
+            cluster_assignments = src.cluster_assignments
+        FROM src
+        WHERE pa.id = src.id
+        RETURNING 1
+    )
+    SELECT COUNT(*)::int FROM updated;
+$$;
+
+-- rows: [{"id": 1, "embedding_minilm": [0.01, ...]}, ...]
+-- trg_sync_embedding_minilm_vec keeps embedding_minilm_vec in sync.
+CREATE OR REPLACE FUNCTION public.bulk_update_article_embeddings(rows jsonb)
+RETURNS integer
+LANGUAGE sql
+AS $$
+    WITH src AS (
+        SELECT (r->>'id')::bigint AS id,
+               r->'embedding_minilm' AS embedding_minilm
+        FROM jsonb_array_elements(rows) AS r
+    ), updated AS (
+        UPDATE public.published_articles pa
+        SET embedding_minilm = src.embedding_minilm
+        FROM src
+        WHERE pa.id = src.id
+        RETURNING 1
+    )
+    SELECT COUNT(*)::int FROM updated;
+$$;
+
+GRANT EXECUTE ON FUNCTION public.bulk_update_article_clusters(jsonb) TO service_role;
+GRANT EXECUTE ON FUNCTION public.bulk_update_article_embeddings(jsonb) TO service_role;
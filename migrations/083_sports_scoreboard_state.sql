@@ -0,0 +1,20 @@
+-- Per-league ESPN scoreboard delta state (see ScoreboardDelta in
+-- sports_espn_poller.py).
+--
+-- Each row holds the last fully handled scoreboard of one league: ETag /
+-- Last-Modified, body hash, completion fingerprint and produced event IDs.
+-- Cloud Run Jobs start with a fresh filesystem, so this lives in Supabase
+-- like sports_poll_tracking; the local JSON file is only a dev fallback.
+-- Idempotent.
+
+CREATE TABLE IF NOT EXISTS public.sports_scoreboard_state (
+    league_key TEXT PRIMARY KEY,
+    state JSONB NOT NULL,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+-- Allow service role full access
+ALTER TABLE public.sports_scoreboard_state ENABLE ROW LEVEL SECURITY;
+DROP POLICY IF EXISTS "Service role full access" ON public.sports_scoreboard_state;
+CREATE POLICY "Service role full access" ON public.sports_scoreboard_state
+    FOR ALL USING (true) WITH CHECK (true);
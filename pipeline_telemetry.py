@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+PIPELINE TELEMETRY BUFFER
+==========================================
+Purpose: Write-behind buffer for the workflow's tracking tables
+         (clusters status/history, source_articles fetch flags,
+         source_reliability counters).
+
+Cluster workers used to write telemetry inline: one UPDATE per source,
+a SELECT + UPDATE/INSERT per source domain (which lost increments when two
+workers raced on the same domain) and a SELECT + UPDATE per cluster status
+change. Now the workers only record events in memory:
+  - source status: last value per source_articles row
+  - reliability: summed attempts/successes/failures per domain
+  - cluster status: ordered transitions per cluster
+
+flush() writes everything in three round trips through server-side batch
+functions (migration 080) that apply the counters as atomic increments and
+append attempt_history in SQL. A background thread flushes every
+flush_interval_s, and the workflow also flushes at the end of each cycle.
+If the batch functions are missing, flush falls back to per-row writes.
+"""
+
+import threading
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+
+class TelemetryBuffer:
+    """Thread-safe aggregation of tracking writes, flushed in batches"""
+
+    def __init__(self, get_client: Callable, flush_interval_s: float = 10.0):
+        self._get_client = get_client
+        self.flush_interval_s = flush_interval_s
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._source_status: Dict[int, Dict] = {}
+        self._reliability: Dict[str, Dict] = {}
+        self._cluster_events: Dict[int, List[Dict]] = {}
+        self._flusher = None
+        self._stop = threading.Event()
+        self._batch_rpc_available = True
+
+    # ------------------------------------------
+    # Recording (no I/O)
+    # ------------------------------------------
+
+    def _ensure_flusher(self):
+        if self._flusher is None:
+            self._flusher = threading.Thread(target=self._run, name='telemetry-flusher', daemon=True)
+            self._flusher.start()
+
+    def record_source_status(self, source_id: int, update_data: Dict):
+        if not update_data:
+            return
+        with self._lock:
+            self._source_status.setdefault(source_id, {}).update(update_data)
+            self._ensure_flusher()
+
+    def record_reliability(self, source_domain: str, success: bool, failure_reason: Optional[str] = None):
+        now = datetime.now().isoformat()
+        with self._lock:
+            row = self._reliability.setdefault(source_domain, {
+                'source_domain': source_domain,
+                'attempts': 0,
+                'successes': 0,
+                'failures': 0,
+                'last_attempt_at': now,
+                'last_success_at': None,
+                'failure_reason': None,
+            })
+            row['attempts'] += 1
+            row['last_attempt_at'] = now
+            if success:
+                row['successes'] += 1
+                row['last_success_at'] = now
+            else:
+                row['failures'] += 1
+                if failure_reason:
+                    row['failure_reason'] = failure_reason
+            self._ensure_flusher()
+
+    def record_cluster_status(self, cluster_id: int, status: str, failure_reason: Optional[str] = None,
+                              failure_details: Optional[str] = None, increment_attempt: bool = True):
+        with self._lock:
+            self._cluster_events.setdefault(cluster_id, []).append({
+                'status': status,
+                'reason': failure_reason,
+                'details': failure_details[:500] if failure_details else None,
+                'increment': increment_attempt,
+                'at': datetime.now().isoformat(),
+            })
+            self._ensure_flusher()
+
+    # ------------------------------------------
+    # Flushing
+    # ------------------------------------------
+
+    def _run(self):
+        while not self._stop.wait(self.flush_interval_s):
+            self.flush()
+
+    def flush(self) -> Dict[str, int]:
+        """Write all buffered telemetry. Returns rows written per table."""
+        with self._flush_lock:
+            with self._lock:
+                source_status, self._source_status = self._source_status, {}
+                reliability, self._reliability = self._reliability, {}
+                cluster_events, self._cluster_events = self._cluster_events, {}
+            if not (source_status or reliability or cluster_events):
+                return {}
+            written = {
+                'source_articles': len(source_status),
+                'source_reliability': len(reliability),
+                'clusters': len(cluster_events),
+            }
+
+            try:
+                supabase = self._get_client()
+            except Exception as e:
+                print(f"   ⚠️ Telemetry flush skipped (no Supabase client): {e}")
+                return {}
+
+            if self._batch_rpc_available:
+                try:
+                    if source_status:
+                        supabase.rpc('update_source_article_status_batch', {
+                            'rows': [dict(data, id=sid) for sid, data in source_status.items()]
+                        }).execute()
+                        source_status = {}
+                    if reliability:
+                        supabase.rpc('record_source_reliability_batch', {
+                            'rows': list(reliability.values())
+                        }).execute()
+                        reliability = {}
+                    if cluster_events:
+                        supabase.rpc('record_cluster_status_batch', {
+                            'rows': [{'id': cid, 'events': events} for cid, events in cluster_events.items()]
+                        }).execute()
+                        cluster_events = {}
+                except Exception as e:
+                    print(f"   ⚠️ Telemetry batch write failed, using per-row writes: {e}")
+                    self._batch_rpc_available = False
+
+            # Per-row fallback (migration 080 not applied, or batch write failed)
+            for sid, data in source_status.items():
+                _write_source_status(supabase, sid, data)
+            for row in reliability.values():
+                _write_reliability(supabase, row)
+            for cid, events in cluster_events.items():
+                _write_cluster_status(supabase, cid, events)
+
+            return written
+
+    def close(self):
+        self._stop.set()
+        self.flush()
+
+
+# ==========================================
+# PER-ROW FALLBACK WRITES
+# ==========================================
+
+def _write_source_status(supabase, source_id: int, update_data: Dict):
+    try:
+        supabase.table('source_articles').update(update_data).eq('id', source_id).execute()
+    except Exception as e:
+        print(f"   ⚠️ Could not update source article status: {e}")
+
+
+def _write_reliability(supabase, row: Dict):
+    try:
+        existing = supabase.table('source_reliability').select('*').eq('source_domain', row['source_domain']).execute()
+        if existing.data:
+            record = existing.data[0]
+            update_data = {
+                'total_attempts': (record.get('total_attempts') or 0) + row['attempts'],
+                'successful_fetches': (record.get('successful_fetches') or 0) + row['successes'],
+                'failed_fetches': (record.get('failed_fetches') or 0) + row['failures'],
+                'last_attempt_at': row['last_attempt_at'],
+            }
+            if row['last_success_at']:
+                update_data['last_success_at'] = row['last_success_at']
+            if row['failure_reason']:
+                update_data['common_failure_reason'] = row['failure_reason']
+            supabase.table('source_reliability').update(update_data).eq('id', record['id']).execute()
+        else:
+            supabase.table('source_reliability').insert({
+                'source_domain': row['source_domain'],
+                'total_attempts': row['attempts'],
+                'successful_fetches': row['successes'],
+                'failed_fetches': row['failures'],
+                'first_seen_at': row['last_attempt_at'],
+                'last_attempt_at': row['last_attempt_at'],
+                'last_success_at': row['last_success_at'],
+                'common_failure_reason': row['failure_reason'],
+            }).execute()
+    except Exception:
+        # Don't fail the pipeline for analytics errors
+        pass
+
+
+def _write_cluster_status(supabase, cluster_id: int, events: List[Dict]):
+    try:
+        current = supabase.table('clusters').select('attempt_count, first_attempt_at, attempt_history').eq('id', cluster_id).execute()
+        if not current.data:
+            return
+        cluster_data = current.data[0]
+        attempt_count = cluster_data.get('attempt_count') or 0
+        history = cluster_data.get('attempt_history') or []
+        update_data = {}
+        if not cluster_data.get('first_attempt_at'):
+            update_data['first_attempt_at'] = events[0]['at']
+        for event in events:
+            history.append({
+                'attempt': attempt_count + 1,
+                'at': event['at'],
+                'status': event['status'],
+                'reason': event['reason'],
+            })
+            if event['status'] == 'published' and attempt_count > 0:
+                update_data['recovered'] = True
+                update_data['attempts_before_success'] = attempt_count + 1
+            if event['increment']:
+                attempt_count += 1
+            if event['reason']:
+                update_data['failure_reason'] = event['reason']
+            if event['details']:
+                update_data['failure_details'] = event['details']
+        update_data.update({
+            'publish_status': events[-1]['status'],
+            'last_attempt_at': events[-1]['at'],
+            'attempt_count': attempt_count,
+            'attempt_history': history,
+        })
+        supabase.table('clusters').update(update_data).eq('id', cluster_id).execute()
+    except Exception as e:
+        print(f"   ⚠️ Could not update cluster status: {e}")
+
+
+_telemetry = None
+_telemetry_lock = threading.Lock()
+
+
+def get_telemetry(get_client: Optional[Callable] = None) -> TelemetryBuffer:
+    """Process-wide buffer (the first caller supplies the client getter)."""
+    global _telemetry
+    with _telemetry_lock:
+        if _telemetry is None:
+            if get_client is None:
+                from supabase_pool import get_supabase_client as get_client
+            _telemetry = TelemetryBuffer(get_client)
+        return _telemetry
@@ -6,11 +6,17 @@ Features:
 - Duplicate detection
 - 7-method image extraction
 - Complete error handling
+- Single writer thread: fetch workers never touch SQLite directly
 """
 
+import calendar
+import hashlib
 import feedparser
 import sqlite3
+import queue
+import threading
 from datetime import datetime, timedelta
+from collections import OrderedDict
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from urllib.parse import urljoin
 import time
@@ -19,19 +25,247 @@ from bs4 import BeautifulSoup
 import requests
 import json
 from rss_sources import ALL_SOURCES, get_source_credibility
+from source_poll_scheduler import SourcePollScheduler, adaptive_polling_enabled
 import urllib3
 
 # Suppress SSL warnings for specific sources
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
+
+class IngestWriter:
+    """
+    Single SQLite writer fed by a queue.
+
+    Fetch workers enqueue article rows, seen-entry sets and source stats;
+    one thread applies them in batched transactions (executemany), so the
+    workers never wait on the WAL write lock.
+    """
+
+    _STOP = object()
+
+    INSERT_ARTICLE_SQL = '''
+        INSERT OR IGNORE INTO articles (
+            url, guid, source, title, description, content,
+            image_url, author, published_date,
+            image_extraction_method, fetched_at
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    '''
+
+    UPSERT_SEEN_SQL = '''
+        INSERT OR REPLACE INTO source_seen_entries (source, entry_hashes, updated_at)
+        VALUES (?, ?, ?)
+    '''
+
+    STATS_SUCCESS_SQL = '''
+        INSERT INTO source_stats (
+            source, last_fetch_at, total_fetches, successful_fetches,
+            total_articles_found, average_articles_per_fetch
+        ) VALUES (?, ?, 1, 1, ?, ?)
+        ON CONFLICT(source) DO UPDATE SET
+            last_fetch_at = excluded.last_fetch_at,
+            total_fetches = total_fetches + 1,
+            successful_fetches = successful_fetches + 1,
+            total_articles_found = total_articles_found + excluded.total_articles_found,
+            average_articles_per_fetch =
+                (total_articles_found + excluded.total_articles_found) * 1.0 / (successful_fetches + 1),
+            consecutive_failures = 0
+    '''
+
+    STATS_FAILURE_SQL = '''
+        INSERT INTO source_stats (
+            source, total_fetches, failed_fetches, last_error, consecutive_failures
+        ) VALUES (?, 1, 1, ?, 1)
+        ON CONFLICT(source) DO UPDATE SET
+            total_fetches = total_fetches + 1,
+            failed_fetches = failed_fetches + 1,
+            last_error = excluded.last_error,
+            consecutive_failures = consecutive_failures + 1
+    '''
+
+    UPSERT_SCHEDULE_SQL = '''
+        INSERT OR REPLACE INTO source_schedule
+        (source, mean_gap_s, consecutive_failures, last_polled_at, next_poll_at, newest_entry_at)
+        VALUES (?, ?, ?, ?, ?, ?)
+    '''
+
+    # Applied in this order inside each transaction
+    _OPS = ('article', 'seen', 'stats_success', 'stats_failure', 'schedule')
+
+    def __init__(self, connect, logger, batch_size=500, max_latency=0.5,
+                 lock_retries=3, lock_backoff=1.0):
+        self._connect = connect
+        self.logger = logger
+        self.batch_size = batch_size
+        self.max_latency = max_latency  # Seconds a row may wait before a flush
+        # The DB is shared with other processes (e.g. main.py's AI filter);
+        # a locked batch is retried, then requeued rather than dropped
+        self.lock_retries = lock_retries
+        self.lock_backoff = lock_backoff
+        self._queue = queue.Queue()
+        self._sql = {
+            'article': self.INSERT_ARTICLE_SQL,
+            'seen': self.UPSERT_SEEN_SQL,
+            'stats_success': self.STATS_SUCCESS_SQL,
+            'stats_failure': self.STATS_FAILURE_SQL,
+            'schedule': self.UPSERT_SCHEDULE_SQL,
+        }
+        self._thread = threading.Thread(target=self._run, name='RSS-Writer', daemon=True)
+        self._thread.start()
+
+    def put(self, op, params):
+        """Enqueue one write (never blocks)"""
+        self._queue.put((op, params))
+
+    def flush(self):
+        """Block until everything enqueued so far is committed"""
+        self._queue.join()
+
+    def close(self):
+        self._queue.put(self._STOP)
+        self._thread.join()
+
+    def _run(self):
+        conn = self._connect()
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            batch = []
+            if item is self._STOP:
+                stopping = True
+            else:
+                batch.append(item)
+                deadline = time.time() + self.max_latency
+                while len(batch) < self.batch_size:
+                    try:
+                        item = self._queue.get(timeout=max(deadline - time.time(), 0))
+                    except queue.Empty:
+                        break
+                    if item is self._STOP:
+                        stopping = True
+                        break
+                    batch.append(item)
+
+            got_stop = stopping
+            try:
+                if batch and not self._apply(conn, batch):
+                    # Still locked: requeue (and keep running if we were stopping)
+                    self.logger.warning(f"Database locked, requeueing {len(batch)} rows")
+                    for queued in batch:
+                        self._queue.put(queued)
+                    if stopping:
+                        self._queue.put(self._STOP)
+                        stopping = False
+            except Exception as e:
+                self.logger.error(f"Writer error on batch of {len(batch)} rows: {e}")
+            finally:
+                for _ in range(len(batch) + (1 if got_stop else 0)):
+                    self._queue.task_done()
+        conn.close()
+
+    @staticmethod
+    def _rollback(conn):
+        if conn.in_transaction:
+            try:
+                conn.execute('ROLLBACK')
+            except sqlite3.Error:
+                pass
+
+    def _apply(self, conn, batch):
+        """Write one batch. Returns False if the DB stayed locked (batch not written)."""
+        grouped = {op: [] for op in self._OPS}
+        for op, params in batch:
+            grouped[op].append(params)
+
+        for attempt in range(self.lock_retries + 1):
+            try:
+                conn.execute('BEGIN IMMEDIATE')
+                for op in self._OPS:
+                    if grouped[op]:
+                        conn.executemany(self._sql[op], grouped[op])
+                conn.execute('COMMIT')
+                return True
+            except sqlite3.OperationalError as e:
+                self._rollback(conn)
+                if 'locked' not in str(e) and 'busy' not in str(e):
+                    error = e
+                    break
+                if attempt == self.lock_retries:
+                    return False
+                time.sleep(self.lock_backoff * (2 ** attempt))
+            except Exception as e:
+                self._rollback(conn)
+                error = e
+                break
+
+        self.logger.error(f"Batch write failed ({len(batch)} rows), retrying row by row: {error}")
+        for op in self._OPS:
+            for params in grouped[op]:
+                try:
+                    conn.execute(self._sql[op], params)
+                except Exception as row_error:
+                    self.logger.error(f"Error writing {op}: {row_error}")
+        return True
+
+
+class SeenEntrySet:
+    """
+    Rolling set of recently seen entry keys for one source.
+
+    Keys are 8-byte hashes of the entry GUID (or URL when a feed has no
+    GUIDs), kept in recency order and persisted as one packed BLOB. Every
+    poll refreshes the keys still present in the feed, so an entry only
+    rolls out once it has left the feed and `capacity` newer keys exist.
+    """
+
+    HASH_BYTES = 8
+    MIN_CAPACITY = 200
+
+    def __init__(self, packed=b''):
+        self._keys = OrderedDict()
+        packed = packed or b''
+        for i in range(0, len(packed) - self.HASH_BYTES + 1, self.HASH_BYTES):
+            self._keys[packed[i:i + self.HASH_BYTES]] = None
+
+    @classmethod
+    def key_for(cls, guid, url):
+        return hashlib.blake2b((guid or url).encode('utf-8'), digest_size=cls.HASH_BYTES).digest()
+
+    def __contains__(self, key):
+        return key in self._keys
+
+    def __len__(self):
+        return len(self._keys)
+
+    def refresh(self, feed_keys):
+        """Mark `feed_keys` as most recent and trim to capacity"""
+        for key in feed_keys:
+            self._keys[key] = None
+            self._keys.move_to_end(key)
+        capacity = max(self.MIN_CAPACITY, 3 * len(feed_keys))
+        while len(self._keys) > capacity:
+            self._keys.popitem(last=False)
+
+    def pack(self):
+        return b''.join(self._keys)
+
+
 class OptimizedRSSFetcher:
     def __init__(self, db_path='ten_news.db'):
         self.db_path = db_path
         self.max_workers = 30  # Parallel fetching
-        self.fetch_interval = 600  # 10 minutes in seconds
+        self.fetch_interval = 600  # 10 minutes in seconds (max sleep with adaptive polling)
+        self.min_sleep = 30  # Shortest sleep between adaptive polling rounds
         self.sources = ALL_SOURCES
         self.setup_logging()
         self.init_database()
+
+        # In-memory state so fetch workers never read SQLite
+        self._state_lock = threading.Lock()
+        self._known_urls = set()
+        self._seen_entries = {}
+        self._preload_state()
+        self.poll_schedule = self._load_poll_schedule()
+        self.writer = IngestWriter(self._get_db_connection, self.logger)
     
     def setup_logging(self):
         """Configure logging"""
@@ -72,40 +306,99 @@ class OptimizedRSSFetcher:
         conn.execute('PRAGMA busy_timeout=30000')  # 30 second timeout
         return conn
     
-    def _get_source_marker(self, source_name, conn):
-        """Get the marker showing where we left off with this source"""
+    def _preload_state(self):
+        """Load known article URLs and per-source seen-entry sets into memory"""
+        conn = self._get_db_connection()
         cursor = conn.cursor()
-        cursor.execute('''
-            SELECT last_article_url, last_article_guid, last_published_date
-            FROM source_markers
-            WHERE source = ?
-        ''', (source_name,))
-        result = cursor.fetchone()
-        if result:
-            return {
-                'last_url': result[0],
-                'last_guid': result[1],
-                'last_date': result[2]
-            }
-        return None
+        cursor.execute('SELECT url FROM articles')
+        self._known_urls = {row[0] for row in cursor.fetchall()}
+        cursor.execute('SELECT source, entry_hashes FROM source_seen_entries')
+        self._seen_entries = {row[0]: SeenEntrySet(row[1]) for row in cursor.fetchall()}
+        conn.close()
+        self.logger.info(f"✅ Preloaded {len(self._known_urls)} known URLs, "
+                         f"seen-entry sets for {len(self._seen_entries)} sources")
     
-    def _update_source_marker(self, source_name, latest_url, latest_guid, latest_date, conn):
-        """Update the marker for where we left off with this source"""
+    def _load_poll_schedule(self):
+        """Load per-source poll state, seeding new sources from source_stats"""
+        conn = self._get_db_connection()
         cursor = conn.cursor()
         cursor.execute('''
-            INSERT OR REPLACE INTO source_markers 
-            (source, last_article_url, last_article_guid, last_fetch_timestamp, last_published_date)
-            VALUES (?, ?, ?, ?, ?)
-        ''', (source_name, latest_url, latest_guid, datetime.now().isoformat(), latest_date))
-        conn.commit()
+            SELECT source, mean_gap_s, consecutive_failures, last_polled_at, next_poll_at, newest_entry_at
+            FROM source_schedule
+        ''')
+        columns = ['source_name', 'mean_gap_s', 'consecutive_failures',
+                   'last_polled_at', 'next_poll_at', 'newest_entry_at']
+        schedule = SourcePollScheduler.from_rows(dict(zip(columns, row)) for row in cursor.fetchall())
+        
+        cursor.execute('''
+            SELECT source, average_articles_per_fetch, consecutive_failures
+            FROM source_stats
+        ''')
+        for source, avg_articles, failures in cursor.fetchall():
+            schedule.seed_from_stats(source, avg_articles, self.fetch_interval, failures)
+        conn.close()
+        return schedule
+    
+    def _save_poll_schedule(self):
+        """Queue changed poll state for the writer thread"""
+        for row in self.poll_schedule.dirty_rows():
+            self.writer.put('schedule', (
+                row['source_name'],
+                row['mean_gap_s'],
+                row['consecutive_failures'],
+                row['last_polled_at'],
+                row['next_poll_at'],
+                row['newest_entry_at']
+            ))
+    
+    @staticmethod
+    def _entry_timestamps(entries):
+        """Epoch publish times of feed entries (feedparser structs are UTC)"""
+        times = []
+        for entry in entries:
+            parsed = entry.get('published_parsed') or entry.get('updated_parsed')
+            if parsed:
+                try:
+                    times.append(float(calendar.timegm(parsed)))
+                except (TypeError, ValueError, OverflowError):
+                    pass
+        return times
+    
+    def _claim_url(self, url):
+        """Atomically mark a URL as seen. Returns False if it was already known."""
+        with self._state_lock:
+            if url in self._known_urls:
+                return False
+            self._known_urls.add(url)
+            return True
+    
+    def _get_seen_entries(self, source_name):
+        """Rolling seen-entry set for a source (only its own fetch worker mutates it)"""
+        with self._state_lock:
+            seen = self._seen_entries.get(source_name)
+            if seen is None:
+                seen = self._seen_entries[source_name] = SeenEntrySet()
+            return seen
+    
+    def _save_seen_entries(self, source_name, seen):
+        self.writer.put('seen', (source_name, seen.pack(), datetime.now().isoformat()))
     
     def run_forever(self):
-        """Main loop - run every 10 minutes"""
-        self.logger.info("🚀 RSS Fetcher started - running every 10 minutes")
+        """Main loop - poll due sources (every 10 minutes without adaptive polling)"""
+        adaptive = adaptive_polling_enabled()
+        if adaptive:
+            self.logger.info("🚀 RSS Fetcher started - adaptive per-source polling")
+        else:
+            self.logger.info("🚀 RSS Fetcher started - running every 10 minutes")
         self.logger.info(f"📰 Monitoring {len(self.sources)} RSS sources")
         
         while True:
             try:
+                sources = self.poll_schedule.due_sources(self.sources) if adaptive else self.sources
+                if not sources:
+                    self._sleep_until_next_poll()
+                    continue
+                
                 cycle_start = datetime.now()
                 self.logger.info(f"\n{'='*60}")
                 self.logger.info(f"🔄 Starting new fetch cycle at {cycle_start.strftime('%Y-%m-%d %H:%M:%S')}")
@@ -114,8 +407,12 @@ class OptimizedRSSFetcher:
                 # Start fetch cycle
                 cycle_id = self._start_fetch_cycle()
                 
-                # Parallel fetch all sources
-                results = self._parallel_fetch_all_sources()
+                # Parallel fetch all due sources
+                results = self._parallel_fetch_all_sources(sources)
+                
+                # Wait for the writer to commit this cycle's rows
+                self._save_poll_schedule()
+                self.writer.flush()
                 
                 # Complete cycle
                 self._complete_fetch_cycle(cycle_id, results, cycle_start)
@@ -123,25 +420,41 @@ class OptimizedRSSFetcher:
                 # Summary
                 self.logger.info(f"\n{'='*60}")
                 self.logger.info(f"✅ Fetch cycle complete!")
-                self.logger.info(f"   📊 Sources fetched: {results['sources_fetched']}/{len(self.sources)}")
+                self.logger.info(f"   📊 Sources fetched: {results['sources_fetched']}/{len(sources)} due ({len(self.sources)} total)")
                 self.logger.info(f"   📰 Total articles found: {results['total_articles']}")
                 self.logger.info(f"   ✨ New articles: {results['new_articles']}")
                 self.logger.info(f"   ❌ Failed sources: {results['failed_sources']}")
                 duration = (datetime.now() - cycle_start).total_seconds()
                 self.logger.info(f"   ⏱️  Duration: {duration:.1f}s")
+                if adaptive:
+                    schedule = self.poll_schedule.summary(self.sources)
+                    self.logger.info(f"   🗓️  Backing off: {schedule['backing_off']} sources, "
+                                     f"~{schedule['expected_polls_per_hour']} polls/hour")
                 self.logger.info(f"{'='*60}\n")
                 
                 # Sleep until next cycle
-                self.logger.info(f"😴 Sleeping for {self.fetch_interval}s (10 minutes)...")
-                time.sleep(self.fetch_interval)
+                if adaptive:
+                    self._sleep_until_next_poll()
+                else:
+                    self.logger.info(f"😴 Sleeping for {self.fetch_interval}s (10 minutes)...")
+                    time.sleep(self.fetch_interval)
                 
             except KeyboardInterrupt:
                 self.logger.info("🛑 RSS Fetcher stopped by user")
+                self.writer.close()
                 break
             except Exception as e:
                 self.logger.error(f"❌ Critical error in main loop: {e}", exc_info=True)
                 time.sleep(60)  # Wait 1 minute before retrying
     
+    def _sleep_until_next_poll(self):
+        """Sleep until the earliest source is due (between min_sleep and fetch_interval)"""
+        next_due = self.poll_schedule.next_due_at(self.sources)
+        wait = self.min_sleep if next_due is None else next_due - time.time()
+        wait = min(self.fetch_interval, max(self.min_sleep, wait))
+        self.logger.info(f"😴 Next source due in {wait:.0f}s...")
+        time.sleep(wait)
+    
     def _start_fetch_cycle(self):
         """Start a new fetch cycle in database"""
         conn = self._get_db_connection()
@@ -187,8 +500,9 @@ class OptimizedRSSFetcher:
         conn.commit()
         conn.close()
     
-    def _parallel_fetch_all_sources(self):
-        """Fetch all sources in parallel using ThreadPoolExecutor"""
+    def _parallel_fetch_all_sources(self, sources=None):
+        """Fetch sources (default: all) in parallel using ThreadPoolExecutor"""
+        sources = self.sources if sources is None else sources
         results = {
             'total_articles': 0,
             'new_articles': 0,
@@ -201,7 +515,7 @@ class OptimizedRSSFetcher:
             # Submit all fetch tasks
             future_to_source = {
                 executor.submit(self._fetch_single_source, source_name, url): source_name
-                for source_name, url in self.sources
+                for source_name, url, *_ in sources
             }
             
             # Process results as they complete
@@ -241,9 +555,8 @@ class OptimizedRSSFetcher:
             'articles_found': 0,
             'new_articles': 0,
             'error': None,
-            'skipped_marker': 0,  # Stopped early via marker
-            'skipped_date': 0,     # Skipped via date check
-            'skipped_db': 0        # Skipped via DB check
+            'skipped_seen': 0,    # Skipped via the source's seen-entry set
+            'skipped_db': 0       # Skipped via the known-URL set
         }
         
         try:
@@ -274,17 +587,14 @@ class OptimizedRSSFetcher:
                 return result
             
             result['articles_found'] = len(feed.entries)
+            entry_times = self._entry_timestamps(feed.entries)
             
-            # Get database connection
-            conn = self._get_db_connection()
-            
-            # OPTIMIZATION: Get source marker (last processed article)
-            marker = self._get_source_marker(source_name, conn)
-            
-            # Track the newest article for updating marker
-            newest_article = None
+            # OPTIMIZATION: Diff the feed against this source's seen-entry set
+            # in one pass (works for feeds that reorder or insert items)
+            seen = self._get_seen_entries(source_name)
+            feed_keys = []
+            candidates = []
             
-            # Process each article (RSS feeds are newest first)
             for entry in feed.entries:
                 article_url = entry.get('link', '')
                 article_guid = entry.get('id', '')
@@ -293,76 +603,38 @@ class OptimizedRSSFetcher:
                 if article_url and not article_url.startswith(('http://', 'https://')):
                     if article_url.startswith('//'):
                         article_url = 'https:' + article_url
-                    elif article_url.startswith('/'):
-                        article_url = urljoin(feed_url, article_url)
                     else:
                         article_url = urljoin(feed_url, article_url)
 
                 if not article_url:
                     continue
                 
-                # LAYER 1: Marker Check (Fastest - stops processing immediately)
-                if marker:
-                    if (article_url == marker['last_url'] or 
-                        (article_guid and article_guid == marker['last_guid'])):
-                        # Hit the last article we processed - everything after is old
-                        result['skipped_marker'] = len(feed.entries) - feed.entries.index(entry)
-                        break  # STOP PROCESSING - no need to check older articles
-                
-                # LAYER 2: Date Check (Fast - avoids DB lookup)
-                if marker and marker['last_date']:
-                    if hasattr(entry, 'published_parsed') and entry.published_parsed:
-                        try:
-                            pub_date = datetime(*entry.published_parsed[:6])
-                            last_date = datetime.fromisoformat(marker['last_date'])
-                            if pub_date < last_date:
-                                result['skipped_date'] += 1
-                                continue  # Skip old article
-                        except:
-                            pass  # If parsing fails, continue to DB check
-                
-                # LAYER 3: Database Lookup (Slowest - final safety check)
-                cursor = conn.cursor()
-                cursor.execute('SELECT id FROM articles WHERE url = ?', (article_url,))
-                if cursor.fetchone():
+                key = SeenEntrySet.key_for(article_guid, article_url)
+                feed_keys.append(key)
+                if key not in seen:
+                    candidates.append((entry, article_url))
+            
+            result['skipped_seen'] = len(feed_keys) - len(candidates)
+            
+            for entry, article_url in candidates:
+                # Known-URL set (preloaded from the DB - catches cross-source and GUID changes)
+                if not self._claim_url(article_url):
                     result['skipped_db'] += 1
                     continue  # Already have this article
                 
-                # NEW ARTICLE - Extract and insert
+                # NEW ARTICLE - Extract and queue for insert
                 article_data = self._extract_article_data(entry, source_name, feed_url)
-                if self._insert_article(article_data, conn):
+                if self._insert_article(article_data):
                     result['new_articles'] += 1
-                    
-                    # Track the newest article (first in feed)
-                    if not newest_article:
-                        pub_date = None
-                        if hasattr(entry, 'published_parsed') and entry.published_parsed:
-                            try:
-                                pub_date = datetime(*entry.published_parsed[:6]).isoformat()
-                            except:
-                                pass
-                        
-                        newest_article = {
-                            'url': article_url,
-                            'guid': article_guid,
-                            'date': pub_date
-                        }
-            
-            # Update source marker with newest article
-            if newest_article:
-                self._update_source_marker(
-                    source_name,
-                    newest_article['url'],
-                    newest_article['guid'],
-                    newest_article['date'],
-                    conn
-                )
             
-            conn.commit()
-            conn.close()
+            # Roll the seen set forward; persist only when it gained keys
+            seen.refresh(feed_keys)
+            if candidates:
+                self._save_seen_entries(source_name, seen)
             
-            # Update source statistics
+            # Update source statistics and learned cadence
             self._update_source_stats_success(source_name, result)
+            self.poll_schedule.record_success(source_name, entry_times)
             
             result['success'] = True
             
@@ -562,17 +834,10 @@ class OptimizedRSSFetcher:
         # METHOD 7: No image found
         return None, 'none'
     
-    def _insert_article(self, article_data, conn):
-        """Insert article into database"""
+    def _insert_article(self, article_data):
+        """Queue article for insert by the writer thread"""
         try:
-            cursor = conn.cursor()
-            cursor.execute('''
-                INSERT OR IGNORE INTO articles (
-                    url, guid, source, title, description, content,
-                    image_url, author, published_date, 
-                    image_extraction_method, fetched_at
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
+            self.writer.put('article', (
                 article_data['url'],
                 article_data['guid'],
                 article_data['source'],
@@ -585,86 +850,20 @@ class OptimizedRSSFetcher:
                 article_data['image_extraction_method'],
                 datetime.now().isoformat()
             ))
-            return cursor.rowcount > 0
+            return True
         except Exception as e:
-            self.logger.error(f"Error inserting article: {e}")
+            self.logger.error(f"Error queueing article: {e}")
             return False
     
     def _update_source_stats_success(self, source_name, result):
         """Update source statistics after successful fetch"""
-        conn = self._get_db_connection()
-        cursor = conn.cursor()
-        
-        # Get or create source stats
-        cursor.execute('SELECT * FROM source_stats WHERE source = ?', (source_name,))
-        existing = cursor.fetchone()
-        
-        if existing:
-            total_fetches = existing[3] + 1
-            successful_fetches = existing[4] + 1
-            total_articles = existing[6] + result['new_articles']
-            avg_articles = total_articles / successful_fetches if successful_fetches > 0 else 0
-            
-            cursor.execute('''
-                UPDATE source_stats SET
-                    last_fetch_at = ?,
-                    total_fetches = ?,
-                    successful_fetches = ?,
-                    total_articles_found = ?,
-                    average_articles_per_fetch = ?,
-                    consecutive_failures = 0
-                WHERE source = ?
-            ''', (
-                datetime.now().isoformat(),
-                total_fetches,
-                successful_fetches,
-                total_articles,
-                avg_articles,
-                source_name
-            ))
-        else:
-            cursor.execute('''
-                INSERT INTO source_stats (
-                    source, last_fetch_at, total_fetches, successful_fetches,
-                    total_articles_found, average_articles_per_fetch
-                ) VALUES (?, ?, 1, 1, ?, ?)
-            ''', (
-                source_name,
-                datetime.now().isoformat(),
-                result['new_articles'],
-                result['new_articles']
-            ))
-        
-        conn.commit()
-        conn.close()
+        now = datetime.now().isoformat()
+        self.writer.put('stats_success', (source_name, now, result['new_articles'], result['new_articles']))
     
     def _update_source_stats_failure(self, source_name, error):
         """Update source statistics after failed fetch"""
-        conn = self._get_db_connection()
-        cursor = conn.cursor()
-        
-        # Get or create source stats
-        cursor.execute('SELECT * FROM source_stats WHERE source = ?', (source_name,))
-        existing = cursor.fetchone()
-        
-        if existing:
-            cursor.execute('''
-                UPDATE source_stats SET
-                    total_fetches = total_fetches + 1,
-                    failed_fetches = failed_fetches + 1,
-                    last_error = ?,
-                    consecutive_failures = consecutive_failures + 1
-                WHERE source = ?
-            ''', (error, source_name))
-        else:
-            cursor.execute('''
-                INSERT INTO source_stats (
-                    source, total_fetches, failed_fetches, last_error, consecutive_failures
-                ) VALUES (?, 1, 1, ?, 1)
-            ''', (source_name, error))
-        
-        conn.commit()
-        conn.close()
+        self.writer.put('stats_failure', (source_name, error))
+        self.poll_schedule.record_failure(source_name)
 
 # Run if executed directly
 if __name__ == '__main__':
@@ -14,6 +14,10 @@ Each article is then stamped with (vq_primary, vq_secondary) where
 Centroids are stored in the `vq_centroids` table (one pgvector row per
 centroid). The `vq_codebooks` row is a small header.
 
+Articles are stamped with the projection from `vq_codebook.py` (the same code
+the workflow's Step 12 uses for new articles), not with the k-means training
+labels, so stamped and live assignments agree.
+
 Usage:
   SUPABASE_URL=... SUPABASE_SERVICE_KEY=... python scripts/train_rq_vae.py
   SUPABASE_URL=... SUPABASE_SERVICE_KEY=... python scripts/train_rq_vae.py --dry-run
@@ -31,6 +35,9 @@ from datetime import datetime, timezone
 
 import numpy as np
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from vq_codebook import SUBCODEBOOK_K, VQCodebook, l2_normalize
+
 try:
     from sklearn.cluster import MiniBatchKMeans
 except ImportError:
@@ -45,7 +52,6 @@ except ImportError:
 
 
 PRIMARY_K = 256                 # J — doubled from paper's 128
-SUBCODEBOOK_K = 8               # K / J = 2048 / 256
 SECONDARY_K = PRIMARY_K * SUBCODEBOOK_K   # 2048
 EMBEDDING_DIM = 384             # MiniLM
 FETCH_BATCH = 1000
@@ -111,10 +117,7 @@ def fetch_all_embeddings(supabase: Client) -> tuple[np.ndarray, list[int]]:
         if len(ids) % 10000 == 0:
             print(f"[{ts()}]   fetched {len(ids)} so far (last id={last_id})…")
 
-    arr = np.asarray(vectors, dtype=np.float32)
-    norms = np.linalg.norm(arr, axis=1, keepdims=True)
-    norms = np.where(norms == 0, 1.0, norms)
-    arr = arr / norms
+    arr = l2_normalize(np.asarray(vectors, dtype=np.float32))
     print(f"[{ts()}] Fetched {len(ids)} embeddings, shape {arr.shape}.")
     return arr, ids
 
@@ -127,10 +130,7 @@ def train_level1(X: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
         reassignment_ratio=KM_REASSIGN_RATIO, n_init="auto",
     )
     km.fit(X)
-    centroids = km.cluster_centers_.astype(np.float32)
-    norms = np.linalg.norm(centroids, axis=1, keepdims=True)
-    norms = np.where(norms == 0, 1.0, norms)
-    centroids /= norms
+    centroids = l2_normalize(km.cluster_centers_)
     return centroids, km.labels_.astype(np.int32)
 
 
@@ -270,7 +270,13 @@ def main() -> int:
 
     l1_centroids, l1_assign = train_level1(X)
     l2_centroids, secondary_assign, parent_map = train_level2(X, l1_assign, l1_centroids)
-    report_balance(l1_assign, secondary_assign)
+
+    # Re-project with the shared projection (L1 centroids were normalized
+    # after fitting, so a few training labels are no longer the nearest).
+    primary, secondary = VQCodebook(l1_centroids, l2_centroids).project_batch(X)
+    moved = int((secondary != secondary_assign).sum())
+    print(f"[{ts()}] Projected {X.shape[0]} articles; {moved} differ from training labels.")
+    report_balance(primary, secondary)
 
     if args.dry_run:
         print(f"[{ts()}] Dry-run done. Total: {time.time()-t0:.1f}s.")
@@ -281,7 +287,7 @@ def main() -> int:
     if args.no_stamp:
         print(f"[{ts()}] --no-stamp; codebook saved, articles not stamped. Total: {time.time()-t0:.1f}s.")
         return 0
-    stamp_articles(sb, ids, l1_assign, secondary_assign, dry_run=False)
+    stamp_articles(sb, ids, primary, secondary, dry_run=False)
     print(f"[{ts()}] Done. Total: {time.time()-t0:.1f}s.")
     return 0
 
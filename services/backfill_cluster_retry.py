@@ -19,15 +19,16 @@ import logging
 import numpy as np
 from concurrent.futures import ThreadPoolExecutor
 from typing import List, Optional
-from supabase import create_client
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from supabase_pool import get_supabase_client
 try:
     from step1_5_event_clustering import get_embedding_minilm
     HAS_EMBEDDING_HELPER = True
 except Exception as _e:
     HAS_EMBEDDING_HELPER = False
     print(f"⚠️  Embedding helper import failed: {_e}")
+from services.cluster_assign_helper import assign_clusters_batch, build_centroid_index
 
 logging.basicConfig(
     level=logging.INFO,
@@ -38,7 +39,6 @@ log = logging.getLogger(__name__)
 
 SUPER_K = 10
 LEAF_K = 10
-TOP_K = 3
 WORKERS = 12  # lower than main run — reduces connection pressure
 WINDOW_DAYS = 90
 
@@ -48,7 +48,7 @@ def sb_client():
     key = os.environ.get('SUPABASE_SERVICE_KEY')
     if not url or not key:
         raise RuntimeError("SUPABASE_URL and SUPABASE_SERVICE_KEY required")
-    return create_client(url, key)
+    return get_supabase_client(url, key)
 
 
 def load_leaf_centroids(sb) -> np.ndarray:
@@ -93,48 +93,12 @@ def load_unclustered_articles(sb) -> List[dict]:
     return out
 
 
-def assign_for_embedding(emb: List[float], leaf_centroids: np.ndarray):
-    flat = leaf_centroids.reshape(SUPER_K * LEAF_K, -1)
-    super_idx = np.repeat(np.arange(SUPER_K), LEAF_K)
-    leaf_idx = np.tile(np.arange(LEAF_K), SUPER_K)
-
-    vec = np.asarray(emb, dtype=np.float32)
-    vec_norm = vec / (np.linalg.norm(vec) + 1e-12)
-    flat_norms = np.linalg.norm(flat, axis=1, keepdims=True) + 1e-12
-    flat_n = flat / flat_norms
-    sims = flat_n @ vec_norm
-
-    top1 = int(np.argmax(sims))
-    primary_super = int(super_idx[top1])
-    primary_leaf = int(leaf_idx[top1])
-
-    top_k_idx = np.argpartition(-sims, kth=min(TOP_K, len(sims)-1))[:TOP_K]
-    top_k_sims = sims[top_k_idx]
-    order = np.argsort(-top_k_sims)
-    top_k_idx_sorted = top_k_idx[order]
-    top_k_sims_sorted = top_k_sims[order]
-    clipped = np.clip(top_k_sims_sorted, 0.0, None)
-    total = clipped.sum()
-    if total == 0:
-        return primary_super, primary_leaf, []
-    weights = clipped / total
-
-    assigns = []
-    for k in range(min(TOP_K, len(top_k_idx_sorted))):
-        cidx = int(top_k_idx_sorted[k])
-        w = float(weights[k])
-        if w < 0.01:
-            continue
-        assigns.append({'super': int(super_idx[cidx]), 'leaf': int(leaf_idx[cidx]), 'weight': round(w, 4)})
-    return primary_super, primary_leaf, assigns
-
-
 def main():
     sb = sb_client()
     log.info("=== CLUSTER RETRY BACKFILL — START ===")
     t0 = time.time()
 
-    leaf_centroids = load_leaf_centroids(sb)
+    centroids = build_centroid_index(load_leaf_centroids(sb))
     articles = load_unclustered_articles(sb)
     if not articles:
         log.info("no unclustered articles — nothing to do")
@@ -159,18 +123,15 @@ def main():
                 except Exception:
                     pass
 
-    # Assign + update
-    def _assign_and_write(a):
-        emb = a.get('embedding_minilm')
-        if not emb or len(emb) != 384:
+    # Assign all at once (one matmul), then update
+    results = assign_clusters_batch([a.get('embedding_minilm') for a in articles], centroids)
+
+    def _write(item):
+        a, assignment = item
+        if assignment['super_cluster_id'] is None:
             return False
-        ps, pl, assigns = assign_for_embedding(emb, leaf_centroids)
         try:
-            sb.table('published_articles').update({
-                'super_cluster_id': ps,
-                'leaf_cluster_id': pl,
-                'cluster_assignments': assigns,
-            }).eq('id', a['id']).execute()
+            sb.table('published_articles').update(assignment).eq('id', a['id']).execute()
             return True
         except Exception as e:
             log.warning(f"  update failed for id={a['id']}: {e}")
@@ -179,7 +140,7 @@ def main():
     ok, fail = 0, 0
     last_log = time.time()
     with ThreadPoolExecutor(max_workers=WORKERS) as pool:
-        for r in pool.map(_assign_and_write, articles, chunksize=1):
+        for r in pool.map(_write, zip(articles, results), chunksize=1):
             if r:
                 ok += 1
             else:
@@ -6,8 +6,8 @@ freshly-published articles to their top-3 nearest leaves, using centroids
 from the last nightly rebuild.
 
 Between nightly rebuilds, new articles are placed relative to existing
-(possibly slightly stale) centroids. Tomorrow's nightly rebuild will recompute
-centroids and reassign all articles.
+(possibly slightly stale) centroids. Tomorrow's nightly rebuild will update
+centroids and reassign every article whose leaves changed.
 
 Typical call pattern (in complete_clustered_8step_workflow.py):
     from services.cluster_assign_helper import assign_clusters_for_embedding
@@ -16,77 +16,197 @@ Typical call pattern (in complete_clustered_8step_workflow.py):
     article_data['leaf_cluster_id']  = assignments['leaf_cluster_id']
     article_data['cluster_assignments'] = assignments['cluster_assignments']
 
-Centroids are cached per-process — a fresh Cloud Run instance fetches once
-from global_cluster_centroids on first call, then reuses in-memory.
+Batch callers (backfills) use assign_clusters_batch, which scores an
+(N, 384) matrix with one matmul:
+    results = assign_clusters_batch(embeddings)
+
+Centroids are cached per-process, already flattened to (100, 384) and
+L2-normalized. The cache is revalidated every CENTROID_CACHE_TTL_S: a cheap
+query for the newest last_rebuilt_at decides whether the centroids changed
+since they were loaded, and only then are they re-fetched.
 """
 
 import os
+import time
 import logging
+import threading
 import numpy as np
 from typing import Optional, List, Dict, Tuple
-from supabase import create_client
+from supabase_pool import get_supabase_client
 
 log = logging.getLogger(__name__)
 
 SUPER_K = 10
 LEAF_K = 10
 TOP_K = 3
+# How long loaded centroids are trusted before checking for a newer rebuild
+CENTROID_CACHE_TTL_S = float(os.getenv('CLUSTER_CENTROID_TTL_S', '900'))
 
-# Per-process cache: centroids are stable between nightly rebuilds
+# Per-process cache: see build_centroid_index for the layout
 _centroid_cache: Optional[Dict] = None
+_cache_lock = threading.Lock()
 
 
 def _supabase():
-    url = os.environ.get('SUPABASE_URL') or os.environ.get('NEXT_PUBLIC_SUPABASE_URL')
-    key = os.environ.get('SUPABASE_SERVICE_KEY')
-    if not url or not key:
-        raise RuntimeError("SUPABASE_URL and SUPABASE_SERVICE_KEY required")
-    return create_client(url, key)
+    return get_supabase_client()
+
+
+def build_centroid_index(leaf_centroids: np.ndarray, super_centroids: Optional[np.ndarray] = None,
+                         version: Optional[str] = None) -> Dict:
+    """Precompute what assignment needs from a (10, 10, 384) leaf array:
+    the flattened, L2-normalized (100, 384) matrix and the flat -> (super,
+    leaf) index maps."""
+    flat = leaf_centroids.reshape(SUPER_K * LEAF_K, -1).astype(np.float32)
+    return {
+        'super_centroids': super_centroids,
+        'leaf_centroids': leaf_centroids,
+        'leaf_flat_norm': flat / (np.linalg.norm(flat, axis=1, keepdims=True) + 1e-12),
+        'super_idx': np.repeat(np.arange(SUPER_K), LEAF_K),
+        'leaf_idx': np.tile(np.arange(LEAF_K), SUPER_K),
+        'version': version,
+        'loaded_at': time.time(),
+        'checked_at': time.time(),
+    }
+
+
+def _centroid_version(sb) -> Optional[str]:
+    """Newest last_rebuilt_at — changes whenever the nightly job rewrites centroids."""
+    resp = (sb.table('global_cluster_centroids')
+            .select('last_rebuilt_at')
+            .order('last_rebuilt_at', desc=True)
+            .limit(1)
+            .execute())
+    rows = resp.data or []
+    return rows[0].get('last_rebuilt_at') if rows else None
+
+
+def _fetch_centroids(sb) -> Optional[Dict]:
+    resp = sb.table('global_cluster_centroids').select('*').execute()
+    rows = resp.data or []
+    if not rows:
+        log.warning("global_cluster_centroids is empty — nightly job hasn't run yet")
+        return None
+
+    leaf_centroids = np.zeros((SUPER_K, LEAF_K, 384), dtype=np.float32)
+    super_centroids = np.zeros((SUPER_K, 384), dtype=np.float32)
+    version = None
+
+    for r in rows:
+        cent = r.get('centroid')
+        if not cent:
+            continue
+        # Supabase VECTOR returns as a string "[0.1,0.2,...]" or list
+        if isinstance(cent, str):
+            # Parse pgvector text format
+            cent = [float(x) for x in cent.strip('[]').split(',')]
+        vec = np.asarray(cent, dtype=np.float32)
+        s = r['super_cluster_id']
+        l = r.get('leaf_cluster_id')
+        if l is None:
+            super_centroids[s] = vec
+        else:
+            leaf_centroids[s, l] = vec
+        rebuilt = r.get('last_rebuilt_at')
+        if rebuilt and (version is None or rebuilt > version):
+            version = rebuilt
+
+    log.info(f"loaded {len(rows)} centroids from global_cluster_centroids (version {version})")
+    return build_centroid_index(leaf_centroids, super_centroids, version)
 
 
 def _load_centroids(force_reload: bool = False) -> Optional[Dict]:
-    """Load 100 leaf centroids + 10 super centroids, cache in memory."""
+    """Cached centroid index; revalidated against the DB once the TTL expires."""
     global _centroid_cache
-    if _centroid_cache is not None and not force_reload:
-        return _centroid_cache
-
-    try:
-        sb = _supabase()
-        resp = sb.table('global_cluster_centroids').select('*').execute()
-        rows = resp.data or []
-        if not rows:
-            log.warning("global_cluster_centroids is empty — nightly job hasn't run yet")
-            return None
-
-        leaf_centroids = np.zeros((SUPER_K, LEAF_K, 384), dtype=np.float32)
-        super_centroids = np.zeros((SUPER_K, 384), dtype=np.float32)
-
-        for r in rows:
-            cent = r.get('centroid')
-            if not cent:
+    with _cache_lock:
+        cache = _centroid_cache
+        now = time.time()
+        if cache is not None and not force_reload and now - cache['checked_at'] < CENTROID_CACHE_TTL_S:
+            return cache
+
+        try:
+            sb = _supabase()
+            if cache is not None and not force_reload:
+                if _centroid_version(sb) == cache['version']:
+                    cache['checked_at'] = now
+                    return cache
+            fresh = _fetch_centroids(sb)
+            if fresh is not None:
+                _centroid_cache = fresh
+            return _centroid_cache
+        except Exception as e:
+            log.warning(f"failed to load centroids: {e}")
+            if cache is not None:
+                # Keep serving the stale centroids; retry after another TTL
+                cache['checked_at'] = now
+            return cache
+
+
+def assign_clusters_batch(embeddings, centroids: Optional[Dict] = None) -> List[Dict]:
+    """Assign N embeddings at once: one (N, 384) x (384, 100) matmul.
+
+    Args:
+      embeddings: (N, 384) array, or a list of 384-dim vectors (entries that
+        are missing or the wrong size get the empty assignment)
+      centroids: index from build_centroid_index; defaults to the cached one
+
+    Returns a list of N dicts shaped like assign_clusters_for_embedding's.
+    """
+    default = {'super_cluster_id': None, 'leaf_cluster_id': None, 'cluster_assignments': None}
+    n = len(embeddings)
+    results = [dict(default) for _ in range(n)]
+    if n == 0:
+        return results
+
+    if isinstance(embeddings, np.ndarray) and embeddings.ndim == 2 and embeddings.shape[1] == 384:
+        rows = np.arange(n)
+        mat = embeddings.astype(np.float32, copy=False)
+    else:
+        rows = np.asarray([i for i, e in enumerate(embeddings) if e is not None and len(e) == 384], dtype=np.int64)
+        if len(rows) == 0:
+            return results
+        mat = np.asarray([embeddings[i] for i in rows], dtype=np.float32)
+
+    cache = centroids if centroids is not None else _load_centroids()
+    if cache is None:
+        return results
+    super_idx = cache['super_idx']
+    leaf_idx = cache['leaf_idx']
+
+    mat_n = mat / (np.linalg.norm(mat, axis=1, keepdims=True) + 1e-12)
+    sims = mat_n @ cache['leaf_flat_norm'].T  # (N, 100)
+
+    # Top-K per row, sorted by similarity; column 0 is the primary leaf
+    top_k_idx = np.argpartition(-sims, kth=TOP_K, axis=1)[:, :TOP_K]
+    top_k_sims = np.take_along_axis(sims, top_k_idx, axis=1)
+    order = np.argsort(-top_k_sims, axis=1)
+    top_k_idx = np.take_along_axis(top_k_idx, order, axis=1)
+    top_k_sims = np.take_along_axis(top_k_sims, order, axis=1)
+
+    clipped = np.clip(top_k_sims, 0.0, None)
+    totals = clipped.sum(axis=1, keepdims=True)
+    weights = clipped / np.where(totals == 0, 1.0, totals)
+
+    for r, i in enumerate(rows):
+        if totals[r, 0] == 0:
+            continue
+        assignments = []
+        for k in range(TOP_K):
+            cidx = int(top_k_idx[r, k])
+            w = float(weights[r, k])
+            if w < 0.01:
                 continue
-            # Supabase VECTOR returns as a string "[0.1,0.2,...]" or list
-            if isinstance(cent, str):
-                # Parse pgvector text format
-                cent = [float(x) for x in cent.strip('[]').split(',')]
-            vec = np.asarray(cent, dtype=np.float32)
-            s = r['super_cluster_id']
-            l = r.get('leaf_cluster_id')
-            if l is None:
-                super_centroids[s] = vec
-            else:
-                leaf_centroids[s, l] = vec
-
-        _centroid_cache = {
-            'super_centroids': super_centroids,
-            'leaf_centroids': leaf_centroids,
-            'loaded_at': __import__('time').time(),
+            assignments.append({
+                'super': int(super_idx[cidx]),
+                'leaf': int(leaf_idx[cidx]),
+                'weight': round(w, 4),
+            })
+        top1 = int(top_k_idx[r, 0])
+        results[int(i)] = {
+            'super_cluster_id': int(super_idx[top1]),
+            'leaf_cluster_id': int(leaf_idx[top1]),
+            'cluster_assignments': assignments,
         }
-        log.info(f"loaded {len(rows)} centroids from global_cluster_centroids")
-        return _centroid_cache
-    except Exception as e:
-        log.warning(f"failed to load centroids: {e}")
-        return None
+    return results
 
 
 def assign_clusters_for_embedding(embedding: List[float]) -> Dict:
@@ -101,57 +221,6 @@ def assign_clusters_for_embedding(embedding: List[float]) -> Dict:
     If no centroids are available yet (nightly hasn't run), returns None fields —
     caller should still insert the article; nightly will cluster it later.
     """
-    default = {'super_cluster_id': None, 'leaf_cluster_id': None, 'cluster_assignments': None}
-
     if not embedding or len(embedding) != 384:
-        return default
-    cache = _load_centroids()
-    if cache is None:
-        return default
-
-    leaf_centroids = cache['leaf_centroids']  # (10, 10, 384)
-    # Flatten to (100, 384) for vectorized cosine
-    flat = leaf_centroids.reshape(SUPER_K * LEAF_K, -1)
-    super_idx = np.repeat(np.arange(SUPER_K), LEAF_K)
-    leaf_idx = np.tile(np.arange(LEAF_K), SUPER_K)
-
-    vec = np.asarray(embedding, dtype=np.float32)
-    vec_norm = vec / (np.linalg.norm(vec) + 1e-12)
-    flat_norms = np.linalg.norm(flat, axis=1, keepdims=True) + 1e-12
-    flat_n = flat / flat_norms
-    sims = flat_n @ vec_norm  # (100,)
-
-    # Top-1 = primary; top-K = multi-label
-    top1 = int(np.argmax(sims))
-    primary_super = int(super_idx[top1])
-    primary_leaf = int(leaf_idx[top1])
-
-    top_k_idx = np.argpartition(-sims, kth=min(TOP_K, len(sims)-1))[:TOP_K]
-    top_k_sims = sims[top_k_idx]
-    order = np.argsort(-top_k_sims)
-    top_k_idx_sorted = top_k_idx[order]
-    top_k_sims_sorted = top_k_sims[order]
-
-    clipped = np.clip(top_k_sims_sorted, 0.0, None)
-    total = clipped.sum()
-    if total == 0:
-        return default
-    weights = clipped / total
-
-    assignments = []
-    for k in range(min(TOP_K, len(top_k_idx_sorted))):
-        cidx = int(top_k_idx_sorted[k])
-        w = float(weights[k])
-        if w < 0.01:
-            continue
-        assignments.append({
-            'super': int(super_idx[cidx]),
-            'leaf': int(leaf_idx[cidx]),
-            'weight': round(w, 4),
-        })
-
-    return {
-        'super_cluster_id': primary_super,
-        'leaf_cluster_id': primary_leaf,
-        'cluster_assignments': assignments,
-    }
+        return {'super_cluster_id': None, 'leaf_cluster_id': None, 'cluster_assignments': None}
+    return assign_clusters_batch([embedding])[0]
@@ -27,7 +27,9 @@ import numpy as np
 from datetime import datetime, timedelta, timezone
 from collections import Counter
 from dotenv import load_dotenv
-from supabase import create_client
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from supabase_pool import get_supabase_client
 
 try:
     from scipy.cluster.hierarchy import linkage, fcluster
@@ -52,7 +54,7 @@ if not SUPABASE_URL or not SUPABASE_KEY:
     print("ERROR: SUPABASE_URL and SUPABASE_SERVICE_KEY required")
     sys.exit(1)
 
-supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
+supabase = get_supabase_client(SUPABASE_URL, SUPABASE_KEY)
 
 MAX_CLUSTERS = 8
 MIN_CLUSTER_SIZE = 3
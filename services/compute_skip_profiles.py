@@ -10,16 +10,19 @@ Run periodically (e.g., every 6 hours via cron or Cloud Scheduler).
 """
 
 import os
+import sys
 import json
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
-from supabase import create_client
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from supabase_pool import get_supabase_client
 
 load_dotenv()
 
 supabase_url = os.getenv('SUPABASE_URL') or os.getenv('NEXT_PUBLIC_SUPABASE_URL')
 supabase_key = os.getenv('SUPABASE_KEY') or os.getenv('SUPABASE_SERVICE_KEY')
-supabase = create_client(supabase_url, supabase_key)
+supabase = get_supabase_client(supabase_url, supabase_key)
 
 LOOKBACK_HOURS = 72  # Consider impressions from last 3 days
 
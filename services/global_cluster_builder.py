@@ -15,6 +15,17 @@ Each article gets:
   - cluster_assignments: JSONB list of top-3 (super, leaf, weight) tuples
     across all 100 leaves, weights normalized to sum = 1.0
 
+Incremental mode (--incremental) warm-starts from the current
+global_cluster_centroids instead of re-running k-means over the whole window:
+  - articles published since the last rebuild are folded into their nearest
+    super/leaf centroids in mini-batches (MiniBatchKMeans-style running-mean
+    updates, learning rate 1/count)
+  - articles that aged out of the window since the last rebuild are removed
+    from the centroids they counted towards
+  - only articles whose super/leaf or top-K leaves changed are rewritten
+So nightly CPU and write volume follow daily churn, not corpus size. Falls
+back to a full rebuild when no complete centroid set exists.
+
 Run daily at 3 AM UTC via Cloud Scheduler → Cloud Run Job.
 
 Env required:
@@ -23,6 +34,7 @@ Env required:
 Usage:
   python3 services/global_cluster_builder.py         # full rebuild (default)
   python3 services/global_cluster_builder.py --dry   # log stats, don't write
+  python3 services/global_cluster_builder.py --incremental  # warm-start update
 """
 
 import os
@@ -32,14 +44,14 @@ import math
 import argparse
 import logging
 import numpy as np
-from datetime import datetime, timezone
-from typing import List, Tuple, Optional
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Tuple, Optional
 
 from sklearn.cluster import KMeans
-from supabase import create_client
 
 # Allow importing the MiniLM helper for UGC articles missing embeddings.
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from supabase_pool import get_supabase_client
 try:
     from step1_5_event_clustering import get_embeddings_minilm_batch
     HAS_EMBEDDING_HELPER = True
@@ -63,20 +75,54 @@ MIN_ARTICLE_SCORE = 0          # include UGC (ai_final_score=500) and news
 TOP_N_LEAVES_PER_ARTICLE = 3   # multi-label top-K
 KMEANS_N_INIT = 5
 KMEANS_RANDOM_STATE = 42
-BATCH_SIZE_UPDATE = 500        # per UPDATE batch to keep requests small
+BATCH_SIZE_UPDATE = 2000       # rows per bulk_update_article_clusters RPC call
+BATCH_SIZE_EMBEDDINGS = 200    # rows per bulk_update_article_embeddings call (~8KB/row)
+BULK_WRITE_WORKERS = 4         # concurrent bulk RPC calls
+BULK_WRITE_RETRIES = 3         # attempts per chunk before per-row fallback
+INCREMENTAL_BATCH_SIZE = 1024  # new articles per mini-batch centroid update
 
 
 def supabase_client():
-    url = os.environ.get('SUPABASE_URL') or os.environ.get('NEXT_PUBLIC_SUPABASE_URL')
-    key = os.environ.get('SUPABASE_SERVICE_KEY')
-    if not url or not key:
-        raise RuntimeError("SUPABASE_URL and SUPABASE_SERVICE_KEY required")
-    return create_client(url, key)
+    return get_supabase_client()
+
+
+def _bulk_write(sb, rpc_name: str, rows: List[dict], chunk_size: int, write_row) -> Tuple[int, int]:
+    """Send rows in chunks through a set-based RPC (migration 082).
+
+    Each chunk is retried with backoff; a chunk that still fails (or an RPC
+    that doesn't exist yet) falls back to one REST update per row via
+    write_row(row) -> bool. Returns (written, failed).
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    def _write_chunk(chunk):
+        for attempt in range(BULK_WRITE_RETRIES):
+            try:
+                resp = sb.rpc(rpc_name, {'rows': chunk}).execute()
+                return (resp.data if isinstance(resp.data, int) else len(chunk)), 0
+            except Exception as e:
+                if attempt < BULK_WRITE_RETRIES - 1:
+                    time.sleep(2 ** attempt)
+                else:
+                    log.warning(f"  {rpc_name} failed for {len(chunk)} rows, falling back to per-row updates: {e}")
+        ok = sum(1 for row in chunk if write_row(row))
+        return ok, len(chunk) - ok
+
+    chunks = [rows[i:i + chunk_size] for i in range(0, len(rows), chunk_size)]
+    written = failed = 0
+    with ThreadPoolExecutor(max_workers=BULK_WRITE_WORKERS) as pool:
+        for ok, bad in pool.map(_write_chunk, chunks):
+            written += ok
+            failed += bad
+    return written, failed
 
 
-def load_article_embeddings(sb) -> Tuple[List[int], np.ndarray, List[int]]:
+def load_article_embeddings(sb, current: Optional[Dict[int, dict]] = None) -> Tuple[List[int], np.ndarray, List[int]]:
     """Load (id, embedding) for articles in the 90-day window.
 
+    If `current` is given, it is filled with each article's published_at and
+    stored cluster columns (used by the incremental rebuild).
+
     Returns:
       ids: list of article ids (aligned with embeddings rows)
       embeddings: (N, 384) ndarray
@@ -92,10 +138,13 @@ def load_article_embeddings(sb) -> Tuple[List[int], np.ndarray, List[int]]:
     embs: List[List[float]] = []
     missing: List[int] = []
     missing_texts: List[Tuple[int, str]] = []
+    columns = 'id, embedding_minilm, title_news, summary_bullets_news'
+    if current is not None:
+        columns += ', published_at, super_cluster_id, leaf_cluster_id, cluster_assignments'
 
     while True:
         resp = (sb.table('published_articles')
-                .select('id, embedding_minilm, title_news, summary_bullets_news')
+                .select(columns)
                 .gte('published_at', cutoff_iso)
                 .gte('ai_final_score', MIN_ARTICLE_SCORE)
                 .range(offset, offset + PAGE - 1)
@@ -104,6 +153,13 @@ def load_article_embeddings(sb) -> Tuple[List[int], np.ndarray, List[int]]:
         if not rows:
             break
         for r in rows:
+            if current is not None:
+                current[r['id']] = {
+                    'published_at': r.get('published_at'),
+                    'super_cluster_id': r.get('super_cluster_id'),
+                    'leaf_cluster_id': r.get('leaf_cluster_id'),
+                    'cluster_assignments': r.get('cluster_assignments'),
+                }
             emb = r.get('embedding_minilm')
             if emb and isinstance(emb, list) and len(emb) == 384:
                 ids.append(r['id'])
@@ -139,15 +195,22 @@ def load_article_embeddings(sb) -> Tuple[List[int], np.ndarray, List[int]]:
         # Persist new UGC embeddings so they don't need re-computing next night
         if new_embeddings_to_write:
             log.info(f"persisting {len(new_embeddings_to_write)} newly-computed embeddings")
-            for i in range(0, len(new_embeddings_to_write), 200):
-                chunk = new_embeddings_to_write[i:i+200]
-                for aid, emb in chunk:
-                    try:
-                        sb.table('published_articles').update({
-                            'embedding_minilm': emb
-                        }).eq('id', aid).execute()
-                    except Exception as e:
-                        log.warning(f"  failed to persist embedding for {aid}: {e}")
+
+            def _persist_one(row):
+                try:
+                    sb.table('published_articles').update({
+                        'embedding_minilm': row['embedding_minilm']
+                    }).eq('id', row['id']).execute()
+                    return True
+                except Exception as e:
+                    log.warning(f"  failed to persist embedding for {row['id']}: {e}")
+                    return False
+
+            rows = [{'id': int(aid), 'embedding_minilm': [float(x) for x in emb]}
+                    for aid, emb in new_embeddings_to_write]
+            written, failed = _bulk_write(sb, 'bulk_update_article_embeddings', rows,
+                                          BATCH_SIZE_EMBEDDINGS, _persist_one)
+            log.info(f"  persisted {written} embeddings ({failed} failed)")
 
     if not embs:
         raise RuntimeError("no article embeddings found in window; cannot cluster")
@@ -306,54 +369,250 @@ def write_centroids_to_db(sb, super_centroids: np.ndarray,
 
 def write_article_clusters(sb, ids: List[int], super_labels: np.ndarray,
                             leaf_labels: np.ndarray, assignments):
-    """Parallel-update published_articles with cluster columns.
+    """Bulk-update published_articles with cluster columns.
 
-    Serial UPDATE per row against the Supabase REST API takes ~100ms each,
-    which is 2+ hours for 75k articles. ThreadPoolExecutor with 24 workers
-    drops this to ~10 minutes.
+    One REST UPDATE per row took ~10 minutes for 75k articles even with 24
+    threads. Assignments now go to bulk_update_article_clusters (migration
+    082) in chunks of BATCH_SIZE_UPDATE rows, each applied as one set-based
+    UPDATE, with a few chunks in flight and per-chunk retries. Chunks that
+    keep failing fall back to per-row updates.
     """
-    from concurrent.futures import ThreadPoolExecutor, as_completed
-    log.info(f"writing cluster assignments for {len(ids)} articles (parallel, 24 workers)")
-    n = len(ids)
+    log.info(f"writing cluster assignments for {len(ids)} articles "
+             f"(bulk RPC, {BATCH_SIZE_UPDATE} rows/call, {BULK_WRITE_WORKERS} workers)")
     t0 = time.time()
 
-    def _update_one(args):
-        aid, s, l, ap = args
+    def _update_one(row):
         try:
             sb.table('published_articles').update({
-                'super_cluster_id': int(s),
-                'leaf_cluster_id': int(l),
-                'cluster_assignments': ap,
-            }).eq('id', int(aid)).execute()
+                'super_cluster_id': row['super_cluster_id'],
+                'leaf_cluster_id': row['leaf_cluster_id'],
+                'cluster_assignments': row['cluster_assignments'],
+            }).eq('id', row['id']).execute()
             return True
         except Exception as e:
-            log.warning(f"  update failed for id={aid}: {e}")
+            log.warning(f"  update failed for id={row['id']}: {e}")
             return False
 
-    written = 0
-    failed = 0
-    last_log = t0
-
-    tasks = list(zip(ids, super_labels, leaf_labels, assignments))
+    rows = [{
+        'id': int(aid),
+        'super_cluster_id': int(s),
+        'leaf_cluster_id': int(l),
+        'cluster_assignments': ap,
+    } for aid, s, l, ap in zip(ids, super_labels, leaf_labels, assignments)]
 
-    with ThreadPoolExecutor(max_workers=24) as pool:
-        for ok in pool.map(_update_one, tasks, chunksize=1):
-            if ok:
-                written += 1
-            else:
-                failed += 1
-            now = time.time()
-            if now - last_log >= 5.0:  # log every 5 seconds
-                elapsed = now - t0
-                rate = written / elapsed if elapsed > 0 else 0
-                eta = (n - written - failed) / rate if rate > 0 else 0
-                log.info(f"  progress: {written}/{n} in {elapsed:.1f}s ({rate:.1f}/s, ETA {eta:.0f}s)")
-                last_log = now
+    written, failed = _bulk_write(sb, 'bulk_update_article_clusters', rows, BATCH_SIZE_UPDATE, _update_one)
 
     elapsed = time.time() - t0
     log.info(f"  final: {written} updated, {failed} failed in {elapsed:.1f}s")
 
 
+# --- Incremental rebuild ---
+
+def _parse_vector(value) -> Optional[np.ndarray]:
+    """pgvector comes back as a "[0.1,0.2,...]" string or a list."""
+    if not value:
+        return None
+    if isinstance(value, str):
+        value = [float(x) for x in value.strip('[]').split(',')]
+    return np.asarray(value, dtype=np.float32)
+
+
+def load_centroids(sb):
+    """Current hierarchy from global_cluster_centroids.
+
+    Returns (super_centroids, leaf_centroids, super_counts, leaf_counts,
+    last_rebuilt_at) or None if the table doesn't hold a complete set.
+    """
+    resp = sb.table('global_cluster_centroids').select('*').execute()
+    rows = resp.data or []
+    if len(rows) < SUPER_K + SUPER_K * LEAF_K:
+        log.info(f"  global_cluster_centroids has {len(rows)} rows — no complete hierarchy to warm-start from")
+        return None
+
+    super_centroids = np.zeros((SUPER_K, 384), dtype=np.float32)
+    leaf_centroids = np.zeros((SUPER_K, LEAF_K, 384), dtype=np.float32)
+    super_counts = np.zeros(SUPER_K, dtype=np.int64)
+    leaf_counts = np.zeros((SUPER_K, LEAF_K), dtype=np.int64)
+    rebuilt_at = []
+    for r in rows:
+        vec = _parse_vector(r.get('centroid'))
+        if vec is None or vec.shape != (384,):
+            log.warning(f"  bad centroid row super={r.get('super_cluster_id')} leaf={r.get('leaf_cluster_id')}")
+            return None
+        s = r['super_cluster_id']
+        l = r.get('leaf_cluster_id')
+        if l is None:
+            super_centroids[s] = vec
+            super_counts[s] = int(r.get('article_count') or 0)
+        else:
+            leaf_centroids[s, l] = vec
+            leaf_counts[s, l] = int(r.get('article_count') or 0)
+        if r.get('last_rebuilt_at'):
+            rebuilt_at.append(r['last_rebuilt_at'])
+    if not rebuilt_at:
+        return None
+    return super_centroids, leaf_centroids, super_counts, leaf_counts, min(rebuilt_at)
+
+
+def load_aged_out_articles(sb, since_iso: str, until_iso: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Articles that left the window since the last rebuild, with the
+    super/leaf they were counted in. Returns (embeddings, super, leaf)."""
+    PAGE = 1000
+    offset = 0
+    embs: List[List[float]] = []
+    supers: List[int] = []
+    leaves: List[int] = []
+    while True:
+        resp = (sb.table('published_articles')
+                .select('id, embedding_minilm, super_cluster_id, leaf_cluster_id')
+                .gte('published_at', since_iso)
+                .lt('published_at', until_iso)
+                .gte('ai_final_score', MIN_ARTICLE_SCORE)
+                .not_.is_('super_cluster_id', 'null')
+                .range(offset, offset + PAGE - 1)
+                .execute())
+        rows = resp.data or []
+        for r in rows:
+            emb = r.get('embedding_minilm')
+            if emb and isinstance(emb, list) and len(emb) == 384 and r.get('leaf_cluster_id') is not None:
+                embs.append(emb)
+                supers.append(int(r['super_cluster_id']))
+                leaves.append(int(r['leaf_cluster_id']))
+        offset += PAGE
+        if len(rows) < PAGE:
+            break
+    return (np.asarray(embs, dtype=np.float32).reshape(-1, 384),
+            np.asarray(supers, dtype=np.int64), np.asarray(leaves, dtype=np.int64))
+
+
+def _parse_ts(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    dt = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+
+
+def _nearest(embs: np.ndarray, centers: np.ndarray) -> np.ndarray:
+    """Index of the nearest center (squared euclidean, as KMeans uses)."""
+    d = (centers * centers).sum(axis=1)[None, :] - 2.0 * (embs @ centers.T)
+    return np.argmin(d, axis=1)
+
+
+def _fold(centers: np.ndarray, counts: np.ndarray, embs: np.ndarray, labels: np.ndarray, sign: int):
+    """Add (sign=1) or remove (sign=-1) points from their centers in place,
+    keeping each center the running mean of its members — the MiniBatchKMeans
+    update with per-center learning rate 1/count."""
+    k = len(centers)
+    sums = np.zeros((k, centers.shape[1]), dtype=np.float64)
+    np.add.at(sums, labels, embs)
+    n = np.bincount(labels, minlength=k)
+    new_counts = counts + sign * n
+    touched = (n > 0) & (new_counts > 0)
+    centers[touched] = ((centers[touched] * counts[touched, None] + sign * sums[touched])
+                        / new_counts[touched, None])
+    counts[:] = np.maximum(new_counts, 0)
+
+
+def update_hierarchy(super_centroids: np.ndarray, leaf_centroids: np.ndarray,
+                     super_counts: np.ndarray, leaf_counts: np.ndarray,
+                     new_embs: np.ndarray, old_embs: np.ndarray,
+                     old_super: np.ndarray, old_leaf: np.ndarray):
+    """Decay aged-out articles out of the hierarchy, then fold new ones in
+    mini-batches (each batch is assigned against the already-updated centers).
+    Updates the arrays in place."""
+    if len(old_embs):
+        _fold(super_centroids, super_counts, old_embs, old_super, -1)
+        for s in range(SUPER_K):
+            mask = old_super == s
+            if mask.any():
+                _fold(leaf_centroids[s], leaf_counts[s], old_embs[mask], old_leaf[mask], -1)
+
+    for i in range(0, len(new_embs), INCREMENTAL_BATCH_SIZE):
+        batch = new_embs[i:i + INCREMENTAL_BATCH_SIZE]
+        super_labels = _nearest(batch, super_centroids)
+        _fold(super_centroids, super_counts, batch, super_labels, 1)
+        for s in np.unique(super_labels):
+            sub = batch[super_labels == s]
+            _fold(leaf_centroids[s], leaf_counts[s], sub, _nearest(sub, leaf_centroids[s]), 1)
+
+
+def assign_hierarchy(embs: np.ndarray, super_centroids: np.ndarray, leaf_centroids: np.ndarray):
+    """Nearest super per article, then nearest leaf within it.
+
+    Returns (super_labels, leaf_labels, leaf_counts)."""
+    super_labels = _nearest(embs, super_centroids)
+    leaf_labels = np.zeros(len(embs), dtype=np.int32)
+    leaf_counts = np.zeros((SUPER_K, LEAF_K), dtype=np.int64)
+    for s in range(SUPER_K):
+        mask = super_labels == s
+        if mask.any():
+            leaf_labels[mask] = _nearest(embs[mask], leaf_centroids[s])
+            leaf_counts[s] = np.bincount(leaf_labels[mask], minlength=LEAF_K)
+    return super_labels, leaf_labels, leaf_counts
+
+
+def _assignment_changed(stored: Optional[dict], s: int, l: int, assignment: List[dict]) -> bool:
+    """True if super/leaf or the ordered top-K leaves differ (weights ignored)."""
+    if not stored or stored.get('super_cluster_id') != s or stored.get('leaf_cluster_id') != l:
+        return True
+    old = stored.get('cluster_assignments') or []
+    return ([(e.get('super'), e.get('leaf')) for e in old]
+            != [(e['super'], e['leaf']) for e in assignment])
+
+
+def incremental_rebuild(sb, dry: bool = False) -> bool:
+    """Warm-start update of the hierarchy. Returns False if a full rebuild
+    is needed (no complete centroid set to start from)."""
+    loaded = load_centroids(sb)
+    if loaded is None:
+        return False
+    super_centroids, leaf_centroids, super_counts, leaf_counts, last_rebuilt_at = loaded
+    log.info(f"incremental: warm-starting from centroids rebuilt at {last_rebuilt_at}")
+
+    current: Dict[int, dict] = {}
+    ids, embs, _missing = load_article_embeddings(sb, current)
+
+    last_dt = _parse_ts(last_rebuilt_at)
+    window = timedelta(days=WINDOW_DAYS)
+
+    def _is_new(aid) -> bool:
+        stored = current.get(aid) or {}
+        if stored.get('super_cluster_id') is None:
+            return True
+        published = _parse_ts(stored.get('published_at'))
+        return published is None or published > last_dt
+
+    new_mask = np.array([_is_new(aid) for aid in ids], dtype=bool)
+    old_embs, old_super, old_leaf = load_aged_out_articles(
+        sb, (last_dt - window).isoformat(),
+        (datetime.now(timezone.utc) - window).isoformat())
+    log.info(f"incremental: folding {int(new_mask.sum())} new articles, decaying {len(old_embs)} aged-out")
+
+    t0 = time.time()
+    update_hierarchy(super_centroids, leaf_centroids, super_counts, leaf_counts,
+                     embs[new_mask], old_embs, old_super, old_leaf)
+    super_labels, leaf_labels, leaf_counts = assign_hierarchy(embs, super_centroids, leaf_centroids)
+    super_counts = leaf_counts.sum(axis=1)
+    assignments = compute_top_k_assignments(embs, leaf_centroids, top_k=TOP_N_LEAVES_PER_ARTICLE)
+    log.info(f"incremental: centroids updated and {len(ids)} articles re-scored in {time.time() - t0:.1f}s")
+
+    log_distribution_stats(leaf_counts)
+
+    changed = [i for i, aid in enumerate(ids)
+               if _assignment_changed(current.get(aid), int(super_labels[i]),
+                                      int(leaf_labels[i]), assignments[i])]
+    log.info(f"incremental: {len(changed)}/{len(ids)} articles changed assignment")
+
+    if dry:
+        log.info("--dry: skipping DB writes")
+        return True
+    write_centroids_to_db(sb, super_centroids, leaf_centroids, leaf_counts, super_counts)
+    if changed:
+        write_article_clusters(sb, [ids[i] for i in changed], super_labels[changed],
+                               leaf_labels[changed], [assignments[i] for i in changed])
+    return True
+
+
 def log_distribution_stats(leaf_counts: np.ndarray):
     """Log cluster-size distribution for sanity checks."""
     flat = leaf_counts.flatten()
@@ -371,12 +630,20 @@ def log_distribution_stats(leaf_counts: np.ndarray):
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument('--dry', action='store_true', help='compute but do not write to DB')
+    parser.add_argument('--incremental', action='store_true',
+                        help='warm-start from current centroids and rewrite only changed articles')
     args = parser.parse_args()
 
-    log.info("=== GLOBAL CLUSTER BUILDER — START ===")
+    log.info(f"=== GLOBAL CLUSTER BUILDER — START ({'incremental' if args.incremental else 'full'}) ===")
     t_start = time.time()
 
     sb = supabase_client()
+    if args.incremental:
+        if incremental_rebuild(sb, dry=args.dry):
+            log.info(f"=== DONE in {time.time() - t_start:.1f}s ===")
+            return
+        log.info("incremental: falling back to full rebuild")
+
     ids, embs, _missing = load_article_embeddings(sb)
 
     super_centroids, leaf_centroids, super_labels, leaf_labels, leaf_counts = build_hierarchy(ids, embs)
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+SOURCE EVIDENCE PACKING
+==========================================
+Purpose: Turn a cluster's source texts into a bounded, deduplicated
+         evidence set for the synthesis, verification and component prompts.
+
+Each source used to be cut to its first N characters and every source
+went into the prompt. Wire-copy clusters repeat the same paragraphs across
+many outlets, so large clusters paid for repeated text while facts that
+appeared late in an article were lost to truncation.
+
+Packing:
+  1. Paragraph dedup: each paragraph is reduced to hashed word shingles; a
+     paragraph whose shingles were mostly seen in an earlier source is dropped.
+  2. Sentence ranking: the remaining sentences are chosen greedily by
+     novelty (share of their shingles not yet covered by the evidence),
+     with a small bonus for sentences near the top of an article.
+  3. Budget: selection stops at a per-source and a total character budget,
+     and at most max_sources sources are returned, so prompt size is
+     bounded no matter how many sources a cluster has.
+
+Selected sentences are put back in their original order per source, and the
+sources are returned as copies in the shape the prompts already expect.
+"""
+
+import heapq
+import re
+import zlib
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+
+# ==========================================
+# CONFIGURATION
+# ==========================================
+
+@dataclass
+class EvidenceConfig:
+    """Configuration for evidence packing"""
+    shingle_words: int = 5              # Words per shingle
+    duplicate_paragraph: float = 0.8    # Share of seen shingles that marks a paragraph as a copy
+    min_novelty: float = 0.5            # Sentences adding less than this are skipped
+    min_sentence_chars: int = 25
+    lead_bonus: float = 0.05            # Score decay per sentence position (favors ledes)
+    per_source_chars: int = 1500        # Same per-source cap the prompts used to truncate to
+    total_chars: int = 12000            # Whole evidence set
+    max_sources: int = 10
+
+
+_PARAGRAPH_SPLIT = re.compile(r'\n\s*\n|\n')
+_SENTENCE_SPLIT = re.compile(r'(?<=[.!?])\s+(?=[A-Z0-9"“\'(])')
+_WORD = re.compile(r"[a-z0-9$%']+")
+
+
+def source_text(source: Dict) -> str:
+    """Best available body text of a source (full text first)."""
+    for field in ('full_text', 'content', 'text', 'description'):
+        value = source.get(field)
+        if value:
+            return value
+    return ''
+
+
+def _shingles(text: str, k: int) -> set:
+    words = _WORD.findall(text.lower())
+    if not words:
+        return set()
+    if len(words) <= k:
+        return {zlib.crc32(' '.join(words).encode())}
+    return {zlib.crc32(' '.join(words[i:i + k]).encode()) for i in range(len(words) - k + 1)}
+
+
+# ==========================================
+# PACKING
+# ==========================================
+
+def pack_evidence(sources: List[Dict], config: Optional[EvidenceConfig] = None,
+                  field: str = 'full_text') -> Tuple[List[Dict], Dict]:
+    """
+    Deduplicate and budget the text of `sources`.
+
+    Args:
+        sources: Source dicts, best first (order breaks ties)
+        config: Packing limits
+        field: Key the packed text is written to in the returned copies
+
+    Returns:
+        (packed source copies, stats dict)
+    """
+    cfg = config or EvidenceConfig()
+    stats = {
+        'sources_in': len(sources),
+        'sources_out': 0,
+        'chars_in': 0,
+        'chars_out': 0,
+        'duplicate_paragraphs': 0,
+    }
+
+    # 1. Split into sentences, dropping paragraphs already seen in earlier sources
+    seen = set()
+    sentences = []  # (source_idx, position, text, shingles)
+    for idx, source in enumerate(sources):
+        text = source_text(source)
+        stats['chars_in'] += len(text)
+        position = 0
+        for paragraph in _PARAGRAPH_SPLIT.split(text):
+            paragraph = paragraph.strip()
+            if not paragraph:
+                continue
+            shingles = _shingles(paragraph, cfg.shingle_words)
+            if shingles and len(shingles & seen) / len(shingles) >= cfg.duplicate_paragraph:
+                stats['duplicate_paragraphs'] += 1
+                continue
+            seen |= shingles
+            for sentence in _SENTENCE_SPLIT.split(paragraph):
+                sentence = sentence.strip()
+                if len(sentence) >= cfg.min_sentence_chars:
+                    sentences.append((idx, position, sentence, _shingles(sentence, cfg.shingle_words)))
+                position += 1
+
+    # 2. Greedy novelty selection (lazy: a sentence's score can only drop as coverage grows)
+    covered = set()
+    heap = []
+    for n, (idx, position, sentence, shingles) in enumerate(sentences):
+        if shingles:
+            heapq.heappush(heap, (-1.0 / (1 + cfg.lead_bonus * position), idx, n))
+
+    chosen = {}  # source_idx -> [sentence index]
+    used = {}    # source_idx -> chars
+    total = 0
+    while heap and total < cfg.total_chars:
+        neg_score, idx, n = heapq.heappop(heap)
+        _, position, sentence, shingles = sentences[n]
+        novelty = len(shingles - covered) / len(shingles)
+        if novelty < cfg.min_novelty:
+            continue
+        score = novelty / (1 + cfg.lead_bonus * position)
+        if heap and score < -heap[0][0] - 1e-9:
+            heapq.heappush(heap, (-score, idx, n))
+            continue
+        if idx not in chosen and len(chosen) >= cfg.max_sources:
+            continue
+        cost = len(sentence) + 1
+        if used.get(idx, 0) + cost > cfg.per_source_chars or total + cost > cfg.total_chars:
+            continue
+        chosen.setdefault(idx, []).append(n)
+        used[idx] = used.get(idx, 0) + cost
+        total += cost
+        covered |= shingles
+
+    # 3. Rebuild per-source evidence in original order
+    packed = []
+    for idx, source in enumerate(sources):
+        if idx not in chosen:
+            continue
+        copy = dict(source)
+        copy[field] = ' '.join(sentences[n][2] for n in sorted(chosen[idx]))
+        packed.append(copy)
+        stats['chars_out'] += len(copy[field])
+
+    if not packed:
+        # Nothing usable to rank (titles only, very short texts): keep the old behaviour
+        packed = [dict(s) for s in sources[:cfg.max_sources]]
+        for copy in packed:
+            copy[field] = source_text(copy)[:cfg.per_source_chars]
+        stats['chars_out'] = sum(len(copy[field]) for copy in packed)
+
+    stats['sources_out'] = len(packed)
+    return packed, stats
+
+
+def evidence_excerpt(packed_sources: List[Dict], max_chars: int, field: str = 'full_text') -> str:
+    """Concatenated evidence (best sources first) for single-text prompts."""
+    parts = []
+    total = 0
+    for source in packed_sources:
+        text = source.get(field) or ''
+        if not text:
+            continue
+        parts.append(text[:max_chars - total])
+        total += len(parts[-1]) + 1
+        if total >= max_chars:
+            break
+    return '\n'.join(parts)
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+ADAPTIVE RSS POLL SCHEDULER
+==========================================
+Purpose: Decide which RSS sources are worth polling right now.
+
+Every source used to be polled on the same fixed interval, so a wire feed
+publishing every minute waited as long as a weekly blog, and a feed that had
+been failing for days was still hit every cycle. The scheduler keeps one
+small state record per source:
+  - mean_gap_s: learned publish cadence (EWMA of the gaps between entry
+    timestamps seen in the feed, seeded from source_stats when available)
+  - consecutive_failures: drives exponential backoff
+  - next_poll_at: when the source is due again
+
+Poll interval = mean_gap_s * poll_fraction, clamped to [min, max]. A failing
+source waits interval * 2^failures (capped). Sources with no state yet are
+always due.
+
+The scheduler is storage-agnostic: callers load rows with from_rows() and
+persist changed rows from dirty_rows() (SQLite in rss_fetcher, Supabase
+rss_source_schedule in the clustered workflow).
+"""
+
+import os
+import threading
+import time
+from dataclasses import dataclass, asdict
+from typing import Dict, Iterable, List, Optional, Sequence
+
+
+# ==========================================
+# CONFIGURATION
+# ==========================================
+
+@dataclass
+class PollConfig:
+    """Configuration for adaptive per-source polling"""
+    min_interval_s: float = 120.0           # Never poll a source more often than this
+    max_interval_s: float = 6 * 3600.0      # Never wait longer than this between polls
+    default_interval_s: float = 600.0       # Sources with no cadence estimate yet
+    poll_fraction: float = 0.5              # Poll twice per expected new entry
+    cadence_alpha: float = 0.3              # EWMA weight of the newest cadence sample
+    max_entries_for_cadence: int = 20       # Most recent entries used per sample
+    max_failure_backoff_s: float = 24 * 3600.0
+
+
+def adaptive_polling_enabled() -> bool:
+    """RSS_ADAPTIVE_POLLING=0 restores fixed-interval polling of every source."""
+    return os.getenv('RSS_ADAPTIVE_POLLING', '1') != '0'
+
+
+@dataclass
+class SourcePollState:
+    """Persisted scheduling state of one source (timestamps are epoch seconds)"""
+    source_name: str
+    mean_gap_s: Optional[float] = None
+    consecutive_failures: int = 0
+    last_polled_at: Optional[float] = None
+    next_poll_at: Optional[float] = None
+    newest_entry_at: Optional[float] = None
+
+
+def estimate_publish_gap(entry_times: Sequence[float], now: float,
+                         max_entries: int = 20) -> Optional[float]:
+    """
+    Estimate a feed's publish gap from its entry timestamps.
+
+    Uses the median gap between the most recent entries. If the newest entry
+    is older than that, the feed has slowed down and its age is used instead.
+
+    Returns:
+        Gap in seconds, or None if the feed has no usable timestamps
+    """
+    times = sorted((t for t in entry_times if t and t <= now), reverse=True)[:max_entries]
+    if not times:
+        return None
+    age = now - times[0]
+    if len(times) < 2:
+        return age or None
+
+    gaps = sorted(a - b for a, b in zip(times, times[1:]) if a > b)
+    if not gaps:
+        return age or None
+    median = gaps[len(gaps) // 2]
+    return max(median, age)
+
+
+# ==========================================
+# SCHEDULER
+# ==========================================
+
+class SourcePollScheduler:
+    """Thread-safe per-source poll schedule"""
+
+    def __init__(self, config: Optional[PollConfig] = None):
+        self.config = config or PollConfig()
+        self._states: Dict[str, SourcePollState] = {}
+        self._dirty = set()
+        self._lock = threading.Lock()
+
+    # ------------------------------------------
+    # Loading / persistence
+    # ------------------------------------------
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Dict], config: Optional[PollConfig] = None) -> 'SourcePollScheduler':
+        scheduler = cls(config)
+        for row in rows:
+            state = SourcePollState(
+                source_name=row['source_name'],
+                mean_gap_s=row.get('mean_gap_s'),
+                consecutive_failures=int(row.get('consecutive_failures') or 0),
+                last_polled_at=row.get('last_polled_at'),
+                next_poll_at=row.get('next_poll_at'),
+                newest_entry_at=row.get('newest_entry_at'),
+            )
+            scheduler._states[state.source_name] = state
+        return scheduler
+
+    def seed_from_stats(self, source_name: str, avg_new_per_fetch: float,
+                        fetch_interval_s: float, consecutive_failures: int = 0):
+        """
+        Seed a source that has no schedule yet from fixed-interval history
+        (source_stats): N new articles per fetch ~ one every interval / N.
+        """
+        with self._lock:
+            if source_name in self._states:
+                return
+            state = SourcePollState(source_name=source_name,
+                                    consecutive_failures=int(consecutive_failures or 0))
+            if avg_new_per_fetch and avg_new_per_fetch > 0:
+                state.mean_gap_s = fetch_interval_s / avg_new_per_fetch
+            self._states[source_name] = state
+
+    def dirty_rows(self) -> List[Dict]:
+        """Rows changed since the last call (clears the dirty set)."""
+        with self._lock:
+            rows = [asdict(self._states[name]) for name in self._dirty]
+            self._dirty.clear()
+        return rows
+
+    # ------------------------------------------
+    # Scheduling
+    # ------------------------------------------
+
+    def interval_for(self, state: SourcePollState) -> float:
+        """Poll interval before failure backoff."""
+        cfg = self.config
+        if state.mean_gap_s is None:
+            return cfg.default_interval_s
+        return min(cfg.max_interval_s, max(cfg.min_interval_s, state.mean_gap_s * cfg.poll_fraction))
+
+    def due_sources(self, sources: Sequence, now: Optional[float] = None) -> List:
+        """
+        Filter `sources` ((name, url, ...) tuples) to those due for a poll.
+        Sources without state, or never scheduled, are always due.
+        """
+        now = now or time.time()
+        with self._lock:
+            due = []
+            for source in sources:
+                state = self._states.get(source[0])
+                if state is None or state.next_poll_at is None or state.next_poll_at <= now:
+                    due.append(source)
+            return due
+
+    def next_due_at(self, sources: Sequence) -> Optional[float]:
+        """Earliest next_poll_at across `sources` (None if any is due now)."""
+        with self._lock:
+            times = []
+            for source in sources:
+                state = self._states.get(source[0])
+                if state is None or state.next_poll_at is None:
+                    return None
+                times.append(state.next_poll_at)
+        return min(times) if times else None
+
+    def record_success(self, source_name: str, entry_times: Sequence[float],
+                       now: Optional[float] = None):
+        """Update cadence from a successful poll and schedule the next one."""
+        now = now or time.time()
+        cfg = self.config
+        with self._lock:
+            state = self._states.setdefault(source_name, SourcePollState(source_name=source_name))
+            gap = estimate_publish_gap(entry_times, now, cfg.max_entries_for_cadence)
+            if gap is not None:
+                state.mean_gap_s = gap if state.mean_gap_s is None else (
+                    cfg.cadence_alpha * gap + (1 - cfg.cadence_alpha) * state.mean_gap_s
+                )
+            newest = max((t for t in entry_times if t), default=None)
+            if newest and (state.newest_entry_at is None or newest > state.newest_entry_at):
+                state.newest_entry_at = newest
+            state.consecutive_failures = 0
+            state.last_polled_at = now
+            state.next_poll_at = now + self.interval_for(state)
+            self._dirty.add(source_name)
+
+    def record_failure(self, source_name: str, now: Optional[float] = None):
+        """Exponential backoff on consecutive failures."""
+        now = now or time.time()
+        cfg = self.config
+        with self._lock:
+            state = self._states.setdefault(source_name, SourcePollState(source_name=source_name))
+            state.consecutive_failures += 1
+            backoff = self.interval_for(state) * (2 ** min(state.consecutive_failures, 16))
+            state.last_polled_at = now
+            state.next_poll_at = now + min(cfg.max_failure_backoff_s, backoff)
+            self._dirty.add(source_name)
+
+    def summary(self, sources: Sequence, now: Optional[float] = None) -> Dict:
+        """Counts for logging: due now, backing off, expected polls per hour."""
+        now = now or time.time()
+        with self._lock:
+            backing_off = 0
+            polls_per_hour = 0.0
+            for source in sources:
+                state = self._states.get(source[0])
+                if state is None:
+                    polls_per_hour += 3600.0 / self.config.default_interval_s
+                    continue
+                if state.consecutive_failures:
+                    backing_off += 1
+                polls_per_hour += 3600.0 / self.interval_for(state)
+        return {
+            'due': len(self.due_sources(sources, now)),
+            'backing_off': backing_off,
+            'expected_polls_per_hour': round(polls_per_hour),
+        }
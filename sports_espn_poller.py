@@ -13,18 +13,28 @@ Leagues covered:
   Tier 3 (individual/special): F1, ATP Tennis, WTA Tennis, UFC, Golf PGA
 
 Runs alongside the main pipeline (called at the end of each cycle).
+
+A poll fetches every scoreboard in parallel, resolves already-processed
+event IDs with one query, and generates articles concurrently (Gemini calls
+share the process-wide LLM gateway limit). Scoreboards whose set of
+completed events hasn't changed since the last fully handled poll are not
+re-extracted (see ScoreboardDelta).
 """
 
 import os
 import re
 import json
 import time
+import hashlib
+import threading
 import requests
-from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
 from difflib import SequenceMatcher
 from typing import Dict, List, Optional, Tuple
 from dotenv import load_dotenv
-from supabase import create_client
+from supabase_pool import get_supabase_client
+from llm_gateway import get_gateway
 
 load_dotenv('.env.local')
 
@@ -233,18 +243,15 @@ VALID_COUNTRIES = [
 ]
 
 
+# Concurrency
+SCOREBOARD_FETCH_WORKERS = 16   # One per league: a poll takes as long as the slowest scoreboard
+GENERATION_WORKERS = 4          # Concurrent article generations (Gemini admission is the gateway's)
+
+
 # ==========================================
 # SUPABASE & API CLIENTS
 # ==========================================
 
-def get_supabase_client():
-    url = os.getenv('NEXT_PUBLIC_SUPABASE_URL') or os.getenv('SUPABASE_URL')
-    key = os.getenv('SUPABASE_SERVICE_KEY') or os.getenv('SUPABASE_KEY')
-    if not url or not key:
-        raise ValueError("SUPABASE_URL and SUPABASE_SERVICE_KEY must be set")
-    return create_client(url, key)
-
-
 def get_gemini_key():
     key = os.getenv('GEMINI_API_KEY') or os.getenv('GOOGLE_API_KEY')
     if not key:
@@ -322,6 +329,13 @@ def _save_local_tracking(data):
         json.dump(data, f, indent=2)
 
 
+# Per-league scoreboard delta state (see ScoreboardDelta). Lives in the
+# sports_scoreboard_state table (migrations/083); the file is a local-dev
+# fallback, since Cloud Run Jobs start every execution with a fresh disk.
+SCOREBOARD_STATE_TABLE = 'sports_scoreboard_state'
+LOCAL_SCOREBOARD_STATE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.sports_scoreboard_state.json')
+
+
 # ==========================================
 # ESPN API HELPERS
 # ==========================================
@@ -841,7 +855,7 @@ def generate_article_with_gemini(sport: str, event_name: str, results: Dict,
 
     for attempt in range(3):
         try:
-            resp = requests.post(url, json=payload, timeout=30)
+            resp = get_gateway().post(url, json=payload, timeout=30, stage='sports', max_retries=0)
             resp.raise_for_status()
             result = resp.json()
             text = result['candidates'][0]['content']['parts'][0]['text'].strip()
@@ -861,8 +875,8 @@ def generate_article_with_gemini(sport: str, event_name: str, results: Dict,
 
         except Exception as e:
             print(f"      ⚠️ Gemini attempt {attempt + 1}/3 failed: {e}")
-            if attempt < 2:
-                time.sleep(2 ** attempt)
+            if attempt < 2 and not get_gateway().backoff('sports', attempt):
+                break
 
     return None
 
@@ -1022,36 +1036,80 @@ def _clean_title(t: str) -> str:
     return t.strip()
 
 
-def is_event_already_processed(supabase, event_id: str) -> bool:
-    """Check if event was already processed (DB table or local JSON fallback)."""
+def get_processed_event_ids(supabase, event_ids: List[str]) -> set:
+    """Subset of event_ids already processed (one IN query per 200 IDs, or local JSON)."""
+    event_ids = list(dict.fromkeys(event_ids))
+    if not event_ids:
+        return set()
     if TRACKING_TABLE_AVAILABLE:
         try:
-            result = supabase.table('sports_poll_tracking').select('id').eq('espn_event_id', event_id).execute()
-            return len(result.data) > 0
+            processed = set()
+            for i in range(0, len(event_ids), 200):
+                result = supabase.table('sports_poll_tracking').select('espn_event_id').in_(
+                    'espn_event_id', event_ids[i:i + 200]
+                ).execute()
+                processed.update(row['espn_event_id'] for row in result.data or [])
+            return processed
         except Exception:
             pass
     # Fallback to local tracking
     tracking = _load_local_tracking()
-    return event_id in tracking
+    return {eid for eid in event_ids if eid in tracking}
 
 
-def is_title_duplicate(supabase, title: str) -> bool:
-    """Check against recent published_articles for title similarity (>=65%)."""
-    try:
-        cutoff = (datetime.now() - timedelta(hours=48)).isoformat()
-        result = supabase.table('published_articles').select('title_news').gte('published_at', cutoff).execute()
+def is_event_already_processed(supabase, event_id: str) -> bool:
+    """Check if event was already processed (DB table or local JSON fallback)."""
+    return event_id in get_processed_event_ids(supabase, [event_id])
 
-        clean_new = _clean_title(title)
-        for article in result.data:
-            existing_title = article.get('title_news', '')
-            clean_existing = _clean_title(existing_title)
-            similarity = SequenceMatcher(None, clean_new, clean_existing).ratio()
-            if similarity >= 0.65:
+
+class TitleIndex:
+    """
+    Cleaned titles of recent published_articles, loaded once per poll.
+
+    claim() checks and records a title atomically, so concurrent generations
+    can't publish two near-identical titles in the same run.
+    """
+
+    def __init__(self, titles: List[str]):
+        self._titles = [_clean_title(t) for t in titles if t]
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, supabase, hours: int = 48) -> 'TitleIndex':
+        try:
+            cutoff = (datetime.now() - timedelta(hours=hours)).isoformat()
+            result = supabase.table('published_articles').select('title_news').gte('published_at', cutoff).execute()
+            return cls([row.get('title_news', '') for row in result.data or []])
+        except Exception as e:
+            print(f"      ⚠️ Title index load error: {e}")
+            return cls([])
+
+    def _matches(self, clean_new: str) -> bool:
+        for clean_existing in self._titles:
+            matcher = SequenceMatcher(None, clean_new, clean_existing)
+            # quick ratios are upper bounds of ratio(): skip the full diff when they already fail
+            if (matcher.real_quick_ratio() >= 0.65 and matcher.quick_ratio() >= 0.65
+                    and matcher.ratio() >= 0.65):
                 return True
         return False
-    except Exception as e:
-        print(f"      ⚠️ Title dedup check error: {e}")
-        return False
+
+    def is_duplicate(self, title: str) -> bool:
+        with self._lock:
+            return self._matches(_clean_title(title))
+
+    def claim(self, title: str) -> bool:
+        """Record `title` unless it duplicates one already indexed. Returns False on duplicate."""
+        clean_new = _clean_title(title)
+        with self._lock:
+            if self._matches(clean_new):
+                return False
+            self._titles.append(clean_new)
+            return True
+
+
+def is_title_duplicate(supabase, title: str) -> bool:
+    """Check against recent published_articles for title similarity (>=65%)."""
+    return TitleIndex.load(supabase).is_duplicate(title)
 
 
 # ==========================================
@@ -1123,123 +1181,405 @@ def publish_sports_article(supabase, league_config: Dict, event: Dict,
     return None
 
 
-def track_processed_event(supabase, event: Dict, published_id: Optional[int]):
-    """Record processed event in tracking table + local JSON fallback."""
+def track_processed_events(supabase, tracked: List[Tuple[Dict, Optional[int]]]):
+    """Record (event, published_id) pairs: one bulk upsert + one local JSON write."""
+    if not tracked:
+        return
     if TRACKING_TABLE_AVAILABLE:
         try:
-            supabase.table('sports_poll_tracking').insert({
+            # Upsert: one already-tracked ID must not fail the whole batch (espn_event_id is UNIQUE)
+            supabase.table('sports_poll_tracking').upsert([{
                 'espn_event_id': event['event_id'],
                 'sport': event['sport'],
                 'league': event['sport'],
                 'event_name': event['event_name'],
                 'published_article_id': published_id,
-            }).execute()
+            } for event, published_id in tracked], on_conflict='espn_event_id').execute()
         except Exception as e:
             print(f"      ⚠️ Tracking insert error: {e}")
     # Always update local tracking too
     tracking = _load_local_tracking()
-    tracking[event['event_id']] = {
-        'sport': event['sport'],
-        'event_name': event['event_name'],
-        'published_article_id': published_id,
-        'processed_at': datetime.now().isoformat(),
-    }
+    now = datetime.now().isoformat()
+    for event, published_id in tracked:
+        tracking[event['event_id']] = {
+            'sport': event['sport'],
+            'event_name': event['event_name'],
+            'published_article_id': published_id,
+            'processed_at': now,
+        }
     _save_local_tracking(tracking)
 
 
+def track_processed_event(supabase, event: Dict, published_id: Optional[int]):
+    """Record processed event in tracking table + local JSON fallback."""
+    track_processed_events(supabase, [(event, published_id)])
+
+
 # ==========================================
 # MAIN POLLER LOGIC
 # ==========================================
 
-def poll_league(supabase, league_key: str, league_config: Dict, gemini_key: str) -> int:
-    """Poll a single league and publish any new completed events. Returns count published."""
-    print(f"\n   🏟️ Polling {league_key.upper()}...")
-
-    # 1. Fetch scoreboard
-    scoreboard = fetch_espn_scoreboard(league_config['scoreboard_url'])
-    if not scoreboard:
-        print(f"      ⏭️ No scoreboard data for {league_key}")
-        return 0
-
-    # 2. Extract completed events based on extractor type
+def extract_league_events(scoreboard: Dict, league_key: str, league_config: Dict) -> List[Dict]:
+    """Extract completed events based on the league's extractor type."""
     extractor = league_config.get('extractor', '')
     if extractor == 'soccer':
-        events = extract_soccer_events(scoreboard, league_key)
+        return extract_soccer_events(scoreboard, league_key)
     elif extractor == 'team_sport':
-        events = extract_team_sport_events(scoreboard, league_key)
+        return extract_team_sport_events(scoreboard, league_key)
     elif extractor == 'f1':
-        events = extract_f1_events(scoreboard)
+        return extract_f1_events(scoreboard)
     elif extractor == 'tennis':
-        events = extract_tennis_events(scoreboard, league_key)
+        return extract_tennis_events(scoreboard, league_key)
     elif extractor == 'ufc':
-        events = extract_ufc_events(scoreboard)
+        return extract_ufc_events(scoreboard)
     elif extractor == 'golf':
-        events = extract_golf_events(scoreboard)
-    else:
-        events = []
+        return extract_golf_events(scoreboard)
+    return []
+
+
+def _completion_fingerprint(scoreboard: Dict, produced: Optional[set] = None) -> List[str]:
+    """
+    IDs of the completed events and competitions on a scoreboard (sorted).
 
-    if not events:
-        print(f"      ⏭️ No completed events for {league_key}")
-        return 0
+    With `produced` (raw ESPN IDs the extractor returned events for), events
+    that produced nothing are left out, so they count as new on the next poll.
+    """
+    keys = []
+    for event in scoreboard.get('events', []):
+        if produced is not None and str(event.get('id', '')) not in produced and not any(
+            str(comp.get('id', '')) in produced for comp in event.get('competitions', [])
+        ):
+            continue
+        if _is_event_completed(event):
+            keys.append(f"e:{event.get('id', '')}")
+        for comp in event.get('competitions', []):
+            if _is_competition_completed(comp):
+                keys.append(f"c:{comp.get('id', '')}")
+    return sorted(keys)
 
-    print(f"      📋 Found {len(events)} completed event(s)")
 
-    # 3. Fetch news image (shared across events in same league)
-    image_url = fetch_espn_news_image(league_config['news_url'])
+class ScoreboardDelta:
+    """
+    Per-league scoreboard state, so unchanged scoreboards cost (almost) nothing.
+
+    For each league it remembers the last scoreboard whose events were all
+    handled: ETag / Last-Modified, a hash of the body, its completion
+    fingerprint (IDs of completed events and competitions) and the event
+    IDs it produced. A poll then short-circuits at the first check that
+    shows nothing new:
+      1. 304 Not Modified (conditional GET)      -> no download, no parse
+      2. same body hash                          -> no parse, no extraction
+      3. no new completed event/competition      -> no extraction
+    Only events not produced by the last handled scoreboard are returned.
+    Completed events the extractor dropped (e.g. an F1 race whose Jolpica
+    results aren't out yet) are kept out of the fingerprint and mark the
+    league pending, which disables checks 1 and 2 until they are extracted.
+
+    State is staged by fetch() and only becomes the baseline once commit()
+    is called for the league, i.e. after its events were tracked; a league
+    whose processing failed is re-extracted on the next poll.
+
+    The baseline is persisted per league in sports_scoreboard_state; without
+    a Supabase client (or the table) it falls back to a local JSON file.
+    """
 
-    published = 0
-    for event in events:
-        event_name = event['event_name']
-        event_id = event['event_id']
+    def __init__(self, supabase=None, path: str = LOCAL_SCOREBOARD_STATE_FILE):
+        self.supabase = supabase
+        self.path = path
+        self._state = self._load_table() if supabase is not None else None
+        if self._state is None:
+            self.supabase = None
+            self._state = self._load_file()
+        self._staged = {}
+        self._dirty = set()  # Leagues whose baseline changed since load
+        self._lock = threading.Lock()
+        self.stats = {
+            'not_modified': 0,
+            'same_body': 0,
+            'no_new_completions': 0,
+            'extracted': 0,
+            'bytes_downloaded': 0,
+            'bytes_saved': 0,
+            'cpu_saved_s': 0.0,
+        }
 
-        # 4. Dedup: check tracking table
-        if is_event_already_processed(supabase, event_id):
-            print(f"      ⏭️ Already processed: {event_name[:60]}")
-            continue
+    def _load_table(self) -> Optional[Dict]:
+        try:
+            result = self.supabase.table(SCOREBOARD_STATE_TABLE).select('league_key, state').execute()
+            return {row['league_key']: row['state'] for row in (result.data or [])}
+        except Exception as e:
+            print(f"   ⚠️ {SCOREBOARD_STATE_TABLE} unavailable — using local scoreboard state: {e}")
+            return None
 
-        # 5. Generate article with Gemini
-        print(f"      ✍️ Generating article for: {event_name[:60]}...")
-        generated = generate_article_with_gemini(
-            sport=league_key,
-            event_name=event_name,
-            results=event['results'],
-            event_date=event.get('event_date', ''),
-            gemini_key=gemini_key,
-        )
-
-        if not generated:
-            print(f"      ❌ Gemini generation failed for {event_name[:60]}")
-            track_processed_event(supabase, event, None)
-            continue
+    def _load_file(self) -> Dict:
+        try:
+            with open(self.path, 'r') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _record(self, league_key: str, entry: Dict, outcome: str,
+                downloaded: int = 0, bytes_saved: int = 0, cpu_saved: float = 0.0):
+        with self._lock:
+            self._staged[league_key] = entry
+            self.stats[outcome] += 1
+            self.stats['bytes_downloaded'] += downloaded
+            self.stats['bytes_saved'] += bytes_saved
+            self.stats['cpu_saved_s'] += max(cpu_saved, 0.0)
+
+    def fetch(self, league_key: str, league_config: Dict) -> List[Dict]:
+        """Fetch a league's scoreboard and return its newly completed events."""
+        prev = self._state.get(league_key) or {}
+        pending = prev.get('pending', False)
+        headers = {}
+        if not pending:  # A pending league is re-extracted even if its scoreboard is unchanged
+            if prev.get('etag'):
+                headers['If-None-Match'] = prev['etag']
+            if prev.get('last_modified'):
+                headers['If-Modified-Since'] = prev['last_modified']
+
+        try:
+            resp = requests.get(league_config['scoreboard_url'], timeout=15, headers=headers)
+        except Exception as e:
+            print(f"   ⚠️ ESPN scoreboard error: {e}")
+            return []
+        if resp.status_code == 304 and prev:
+            self._record(league_key, prev, 'not_modified',
+                         bytes_saved=prev.get('bytes', 0), cpu_saved=prev.get('extract_cpu_s', 0.0))
+            return []
+        if resp.status_code != 200:
+            print(f"   ⚠️ ESPN scoreboard returned {resp.status_code}")
+            print(f"      ⏭️ No scoreboard data for {league_key}")
+            return []
+
+        body = resp.content
+        entry = dict(prev)
+        entry.update({
+            'etag': resp.headers.get('ETag'),
+            'last_modified': resp.headers.get('Last-Modified'),
+            'bytes': len(body),
+            'body_hash': hashlib.blake2b(body, digest_size=16).hexdigest(),
+        })
+        if prev and not pending and entry['body_hash'] == prev.get('body_hash'):
+            self._record(league_key, entry, 'same_body', downloaded=len(body),
+                         cpu_saved=prev.get('extract_cpu_s', 0.0))
+            return []
+
+        started = time.thread_time()
+        try:
+            scoreboard = json.loads(body)
+        except ValueError as e:
+            print(f"   ⚠️ ESPN scoreboard error: {e}")
+            return []
+        completed = _completion_fingerprint(scoreboard)
+        if prev and set(completed) <= set(prev.get('completed', [])):
+            spent = time.thread_time() - started
+            self._record(league_key, entry, 'no_new_completions', downloaded=len(body),
+                         cpu_saved=prev.get('extract_cpu_s', 0.0) - spent)
+            return []
+
+        events = extract_league_events(scoreboard, league_key, league_config)
+        entry['extract_cpu_s'] = time.thread_time() - started
+        entry['completed'] = _completion_fingerprint(
+            scoreboard, {e['event_id'].rsplit('_', 1)[-1] for e in events})
+        entry['pending'] = entry['completed'] != completed
+        handled = set(prev.get('event_ids', []))
+        entry['event_ids'] = [e['event_id'] for e in events]
+        self._record(league_key, entry, 'extracted', downloaded=len(body))
+        return [e for e in events if e['event_id'] not in handled]
+
+    def commit(self, league_keys):
+        """Make the staged state of `league_keys` the new baseline."""
+        with self._lock:
+            for key in league_keys:
+                if key in self._staged:
+                    entry = self._staged.pop(key)
+                    if entry != self._state.get(key):
+                        self._state[key] = entry
+                        self._dirty.add(key)
+
+    def save(self):
+        """Persist the baselines that changed (one upsert)."""
+        with self._lock:
+            dirty, self._dirty = self._dirty, set()
+        if not dirty:
+            return
+        if self.supabase is not None:
+            now = datetime.now(timezone.utc).isoformat()
+            try:
+                self.supabase.table(SCOREBOARD_STATE_TABLE).upsert([{
+                    'league_key': key,
+                    'state': self._state[key],
+                    'updated_at': now,
+                } for key in sorted(dirty)], on_conflict='league_key').execute()
+            except Exception as e:
+                # Not fatal: the next poll just re-extracts these leagues
+                print(f"   ⚠️ Scoreboard state save error: {e}")
+            return
+        try:
+            with open(self.path, 'w') as f:
+                json.dump(self._state, f, indent=2)
+        except OSError as e:
+            print(f"   ⚠️ Scoreboard state save error: {e}")
+
+    def print_summary(self):
+        st = self.stats
+        unchanged = st['not_modified'] + st['same_body'] + st['no_new_completions']
+        print(f"   📉 Scoreboards unchanged: {unchanged}/{unchanged + st['extracted']} "
+              f"(304: {st['not_modified']}, same body: {st['same_body']}, "
+              f"no new completions: {st['no_new_completions']}) — "
+              f"downloaded {st['bytes_downloaded'] / 1024:.0f} KB, "
+              f"saved ~{st['bytes_saved'] / 1024:.0f} KB and ~{st['cpu_saved_s'] * 1000:.0f} ms CPU")
+
+
+def fetch_league_events(league_key: str, league_config: Dict,
+                        delta: Optional[ScoreboardDelta] = None) -> List[Dict]:
+    """Fetch one league's scoreboard and extract its (newly) completed events."""
+    if delta is not None:
+        return delta.fetch(league_key, league_config)
+    scoreboard = fetch_espn_scoreboard(league_config['scoreboard_url'])
+    if not scoreboard:
+        print(f"      ⏭️ No scoreboard data for {league_key}")
+        return []
+    return extract_league_events(scoreboard, league_key, league_config)
 
-        # 6. Title dedup against published_articles
-        if is_title_duplicate(supabase, generated['title']):
-            print(f"      ⏭️ Title duplicate: {generated['title'][:60]}")
-            track_processed_event(supabase, event, None)
-            continue
 
-        # 7. Detect countries
-        countries, country_relevance = detect_countries(
-            league_key, event['results'], event_name, league_config
-        )
+def generate_and_publish(supabase, league_key: str, league_config: Dict, event: Dict,
+                         image_url: Optional[str], gemini_key: str,
+                         title_index: TitleIndex) -> Tuple[bool, Optional[int]]:
+    """
+    Generate, dedup and publish one event.
 
-        # 8. Publish
-        article_id = publish_sports_article(
-            supabase, league_config, event, generated, image_url,
-            countries, country_relevance
-        )
+    Returns:
+        (attempted, article_id): attempted is False only if nothing was done
+    """
+    event_name = event['event_name']
 
-        if article_id:
-            print(f"      ✅ Published article #{article_id}: {generated['title'][:60]}")
-            published += 1
+    # Generate article with Gemini
+    print(f"      ✍️ [{league_key}] Generating article for: {event_name[:60]}...")
+    generated = generate_article_with_gemini(
+        sport=league_key,
+        event_name=event_name,
+        results=event['results'],
+        event_date=event.get('event_date', ''),
+        gemini_key=gemini_key,
+    )
 
-        # 9. Track
-        track_processed_event(supabase, event, article_id)
+    if not generated:
+        print(f"      ❌ [{league_key}] Gemini generation failed for {event_name[:60]}")
+        return True, None
 
-        # Rate limit between articles
-        time.sleep(1)
+    # Title dedup against published_articles (and this run's articles)
+    if not title_index.claim(generated['title']):
+        print(f"      ⏭️ [{league_key}] Title duplicate: {generated['title'][:60]}")
+        return True, None
 
-    return published
+    # Detect countries
+    countries, country_relevance = detect_countries(
+        league_key, event['results'], event_name, league_config
+    )
+
+    # Publish
+    article_id = publish_sports_article(
+        supabase, league_config, event, generated, image_url,
+        countries, country_relevance
+    )
+    if article_id:
+        print(f"      ✅ [{league_key}] Published article #{article_id}: {generated['title'][:60]}")
+    return True, article_id
+
+
+def poll_leagues(supabase, leagues: Dict[str, Dict], gemini_key: str,
+                 delta: Optional[ScoreboardDelta] = None) -> Dict[str, int]:
+    """
+    Poll `leagues` and publish any new completed events.
+
+    Scoreboards (and then news images) are fetched in parallel; unchanged
+    scoreboards are skipped via `delta`; processed event IDs are resolved
+    with one bulk query; articles are generated concurrently against a
+    shared title index; tracking is written in bulk.
+
+    Returns:
+        Dict of league_key -> articles published
+    """
+    per_league = {league_key: 0 for league_key in leagues}
+    if not leagues:
+        return per_league
+    delta = delta or ScoreboardDelta(supabase)
+    failed = set()  # Leagues whose scoreboard state must not become the baseline
+
+    # 1. Fetch all scoreboards in parallel and extract newly completed events
+    with ThreadPoolExecutor(max_workers=min(SCOREBOARD_FETCH_WORKERS, len(leagues))) as executor:
+        futures = {key: executor.submit(fetch_league_events, key, cfg, delta) for key, cfg in leagues.items()}
+    league_events = {}
+    for key, future in futures.items():
+        try:
+            league_events[key] = future.result()
+        except Exception as e:
+            print(f"   ❌ Error polling {key}: {e}")
+            league_events[key] = []
+            failed.add(key)
+
+    # 2. Bulk dedup against the tracking table
+    all_ids = [e['event_id'] for events in league_events.values() for e in events]
+    processed = get_processed_event_ids(supabase, all_ids)
+    seen = set(processed)
+    pending = {}
+    for key, events in league_events.items():
+        new_events = []
+        for event in events:
+            if event['event_id'] not in seen:
+                seen.add(event['event_id'])
+                new_events.append(event)
+        if new_events:
+            pending[key] = new_events
+        if events:
+            print(f"   🏟️ {key.upper()}: {len(events)} newly completed, {len(new_events)} unprocessed")
+
+    if not pending:
+        delta.commit(set(leagues) - failed)
+        delta.save()
+        delta.print_summary()
+        return per_league
+
+    # 3. News images for leagues with new events (shared across a league's events)
+    with ThreadPoolExecutor(max_workers=min(SCOREBOARD_FETCH_WORKERS, len(pending))) as executor:
+        image_futures = {key: executor.submit(fetch_espn_news_image, leagues[key]['news_url']) for key in pending}
+    images = {key: future.result() for key, future in image_futures.items()}
+
+    # 4. Generate + publish concurrently
+    title_index = TitleIndex.load(supabase)
+    jobs = [(key, event) for key, events in pending.items() for event in events]
+    tracked = []
+    with ThreadPoolExecutor(max_workers=GENERATION_WORKERS) as executor:
+        futures = [
+            (key, event, executor.submit(generate_and_publish, supabase, key, leagues[key], event,
+                                         images[key], gemini_key, title_index))
+            for key, event in jobs
+        ]
+        for key, event, future in futures:
+            try:
+                attempted, article_id = future.result()
+            except Exception as e:
+                print(f"   ❌ Error publishing {event['event_name'][:60]}: {e}")
+                failed.add(key)
+                continue
+            if attempted:
+                tracked.append((event, article_id))
+            if article_id:
+                per_league[key] += 1
+
+    # 5. Track, then advance the scoreboard baseline of fully handled leagues
+    track_processed_events(supabase, tracked)
+    delta.commit(set(leagues) - failed)
+    delta.save()
+    delta.print_summary()
+    return per_league
+
+
+def poll_league(supabase, league_key: str, league_config: Dict, gemini_key: str) -> int:
+    """Poll a single league and publish any new completed events. Returns count published."""
+    return poll_leagues(supabase, {league_key: league_config}, gemini_key)[league_key]
 
 
 def run_sports_poller() -> Dict:
@@ -1254,6 +1594,7 @@ def run_sports_poller() -> Dict:
     print(f"Leagues: {', '.join(ALL_LEAGUES.keys())}")
 
     stats = {'total_published': 0, 'per_league': {}}
+    started = time.time()
 
     try:
         supabase = get_supabase_client()
@@ -1265,20 +1606,11 @@ def run_sports_poller() -> Dict:
     # Ensure tracking table exists
     ensure_tracking_table(supabase)
 
-    for league_key, league_config in ALL_LEAGUES.items():
-        try:
-            count = poll_league(supabase, league_key, league_config, gemini_key)
-            stats['per_league'][league_key] = count
-            stats['total_published'] += count
-        except Exception as e:
-            print(f"   ❌ Error polling {league_key}: {e}")
-            stats['per_league'][league_key] = 0
-
-        # Rate limit between leagues
-        time.sleep(1)
+    stats['per_league'] = poll_leagues(supabase, ALL_LEAGUES, gemini_key)
+    stats['total_published'] = sum(stats['per_league'].values())
 
     print(f"\n{'='*60}")
-    print(f"🏟️ SPORTS POLLER COMPLETE — Published {stats['total_published']} articles")
+    print(f"🏟️ SPORTS POLLER COMPLETE — Published {stats['total_published']} articles in {time.time() - started:.1f}s")
     for league, count in stats['per_league'].items():
         if count > 0:
             print(f"   • {league.upper()}: {count} article(s)")
@@ -14,11 +14,18 @@ import json
 import time
 import random
 from typing import List, Dict, Optional
-from supabase import create_client, Client
+from supabase import Client
+from supabase_pool import get_supabase_client as get_shared_supabase_client
 from dotenv import load_dotenv
 
+from llm_gateway import get_gateway
+
 load_dotenv()
 
+# Rescoring / backfill reruns with the same article + references reuse the answer
+SCORING_CACHE_TTL_S = 3 * 24 * 3600
+INTEREST_TAGS_CACHE_TTL_S = 30 * 24 * 3600
+
 SCORING_SYSTEM_PROMPT_V18 = """# NEWS SCORING SYSTEM V18
 
 You are a news editor scoring articles for a global news app. Score each article from **0 to 1000**.
@@ -354,10 +361,8 @@ Return ONLY a JSON object with the score, relevance, and freshness:
 
 
 def get_supabase_client() -> Client:
-    """Get Supabase client"""
-    url = os.getenv('NEXT_PUBLIC_SUPABASE_URL') or os.getenv('SUPABASE_URL')
-    key = os.getenv('SUPABASE_SERVICE_KEY') or os.getenv('SUPABASE_KEY')
-    return create_client(url, key)
+    """Get the shared Supabase client"""
+    return get_shared_supabase_client()
 
 
 def get_reference_articles(supabase: Client, limit: int = 100) -> List[Dict]:
@@ -791,7 +796,8 @@ Both deserve visibility. Score accordingly.
     # Retry logic
     for attempt in range(max_retries):
         try:
-            response = requests.post(url, json=request_data, timeout=60)
+            response = get_gateway().post(url, json=request_data, timeout=60, stage='publish', max_retries=0,
+                                          cache_ttl_s=SCORING_CACHE_TTL_S, cache_refresh=attempt > 0)
 
             if response.status_code == 429:
                 wait_time = (2 ** attempt) * 15
@@ -1022,7 +1028,8 @@ def generate_interest_tags(
     
     for attempt in range(max_retries):
         try:
-            response = requests.post(url, json=payload, timeout=15)
+            response = get_gateway().post(url, json=payload, timeout=15, stage='publish', max_retries=0,
+                                          cache_ttl_s=INTEREST_TAGS_CACHE_TTL_S, cache_refresh=attempt > 0)
             
             if response.status_code == 200:
                 data = response.json()
@@ -11,6 +11,7 @@ Algorithm: Gemini embeddings + cosine similarity (threshold 0.87 - strict for ac
 import re
 import os
 import time
+import base64
 import numpy as np
 import requests
 from typing import List, Dict, Optional, Set, Tuple, Union
@@ -18,12 +19,15 @@ from datetime import datetime, timedelta
 from difflib import SequenceMatcher
 from collections import Counter
 from urllib.parse import urlparse, parse_qs, urlunparse
-from supabase import create_client, Client
+from supabase import Client
+from supabase_pool import get_supabase_client as get_shared_supabase_client
 from dotenv import load_dotenv
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import threading
 import google.generativeai as genai
 
+from llm_gateway import get_gateway
+
 load_dotenv()
 
 # ==========================================
@@ -697,10 +701,46 @@ def cosine_similarity(vec1: List[float], vec2: List[float]) -> float:
     return dot_product / (norm_a * norm_b)
 
 
+# ==========================================
+# COMPACT CENTROID STORAGE
+# ==========================================
+# Cluster centroids are stored in clusters.centroid as base64-encoded float16
+# bytes (~8KB for 3072 dims) instead of a 3072-element JSON array of float64
+# (~60KB). See migrations/076_cluster_centroid_state.sql.
+
+CENTROID_DTYPE = np.float16
+
+
+def encode_centroid(vec) -> str:
+    """Encode a centroid vector as base64 float16 bytes."""
+    return base64.b64encode(np.asarray(vec, dtype=CENTROID_DTYPE).tobytes()).decode('ascii')
+
+
+def decode_centroid(data: Optional[str], expected_dim: int) -> Optional[np.ndarray]:
+    """
+    Decode a centroid stored by encode_centroid().
+    
+    Returns:
+        float32 numpy array, or None if missing or of the wrong dimension
+    """
+    if not data:
+        return None
+    try:
+        vec = np.frombuffer(base64.b64decode(data), dtype=CENTROID_DTYPE)
+    except Exception:
+        return None
+    if vec.shape[0] != expected_dim:
+        return None
+    return vec.astype(np.float32)
+
+
 # ==========================================
 # GEMINI CLIENT FOR CLUSTER VALIDATION
 # ==========================================
 
+CLUSTER_QUERY_CACHE_TTL_S = 24 * 3600
+
+
 def _gemini_cluster_query(prompt: str, max_tokens: int = 200) -> str:
     """Send a clustering query to Gemini 2.0 Flash and return the text response."""
     api_key = os.getenv('GEMINI_API_KEY')
@@ -714,7 +754,9 @@ def _gemini_cluster_query(prompt: str, max_tokens: int = 200) -> str:
             "maxOutputTokens": max_tokens,
         }
     }
-    response = requests.post(url, json=request_data, timeout=30)
+    # Temperature 0 yes/no checks: identical prompts get identical answers
+    response = get_gateway().post(url, json=request_data, timeout=30, stage='step1_5_clustering',
+                                  max_retries=0, cache_ttl_s=CLUSTER_QUERY_CACHE_TTL_S)
     response.raise_for_status()
     result = response.json()
     return result['candidates'][0]['content']['parts'][0]['text'].strip()
@@ -741,6 +783,14 @@ class ClusteringConfig:
     KEYWORD_MATCH_THRESHOLD = 3       # Shared keywords needed for moderate match
     ENTITY_MATCH_THRESHOLD = 2        # Shared entities needed for entity match
     
+    # Centroid state
+    EMBEDDING_DIM = 3072  # gemini-embedding-001 output dimension (old text-embedding-004 was 768)
+    CLUSTER_STATE_COLUMNS = (
+        'id, event_name, main_title, created_at, last_updated_at, '
+        'source_count, importance_score, status, centroid'
+    )
+    CENTROID_WRITE_BATCH = 200  # Rows per update_cluster_centroids RPC call
+    
     # Time windows
     MAX_CLUSTER_AGE_HOURS = 336  # Only match with clusters updated in last 336h (14 days)
     MAX_ARTICLE_AGE_HOURS = 48  # Only process articles from last 48h
@@ -1268,14 +1318,8 @@ def is_same_event(article: Dict, cluster: Dict, cluster_sources: List[Dict], deb
 # ==========================================
 
 def get_supabase_client() -> Client:
-    """Get Supabase client instance"""
-    url = os.getenv('SUPABASE_URL')
-    key = os.getenv('SUPABASE_SERVICE_KEY')
-    
-    if not url or not key:
-        raise ValueError("SUPABASE_URL and SUPABASE_SERVICE_KEY must be set in environment")
-    
-    return create_client(url, key)
+    """Get the shared Supabase client instance"""
+    return get_shared_supabase_client()
 
 
 # ==========================================
@@ -1392,10 +1436,14 @@ class EventClusteringEngine:
         
         return None
     
-    def get_active_clusters(self) -> List[Dict]:
+    def get_active_clusters(self, columns: str = '*') -> List[Dict]:
         """
         Get all active clusters (not closed, updated within 24 hours).
 
+        Args:
+            columns: Column projection (pass CLUSTER_STATE_COLUMNS to skip
+                     the legacy JSON embedding and other unused columns)
+
         Returns:
             List of cluster dicts
         """
@@ -1403,7 +1451,7 @@ class EventClusteringEngine:
             # Get clusters updated in last 24 hours
             cutoff_time = datetime.utcnow() - timedelta(hours=self.config.MAX_CLUSTER_AGE_HOURS)
 
-            result = self.supabase.table('clusters').select('*').eq(
+            result = self.supabase.table('clusters').select(columns).eq(
                 'status', 'active'
             ).gte(
                 'last_updated_at', cutoff_time.isoformat()
@@ -1419,13 +1467,13 @@ class EventClusteringEngine:
         """
         Get recently published clusters (last 24h) for cross-cycle dedup.
         Uses publish_status column (not status, which stays 'active' forever).
-        Only fetches id, main_title, event_name, and embedding to save bandwidth.
+        Only fetches id, main_title, event_name, and compact centroid to save bandwidth.
         """
         try:
             cutoff_time = datetime.utcnow() - timedelta(hours=self.config.MAX_CLUSTER_AGE_HOURS)
 
             result = self.supabase.table('clusters').select(
-                'id, main_title, event_name, embedding, last_updated_at'
+                'id, main_title, event_name, centroid, last_updated_at'
             ).eq(
                 'publish_status', 'published'
             ).gte(
@@ -1438,6 +1486,90 @@ class EventClusteringEngine:
             print(f"❌ Error getting published clusters: {e}")
             return []
     
+    def load_cluster_centroids(self, clusters: List[Dict]) -> Dict[int, np.ndarray]:
+        """
+        Decode compact centroids for a list of cluster rows.
+        
+        Clusters written before the centroid column existed only have the
+        legacy JSON `embedding`; those are fetched in bulk (id + embedding
+        only) for just the missing IDs. Anything still missing or of the
+        wrong dimension is left out so the caller can re-embed it.
+        
+        Args:
+            clusters: Cluster rows containing at least id and centroid
+            
+        Returns:
+            Dict mapping cluster_id -> float32 centroid
+        """
+        dim = self.config.EMBEDDING_DIM
+        centroids = {}
+        missing_ids = []
+        
+        for cluster in clusters:
+            vec = decode_centroid(cluster.get('centroid'), dim)
+            if vec is not None:
+                centroids[cluster['id']] = vec
+            else:
+                missing_ids.append(cluster['id'])
+        
+        # Legacy JSON fallback, chunked to keep the IN filter URL short
+        for start in range(0, len(missing_ids), 100):
+            chunk = missing_ids[start:start + 100]
+            try:
+                result = self.supabase.table('clusters').select(
+                    'id, embedding'
+                ).in_('id', chunk).not_.is_('embedding', 'null').execute()
+            except Exception as e:
+                print(f"   ⚠️ Legacy embedding fetch failed: {e}")
+                continue
+            for row in (result.data or []):
+                emb = row.get('embedding')
+                if isinstance(emb, list) and len(emb) == dim:
+                    centroids[row['id']] = np.array(emb, dtype=np.float32)
+        
+        return centroids
+    
+    def save_cluster_centroids(self, rows: List[Dict]) -> int:
+        """
+        Persist centroid state for many clusters in batched writes.
+        
+        Each row is {'id', 'centroid' (vector), 'source_count',
+        'last_updated_at' (optional, None leaves it unchanged)}. Uses the
+        update_cluster_centroids RPC (one set-based UPDATE per batch);
+        falls back to per-row updates if the RPC is not deployed.
+        
+        Returns:
+            Number of clusters written
+        """
+        if not rows:
+            return 0
+        
+        payload = [{
+            'id': row['id'],
+            'centroid': encode_centroid(row['centroid']),
+            'source_count': row.get('source_count'),
+            'last_updated_at': row.get('last_updated_at'),
+        } for row in rows]
+        
+        written = 0
+        batch_size = self.config.CENTROID_WRITE_BATCH
+        for start in range(0, len(payload), batch_size):
+            batch = payload[start:start + batch_size]
+            try:
+                result = self.supabase.rpc('update_cluster_centroids', {'p_rows': batch}).execute()
+                written += result.data if isinstance(result.data, int) else len(batch)
+            except Exception as e:
+                print(f"   ⚠️ Batched centroid write failed ({str(e)[:80]}), falling back to per-row updates")
+                for item in batch:
+                    update_data = {k: v for k, v in item.items() if k != 'id' and v is not None}
+                    try:
+                        self.supabase.table('clusters').update(update_data).eq('id', item['id']).execute()
+                        written += 1
+                    except Exception as row_err:
+                        print(f"   ⚠️ Centroid write failed for cluster {item['id']}: {row_err}")
+        
+        return written
+    
     def get_cluster_sources(self, cluster_id: int) -> List[Dict]:
         """
         Get all source articles for a cluster.
@@ -1504,7 +1636,7 @@ class EventClusteringEngine:
         Args:
             article: Article dict
             source_article_id: ID of the source article in database
-            embedding: Optional embedding vector to cache in database
+            embedding: Optional embedding vector, stored as the initial centroid
             
         Returns:
             Cluster ID if successful, None if failed
@@ -1530,25 +1662,22 @@ class EventClusteringEngine:
                 (hasattr(embedding, '__len__') and len(embedding) > 0)
             )
             
-            # Try with embedding first, fall back without if column doesn't exist
+            # Try with centroid first, fall back without if column doesn't exist
             if has_embedding:
-                # Convert numpy array to list if needed
-                if hasattr(embedding, 'tolist'):
-                    embedding = embedding.tolist()
-                cluster_data['embedding'] = embedding
+                cluster_data['centroid'] = encode_centroid(embedding)
                 try:
                     result = self.supabase.table('clusters').insert(cluster_data).execute()
                 except Exception as embed_err:
-                    if 'embedding' in str(embed_err):
-                        # Embedding column doesn't exist yet, try without it
-                        print(f"   ⚠️ Embedding column not found, creating cluster without caching")
-                        del cluster_data['embedding']
+                    if 'centroid' in str(embed_err):
+                        # Centroid column doesn't exist yet, try without it
+                        print(f"   ⚠️ Centroid column not found, creating cluster without caching")
+                        del cluster_data['centroid']
                         result = self.supabase.table('clusters').insert(cluster_data).execute()
                     else:
-                        # Try without embedding as fallback
-                        print(f"   ⚠️ Embedding insert failed ({str(embed_err)[:80]}), trying without embedding")
-                        if 'embedding' in cluster_data:
-                            del cluster_data['embedding']
+                        # Try without centroid as fallback
+                        print(f"   ⚠️ Centroid insert failed ({str(embed_err)[:80]}), trying without centroid")
+                        if 'centroid' in cluster_data:
+                            del cluster_data['centroid']
                         result = self.supabase.table('clusters').insert(cluster_data).execute()
             else:
                 result = self.supabase.table('clusters').insert(cluster_data).execute()
@@ -1569,42 +1698,19 @@ class EventClusteringEngine:
             print(f"❌ Error creating cluster: {e}")
             return None
     
-    def add_to_cluster(self, cluster_id: int, source_article_id: int,
-                       new_centroid=None) -> bool:
+    def assign_source_to_cluster(self, cluster_id: int, source_article_id: int) -> bool:
         """
-        Add a source article to an existing cluster and update centroid.
-
-        Args:
-            cluster_id: Cluster ID
-            source_article_id: Source article ID
-            new_centroid: Updated centroid numpy array (caller computes the average)
-
+        Point a source article at a cluster without touching cluster state.
+        cluster_articles() batches the centroid/source_count writes itself.
+        
         Returns:
             True if successful
         """
         try:
-            # Update source article's cluster_id
             self.supabase.table('source_articles').update({
                 'cluster_id': cluster_id
             }).eq('id', source_article_id).execute()
-
-            # Update cluster's last_updated_at, centroid, and source_count
-            # Fetch current source_count to increment it accurately
-            current = self.supabase.table('clusters').select('source_count').eq('id', cluster_id).execute()
-            current_count = (current.data[0].get('source_count', 1) if current.data else 1) or 1
-
-            update_data = {
-                'last_updated_at': datetime.utcnow().isoformat(),
-                'source_count': current_count + 1
-            }
-            if new_centroid is not None:
-                centroid_list = new_centroid.tolist() if hasattr(new_centroid, 'tolist') else list(new_centroid)
-                update_data['embedding'] = centroid_list
-
-            self.supabase.table('clusters').update(update_data).eq('id', cluster_id).execute()
-
             return True
-
         except Exception as e:
             print(f"❌ Error adding to cluster: {e}")
             return False
@@ -1672,8 +1778,8 @@ class EventClusteringEngine:
         # Thread-safe lock for stats and active_clusters
         stats_lock = threading.Lock()
         
-        # Get active clusters
-        active_clusters = self.get_active_clusters()
+        # Get active clusters (projected: compact centroid, no JSON embedding)
+        active_clusters = self.get_active_clusters(self.config.CLUSTER_STATE_COLUMNS)
         print(f"📊 Found {len(active_clusters)} active clusters")
 
         # Load recently published clusters for cross-cycle dedup
@@ -1775,35 +1881,21 @@ class EventClusteringEngine:
             if (batch_end) % 100 == 0 or batch_end == len(valid_articles):
                 print(f"   ✓ Embedded {batch_end}/{len(valid_articles)} articles")
         
-        # Use CACHED embeddings from database, only generate for clusters without them
-        # NOTE: gemini-embedding-001 produces 3072-dim vectors. Old text-embedding-004 produced 768-dim.
-        # Discard any cached embeddings with wrong dimensions.
-        EXPECTED_EMBEDDING_DIM = 3072  # gemini-embedding-001 output dimension
-        
-        print(f"   📁 Loading cached cluster embeddings...")
-        cluster_embeddings = {}
-        clusters_needing_embedding = []
-        stale_cache_count = 0
-        
-        # First, load cached embeddings from active_clusters
-        for cluster_id, title in cluster_titles_cache:
-            # Find this cluster in active_clusters to check for cached embedding
-            cluster_data = next((c for c in active_clusters if c['id'] == cluster_id), None)
-            if cluster_data and cluster_data.get('embedding'):
-                cached_emb = cluster_data['embedding']
-                # Check dimension matches current model
-                if isinstance(cached_emb, list) and len(cached_emb) == EXPECTED_EMBEDDING_DIM:
-                    cluster_embeddings[cluster_id] = cached_emb
-                else:
-                    # Stale embedding from old model - regenerate
-                    clusters_needing_embedding.append((cluster_id, title))
-                    stale_cache_count += 1
-            else:
-                # Need to generate embedding for this cluster
-                clusters_needing_embedding.append((cluster_id, title))
-        
-        if stale_cache_count > 0:
-            print(f"   ⚠️ Found {stale_cache_count} stale embeddings (wrong dimension) - regenerating")
+        # Use CACHED centroids from database, only generate for clusters without them.
+        # Centroids with the wrong dimension (old text-embedding-004) are discarded.
+        print(f"   📁 Loading cached cluster centroids...")
+        cluster_embeddings = self.load_cluster_centroids(active_clusters)
+        clusters_needing_embedding = [
+            (cluster_id, title) for cluster_id, title in cluster_titles_cache
+            if cluster_id not in cluster_embeddings
+        ]
+        # Centroids that must be written back at the end of the cycle.
+        # Clusters served from the legacy JSON column are migrated on the way.
+        dirty_centroids = {
+            c['id'] for c in active_clusters
+            if c['id'] in cluster_embeddings and not c.get('centroid')
+        }
+        touched_clusters = set()
         
         cached_count = len(cluster_embeddings)
         need_gen_count = len(clusters_needing_embedding)
@@ -1813,18 +1905,12 @@ class EventClusteringEngine:
             titles_to_embed = [title for _, title in clusters_needing_embedding]
             new_embeddings = get_embeddings_batch(titles_to_embed)
             
-            # Store new embeddings and save to database
             for (cluster_id, title), emb in zip(clusters_needing_embedding, new_embeddings):
-                cluster_embeddings[cluster_id] = emb
-                # Save embedding to database for future caching
-                try:
-                    self.supabase.table('clusters').update({
-                        'embedding': emb
-                    }).eq('id', cluster_id).execute()
-                except Exception as e:
-                    pass  # Non-critical, continue even if save fails
+                if emb is not None:
+                    cluster_embeddings[cluster_id] = np.array(emb, dtype=np.float32)
+                    dirty_centroids.add(cluster_id)
         else:
-            print(f"   📁 All {cached_count} cluster embeddings loaded from cache!")
+            print(f"   📁 All {cached_count} cluster centroids loaded from cache!")
         
         print(f"✅ Embeddings ready ({cached_count} cached, {need_gen_count} generated)\n")
 
@@ -1842,16 +1928,11 @@ class EventClusteringEngine:
             cid = cluster['id']
             emb = cluster_embeddings.get(cid)
             if emb is not None:
-                cluster_centroids[cid] = np.array(emb, dtype=np.float64)
-            cluster_counts[cid] = max(cluster.get('source_count', 1), 1)
+                cluster_centroids[cid] = emb
+            cluster_counts[cid] = max(cluster.get('source_count') or 1, 1)
 
         # Build published cluster centroids for cross-cycle dedup
-        published_centroids = {}
-        for cluster in published_clusters:
-            cid = cluster['id']
-            emb = cluster.get('embedding')
-            if emb and isinstance(emb, list) and len(emb) == EXPECTED_EMBEDDING_DIM:
-                published_centroids[cid] = np.array(emb, dtype=np.float64)
+        published_centroids = self.load_cluster_centroids(published_clusters)
         print(f"   📊 {len(published_centroids)} published cluster centroids loaded for cross-cycle dedup")
 
         threshold = self.config.EMBEDDING_SIMILARITY_THRESHOLD
@@ -1889,7 +1970,7 @@ class EventClusteringEngine:
                         stats['failed'] += 1
                 continue
 
-            article_emb_np = np.array(article_emb, dtype=np.float64)
+            article_emb_np = np.array(article_emb, dtype=np.float32)
 
             # Find best matching cluster by cosine similarity to centroid
             best_cluster_id = None
@@ -1918,9 +1999,11 @@ class EventClusteringEngine:
                 old_count = cluster_counts[best_cluster_id]
                 new_centroid = (cluster_centroids[best_cluster_id] * old_count + article_emb_np) / (old_count + 1)
 
-                if self.add_to_cluster(best_cluster_id, source_id, new_centroid=new_centroid):
+                if self.assign_source_to_cluster(best_cluster_id, source_id):
                     cluster_centroids[best_cluster_id] = new_centroid
                     cluster_counts[best_cluster_id] = old_count + 1
+                    dirty_centroids.add(best_cluster_id)
+                    touched_clusters.add(best_cluster_id)
 
                     cluster_name = next((c.get('event_name', '') for c in active_clusters if c['id'] == best_cluster_id), '')
                     print(f"\n   ✅ MATCHED [{i+1}/{len(articles)}] (sim: {best_similarity:.3f})")
@@ -2032,9 +2115,11 @@ class EventClusteringEngine:
                 if soft_match_id is not None:
                     old_count = cluster_counts[soft_match_id]
                     new_centroid = (cluster_centroids[soft_match_id] * old_count + article_emb_np) / (old_count + 1)
-                    if self.add_to_cluster(soft_match_id, source_id, new_centroid=new_centroid):
+                    if self.assign_source_to_cluster(soft_match_id, source_id):
                         cluster_centroids[soft_match_id] = new_centroid
                         cluster_counts[soft_match_id] = old_count + 1
+                        dirty_centroids.add(soft_match_id)
+                        touched_clusters.add(soft_match_id)
                         cluster_name = next((c.get('event_name', '') for c in active_clusters if c['id'] == soft_match_id), '')
                         print(f"      🔗 SOFT-MATCHED (title: {soft_match_sim:.2f} emb) → Cluster {soft_match_id}: {cluster_name}")
                         with stats_lock:
@@ -2089,6 +2174,18 @@ class EventClusteringEngine:
                 with stats_lock:
                     stats['failed'] += 1
 
+        # Persist incremental centroid updates in batched writes
+        if dirty_centroids:
+            now_iso = datetime.utcnow().isoformat()
+            rows = [{
+                'id': cid,
+                'centroid': cluster_centroids.get(cid, cluster_embeddings.get(cid)),
+                'source_count': cluster_counts.get(cid),
+                'last_updated_at': now_iso if cid in touched_clusters else None,
+            } for cid in dirty_centroids]
+            written = self.save_cluster_centroids(rows)
+            print(f"\n   💾 Saved {written}/{len(rows)} cluster centroids (batched)")
+
         # Print summary
         print(f"\n{'='*60}")
         print(f"CLUSTERING COMPLETE (CENTROID-BASED v3.0)")
@@ -10,11 +10,19 @@ Output: Approved articles (with category) or eliminated articles
 
 import requests
 import json
-import time
 import re
+import time
 from datetime import datetime, timezone
 from typing import List, Dict
 
+from llm_gateway import get_gateway
+
+# Re-scored batches (retries, local re-runs) reuse the earlier scores
+SCORING_CACHE_TTL_S = 6 * 3600
+# Step 0 already marked these articles processed, so a throttled batch waits
+# (30s, 60s, 120s, 240s) instead of being eliminated once the gateway gives up
+THROTTLE_BACKOFF_S = 30
+
 def _fix_truncated_json(json_text: str) -> Dict:
     """
     Fix truncated JSON responses from Gemini API
@@ -100,10 +108,7 @@ def score_news_articles_step1(articles: List[Dict], api_key: str, batch_size: in
                 batch_result = _process_batch(batch, url, api_key, max_retries)
                 all_approved.extend(batch_result['approved'])
                 all_filtered.extend(batch_result['filtered'])
-                
-                # Delay between batches to avoid rate limits (except for last batch)
-                if i + batch_size < len(articles):
-                    time.sleep(4)  # 4 second delay between batches (Gemini Flash handles high RPM)
+                # No fixed delay between batches: the LLM gateway paces calls
                     
             except Exception as e:
                 print(f"  ❌ Batch {batch_num} failed: {e}")
@@ -515,19 +520,23 @@ If yes → APPROVE it.
     # Retry logic for rate limiting
     for attempt in range(max_retries):
         try:
-            # Make API request
-            response = requests.post(url, json=request_data, timeout=120)
+            # Make API request (gateway retries 429/5xx within the cycle's retry budget)
+            response = get_gateway().post(url, json=request_data, timeout=120,
+                                          stage='step1_scoring', max_retries=max_retries - 1,
+                                          cache_ttl_s=SCORING_CACHE_TTL_S, cache_refresh=attempt > 0)
             
-            # Handle rate limiting (429) with exponential backoff
             if response.status_code == 429:
-                wait_time = (2 ** attempt) * 30
                 if attempt < max_retries - 1:
+                    wait_time = (2 ** attempt) * THROTTLE_BACKOFF_S
                     print(f"  ⚠️ Rate limited (429), waiting {wait_time}s before retry {attempt + 1}/{max_retries}...")
                     time.sleep(wait_time)
                     continue
-                else:
-                    print(f"  ❌ Rate limit exceeded after {max_retries} attempts")
-                    raise requests.exceptions.HTTPError(f"429 Too Many Requests after {max_retries} retries")
+                print(f"  ❌ Rate limit exceeded after {max_retries} attempts")
+                for article in articles:
+                    article['category'] = 'Other'
+                    article['score'] = 0
+                    article['status'] = 'ELIMINATED'
+                return {"approved": [], "filtered": articles}
             
             response.raise_for_status()
             
@@ -664,11 +673,7 @@ If yes → APPROVE it.
                 return {"approved": [], "filtered": articles}
             raise
         except requests.exceptions.RequestException as e:
-            if attempt < max_retries - 1:
-                wait_time = (2 ** attempt) * 1
-                print(f"  ⚠️ Request error (attempt {attempt + 1}/{max_retries}): {e}")
-                time.sleep(wait_time)
-                continue
+            # Network errors were already retried by the gateway
             print(f"❌ API request failed after {max_retries} attempts: {e}")
             for article in articles:
                 article['category'] = 'Other'
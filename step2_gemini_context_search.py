@@ -1,8 +1,14 @@
-import requests
 import json
+import math
 import os
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
 from typing import Dict, List, Optional, Tuple
 
+from llm_gateway import get_gateway
+
 
 # ==========================================
 # COMPONENT-SPECIFIC SEARCH PROMPTS
@@ -197,11 +203,271 @@ COMPONENT_PROMPT_MAP = {
 }
 
 
+# ==========================================
+# SEMANTIC RESULT CACHE
+# ==========================================
+# Ongoing stories (wars, tariffs, tournaments) ask near-identical grounded
+# questions cycle after cycle. Results are cached by MiniLM embedding of
+# title + bullets and component set; a request reuses an entry that is
+# similar enough, covers all requested components and is still fresh for
+# each of them. Components that went stale are refreshed with an update
+# query seeded with the cached data; its answer replaces the entry's text
+# (so entries don't grow with every refresh) and the row is updated in place.
+# Entries live in memory for the process and in Supabase
+# (context_search_cache, migration 079) across Cloud Run runs; rows older
+# than max_refresh_age_s can never be reused and are pruned.
+
+@dataclass
+class ContextCacheConfig:
+    """Configuration for the context search cache"""
+    similarity_threshold: float = 0.88
+    # How long each component's grounded data stays usable
+    component_ttl_s: Dict[str, float] = field(default_factory=lambda: {
+        'timeline': 7 * 86400.0,   # Background history barely moves
+        'graph': 3 * 86400.0,
+        'map': 86400.0,
+        'details': 12 * 3600.0,    # Latest figures change fastest
+    })
+    max_refresh_age_s: float = 7 * 86400.0   # Older entries get a full search (and are pruned)
+    refresh_tokens_per_component: int = 768   # The refresh returns the complete updated data
+    max_citations: int = 20
+    memory_entries: int = 256
+    db_match_count: int = 5
+    prune_interval_s: float = 3600.0
+
+
+def context_cache_enabled() -> bool:
+    """CONTEXT_SEARCH_CACHE=0 disables result reuse."""
+    return os.getenv('CONTEXT_SEARCH_CACHE', '1') != '0'
+
+
+def _cosine(a: List[float], b: List[float]) -> float:
+    dot = sum(x * y for x, y in zip(a, b))
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+    return dot / norm if norm else 0.0
+
+
+def _ts_to_epoch(value) -> float:
+    if isinstance(value, (int, float)):
+        return float(value)
+    ts = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+    return (ts if ts.tzinfo else ts.replace(tzinfo=timezone.utc)).timestamp()
+
+
+class ContextSearchCache:
+    """Thread-safe two-level (memory + Supabase) semantic cache of grounded results"""
+
+    def __init__(self, supabase_client=None, config: Optional[ContextCacheConfig] = None):
+        self.supabase = supabase_client
+        self.config = config or ContextCacheConfig()
+        self._entries = []  # Newest last
+        self._lock = threading.Lock()
+        self._last_prune = 0.0
+        self.stats = {'hits': 0, 'refreshes': 0, 'misses': 0}
+
+    def _stale_components(self, entry: Dict, components: List[str], now: float) -> Optional[List[str]]:
+        """Requested components that are stale in `entry` (None if it doesn't cover them)."""
+        fetched = entry.get('component_fetched_at') or {}
+        if any(c not in fetched for c in components):
+            return None
+        return [c for c in components
+                if now - _ts_to_epoch(fetched[c]) > self.config.component_ttl_s.get(c, 86400.0)]
+
+    def lookup(self, embedding: List[float], components: List[str]) -> Optional[Tuple[Dict, List[str]]]:
+        """
+        Best cached entry for a request.
+
+        Returns:
+            (entry, stale components) or None
+        """
+        now = time.time()
+        candidates = []
+        with self._lock:
+            for entry in self._entries:
+                similarity = _cosine(embedding, entry['embedding'])
+                if similarity >= self.config.similarity_threshold:
+                    candidates.append((similarity, entry))
+
+        if not candidates and self.supabase is not None:
+            try:
+                result = self.supabase.rpc('match_context_search_cache', {
+                    'query_embedding': embedding,
+                    'match_count': self.config.db_match_count,
+                    'min_similarity': self.config.similarity_threshold,
+                    'max_age_hours': self.config.max_refresh_age_s / 3600,
+                }).execute()
+                for row in result.data or []:
+                    entry = {
+                        'id': row.get('id'),
+                        'embedding': embedding,  # Close enough to stand in for the stored vector
+                        'results': row['results'],
+                        'citations': row.get('citations') or [],
+                        'component_fetched_at': row.get('component_fetched_at') or {},
+                    }
+                    candidates.append((row.get('similarity', 0.0), entry))
+            except Exception as e:
+                print(f"   ⚠️ Context cache lookup error: {e}")
+
+        best = None
+        for similarity, entry in sorted(candidates, key=lambda c: -c[0]):
+            stale = self._stale_components(entry, components, now)
+            if stale is None:
+                continue
+            if best is None or len(stale) < len(best[1]):
+                best = (entry, stale)
+            if not stale:
+                break
+        if best is not None and any(
+            now - _ts_to_epoch(best[0]['component_fetched_at'][c]) > self.config.max_refresh_age_s for c in best[1]
+        ):
+            best = None
+        return best
+
+    def store(self, embedding: List[float], title: str, results: Dict[str, str],
+              component_fetched_at: Dict[str, float], replaces: Optional[Dict] = None):
+        """Cache a result; `replaces` is the refreshed entry it supersedes."""
+        entry = {
+            'id': replaces.get('id') if replaces else None,
+            'embedding': embedding,
+            'results': results['results'],
+            'citations': results.get('citations', [])[:self.config.max_citations],
+            'component_fetched_at': dict(component_fetched_at),
+        }
+        with self._lock:
+            if replaces is not None:
+                self._entries = [e for e in self._entries if e is not replaces]
+            self._entries.append(entry)
+            if len(self._entries) > self.config.memory_entries:
+                self._entries = self._entries[-self.config.memory_entries:]
+        if self.supabase is None:
+            return
+        row = {
+            'title': title[:300],
+            'components': sorted(component_fetched_at),
+            'embedding_minilm_vec': '[' + ','.join(str(x) for x in embedding) + ']',
+            'results': entry['results'],
+            'citations': entry['citations'],
+            'component_fetched_at': {
+                c: datetime.fromtimestamp(t, timezone.utc).isoformat() for c, t in component_fetched_at.items()
+            },
+        }
+        try:
+            table = self.supabase.table('context_search_cache')
+            if entry['id'] is not None:
+                row['created_at'] = datetime.now(timezone.utc).isoformat()
+                table.update(row).eq('id', entry['id']).execute()
+            else:
+                inserted = table.insert(row).execute()
+                if inserted.data:
+                    entry['id'] = inserted.data[0].get('id')
+        except Exception as e:
+            print(f"   ⚠️ Context cache store error: {e}")
+        self._prune()
+
+    def _prune(self):
+        """Delete rows too old to be reused (at most once per prune_interval_s)."""
+        now = time.time()
+        with self._lock:
+            if now - self._last_prune < self.config.prune_interval_s:
+                return
+            self._last_prune = now
+        cutoff = datetime.fromtimestamp(now - self.config.max_refresh_age_s, timezone.utc).isoformat()
+        try:
+            self.supabase.table('context_search_cache').delete().lt('created_at', cutoff).execute()
+        except Exception as e:
+            print(f"   ⚠️ Context cache prune error: {e}")
+
+    def count(self, key: str):
+        with self._lock:
+            self.stats[key] += 1
+
+
+_context_cache = None
+_context_cache_lock = threading.Lock()
+
+
+def get_context_cache(supabase_client=None) -> ContextSearchCache:
+    """Process-wide cache (attaches a Supabase client the first time one is given)."""
+    global _context_cache
+    with _context_cache_lock:
+        if _context_cache is None:
+            _context_cache = ContextSearchCache(supabase_client)
+        elif _context_cache.supabase is None and supabase_client is not None:
+            _context_cache.supabase = supabase_client
+        return _context_cache
+
+
+def _request_embedding(title: str, summary: str) -> Optional[List[float]]:
+    try:
+        from step1_5_event_clustering import get_embedding_minilm
+        return get_embedding_minilm(f"{title} {summary}")
+    except Exception as e:
+        print(f"   ⚠️ Context cache embedding error: {e}")
+        return None
+
+
+def _call_grounded_search(prompt: str, max_tokens: int, api_key: str) -> Optional[Dict[str, str]]:
+    """One Google-Search-grounded Gemini call. Returns results/citations, or None."""
+    url = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-2.5-flash-lite:generateContent?key={api_key}"
+
+    request_data = {
+        "contents": [
+            {
+                "role": "user",
+                "parts": [{"text": prompt}]
+            }
+        ],
+        "generationConfig": {
+            "temperature": 0.3,
+            "topK": 40,
+            "topP": 0.95,
+            "maxOutputTokens": max_tokens
+        },
+        "tools": [{
+            "google_search": {}
+        }]
+    }
+
+    response = get_gateway().post(url, json=request_data, timeout=60,
+                                  stage='step5_context', max_retries=1)
+    response.raise_for_status()
+    result = response.json()
+
+    # Extract text from response
+    if 'candidates' in result and len(result['candidates']) > 0:
+        candidate = result['candidates'][0]
+        if 'content' in candidate and 'parts' in candidate['content']:
+            response_text = candidate['content']['parts'][0]['text']
+
+            # Extract citations from grounding metadata if available
+            citations = []
+            if 'groundingMetadata' in candidate:
+                grounding = candidate['groundingMetadata']
+                if 'groundingChunks' in grounding:
+                    for chunk in grounding['groundingChunks']:
+                        if 'web' in chunk:
+                            citations.append(chunk['web'].get('uri', ''))
+                elif 'webSearchQueries' in grounding:
+                    citations = ['Google Search']
+
+            if not citations:
+                citations = ['Google Search via Gemini']
+
+            return {
+                'results': response_text,
+                'citations': citations
+            }
+    return None
+
+
 def search_gemini_context(title: str, summary: str, full_text: str = "",
-                          selected_components: Optional[List[str]] = None) -> Dict[str, str]:
+                          selected_components: Optional[List[str]] = None,
+                          embedding: Optional[List[float]] = None,
+                          supabase_client=None) -> Dict[str, str]:
     """
     Search Gemini for contextual facts using Google Search grounding.
     Only searches for the specific components that were selected in Step 6.
+    Near-duplicate requests reuse (or incrementally refresh) cached results.
 
     Args:
         title: Article title from Step 4 synthesis
@@ -209,6 +475,8 @@ def search_gemini_context(title: str, summary: str, full_text: str = "",
         full_text: Full article text (optional)
         selected_components: List of components selected by Step 6 (e.g., ['details', 'timeline']).
                             If None, searches for all components (legacy behavior).
+        embedding: MiniLM embedding of title + summary (computed if omitted)
+        supabase_client: Enables the cross-run cache (memory-only without it)
 
     Returns:
         dict with 'results' and 'citations'
@@ -236,19 +504,71 @@ def search_gemini_context(title: str, summary: str, full_text: str = "",
             'citations': []
         }
 
-    # Use Gemini 2.0 Flash with Google Search grounding
-    url = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-2.5-flash-lite:generateContent?key={api_key}"
-
     # Use full_text if provided, otherwise use summary
     article_text = full_text if full_text else summary
 
+    component_names = ', '.join(c.upper() for c in components_needing_search)
+
+    # Semantic cache: reuse a fresh result, or refresh only its stale components
+    cache = None
+    hit = None
+    if context_cache_enabled():
+        embedding = embedding or _request_embedding(title, summary)
+        if embedding:
+            cache = get_context_cache(supabase_client)
+            hit = cache.lookup(embedding, components_needing_search)
+
+    if hit is not None:
+        entry, stale = hit
+        if not stale:
+            cache.count('hits')
+            print(f"   ♻️  Context search cache hit ({len(entry['results'])} chars, {component_names})")
+            return {
+                'results': entry['results'],
+                'citations': entry['citations']
+            }
+
+        since = min(_ts_to_epoch(entry['component_fetched_at'][c]) for c in stale)
+        since_str = datetime.fromtimestamp(since, timezone.utc).strftime('%B %d, %Y %H:%M UTC')
+        stale_names = ', '.join(c.upper() for c in stale)
+        prompt = f"""You are updating data gathered earlier for a developing news story.
+
+DATA GATHERED AS OF {since_str}:
+{entry['results'][:4000]}
+
+LATEST ARTICLE TITLE: {title}
+LATEST BULLET SUMMARY: {summary}
+
+Return the complete, current data for these components: {component_names}
+Keep facts above that are still accurate, replace anything outdated, and search
+for what is new since {since_str} for: {stale_names}
+Do not describe what changed; write the data as it stands now.
+{chr(10).join(COMPONENT_PROMPT_MAP[comp] for comp in components_needing_search)}"""
+        max_tokens = min(4096, len(components_needing_search) * cache.config.refresh_tokens_per_component)
+        try:
+            update = _call_grounded_search(prompt, max_tokens, api_key)
+        except Exception as e:
+            print(f"   ⚠️ Gemini search refresh error: {e}")
+            update = None
+        if update is not None:
+            cache.count('refreshes')
+            # The rewrite replaces the cached text, so entries stay one result long
+            results = {
+                'results': update['results'],
+                'citations': list(dict.fromkeys(update['citations'] + entry['citations']))[:cache.config.max_citations]
+            }
+            now = time.time()
+            fetched_at = {c: _ts_to_epoch(entry['component_fetched_at'][c]) for c in components_needing_search}
+            fetched_at.update({c: now for c in stale})
+            cache.store(embedding, title, results, fetched_at, replaces=entry)
+            print(f"   ♻️  Context search refreshed {stale_names} ({len(update['results'])} chars)")
+            return results
+
     # Build prompt with ONLY the sections needed
     component_sections = '\n'.join(
         COMPONENT_PROMPT_MAP[comp] for comp in components_needing_search
     )
 
-    component_names = ', '.join(c.upper() for c in components_needing_search)
-
     prompt = f"""You are gathering data for specific news article components.
 
 ARTICLE TITLE: {title}
@@ -263,54 +583,15 @@ Gather information for ONLY these components: {component_names}
     tokens_per_component = 1024
     max_tokens = min(4096, len(components_needing_search) * tokens_per_component)
 
-    request_data = {
-        "contents": [
-            {
-                "role": "user",
-                "parts": [{"text": prompt}]
-            }
-        ],
-        "generationConfig": {
-            "temperature": 0.3,
-            "topK": 40,
-            "topP": 0.95,
-            "maxOutputTokens": max_tokens
-        },
-        "tools": [{
-            "google_search": {}
-        }]
-    }
-
     try:
-        response = requests.post(url, json=request_data, timeout=60)
-        response.raise_for_status()
-        result = response.json()
-
-        # Extract text from response
-        if 'candidates' in result and len(result['candidates']) > 0:
-            candidate = result['candidates'][0]
-            if 'content' in candidate and 'parts' in candidate['content']:
-                response_text = candidate['content']['parts'][0]['text']
-
-                # Extract citations from grounding metadata if available
-                citations = []
-                if 'groundingMetadata' in candidate:
-                    grounding = candidate['groundingMetadata']
-                    if 'groundingChunks' in grounding:
-                        for chunk in grounding['groundingChunks']:
-                            if 'web' in chunk:
-                                citations.append(chunk['web'].get('uri', ''))
-                    elif 'webSearchQueries' in grounding:
-                        citations = ['Google Search']
-
-                if not citations:
-                    citations = ['Google Search via Gemini']
-
-                print(f"   ✅ Gemini context search completed ({len(response_text)} chars, searched: {component_names})")
-                return {
-                    'results': response_text,
-                    'citations': citations
-                }
+        results = _call_grounded_search(prompt, max_tokens, api_key)
+        if results is not None:
+            print(f"   ✅ Gemini context search completed ({len(results['results'])} chars, searched: {component_names})")
+            if cache is not None:
+                cache.count('misses')
+                now = time.time()
+                cache.store(embedding, title, results, {c: now for c in components_needing_search})
+            return results
 
         print("   ⚠️ Empty response from Gemini, using fallback")
         return _get_fallback_context(title, summary)
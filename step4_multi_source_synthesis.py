@@ -17,6 +17,8 @@ from typing import List, Dict, Optional
 from dataclasses import dataclass
 from datetime import datetime
 
+from source_evidence import EvidenceConfig, pack_evidence
+
 
 # ==========================================
 # CONFIGURATION
@@ -316,8 +318,10 @@ def build_synthesis_prompt(cluster: Dict, full_articles: List[Dict]) -> str:
     Returns:
         Formatted prompt string
     """
-    # Sort sources by score (highest first)
+    # Sort sources by score (highest first), then dedup/budget their text
     sorted_sources = sorted(full_articles, key=lambda x: x.get('score', 0), reverse=True)
+    sorted_sources, _ = pack_evidence(sorted_sources, EvidenceConfig(per_source_chars=2000, total_chars=16000),
+                                      field='content')
     
     # Build sources section
     sources_text = ""
@@ -326,12 +330,8 @@ def build_synthesis_prompt(cluster: Dict, full_articles: List[Dict]) -> str:
         score = article.get('score', 0)
         title = article.get('title', 'Unknown')
         
-        # Get content (prefer full content from Step 2, fallback to description)
-        content = article.get('content', article.get('text', article.get('description', '')))
-        
-        # Limit content length to avoid token limits
-        if len(content) > 2000:
-            content = content[:2000] + "..."
+        # Packed evidence (already limited to 2000 chars per source)
+        content = article.get('content', '')
         
         sources_text += f"""
 SOURCE {i} ({source_name}, Score: {score}/1000):
@@ -10,10 +10,14 @@
 
 import google.generativeai as genai
 import json
+import re
+import threading
 import time
 from typing import List, Dict, Optional
 from dataclasses import dataclass
 
+from llm_gateway import get_gateway
+
 
 # ==========================================
 # CONFIGURATION
@@ -32,6 +36,8 @@ class ComponentConfig:
     max_article_preview: int = 2000  # Max chars to send (save tokens)
     retry_attempts: int = 3
     retry_delay: float = 2.0
+    batch_size: int = 8  # Articles classified per request in batched selection
+    batch_max_wait_s: float = 1.0  # How long a worker waits for others to join its batch
 
 
 # ==========================================
@@ -419,6 +425,31 @@ RULES:
 """
 
 
+# Batched selection: same rules, several articles, one JSON object per article.
+# The per-article header (title/bullets) is replaced by a numbered article list.
+_SELECTION_RULES = COMPONENT_SELECTION_PROMPT[COMPONENT_SELECTION_PROMPT.index('═══'):]
+
+BATCH_COMPONENT_SELECTION_PROMPT = """Select components for EACH of the news articles below.
+Judge every article on its own - one article's components must not influence another's.
+
+ARTICLES:
+{articles}
+
+""" + _SELECTION_RULES + """
+═══════════════════════════════════════════════════════════════
+BATCH OUTPUT FORMAT
+═══════════════════════════════════════════════════════════════
+
+Return a JSON array with exactly one object per article, using the
+article's number as "id" and the same fields as above:
+
+[
+  {"id": 1, "components": ["details"], "emoji": "📈", "graph_type": null, "map_locations": null, "article_type": "standard"},
+  {"id": 2, "components": [], "emoji": "⚽", "graph_type": null, "map_locations": null, "article_type": "standard"}
+]
+"""
+
+
 # ==========================================
 # GEMINI COMPONENT SELECTOR CLASS
 # ==========================================
@@ -455,6 +486,18 @@ class GeminiComponentSelector:
             }
         )
         
+        # Batched requests return one selection per article
+        self.batch_model = genai.GenerativeModel(
+            model_name=self.config.model,
+            generation_config={
+                'temperature': self.config.temperature,
+                'top_p': self.config.top_p,
+                'top_k': self.config.top_k,
+                'max_output_tokens': self.config.max_output_tokens * self.config.batch_size,
+                'response_mime_type': 'application/json'
+            }
+        )
+        
         print(f"✓ Initialized Gemini component selector")
         print(f"  Model: {self.config.model}")
         print(f"  Components per article: {self.config.min_components}-{self.config.max_components}")
@@ -496,14 +539,14 @@ class GeminiComponentSelector:
             try:
                 # Send to Gemini
                 chat = self.model.start_chat(history=[])
-                response = chat.send_message(user_prompt)
+                with get_gateway().slot('step6_selection'):
+                    response = chat.send_message(user_prompt)
                 
                 # Parse response
                 # Check if response was blocked by safety filters
                 if not response.text:
                     print(f"  ⚠ Response blocked by safety filters (attempt {attempt + 1}/{self.config.retry_attempts})")
-                    if attempt < self.config.retry_attempts - 1:
-                        time.sleep(self.config.retry_delay)
+                    if attempt < self.config.retry_attempts - 1 and get_gateway().backoff('step6_selection', attempt):
                         continue
                     else:
                         return self._get_fallback_selection(article_title)
@@ -559,8 +602,7 @@ class GeminiComponentSelector:
             
             except json.JSONDecodeError as e:
                 print(f"  ⚠ JSON parse error (attempt {attempt + 1}/{self.config.retry_attempts}): {e}")
-                if attempt < self.config.retry_attempts - 1:
-                    time.sleep(self.config.retry_delay)
+                if attempt < self.config.retry_attempts - 1 and get_gateway().backoff('step6_selection', attempt):
                     continue
                 else:
                     # Return intelligent fallback
@@ -573,8 +615,8 @@ class GeminiComponentSelector:
                 else:
                     print(f"  ✗ Error selecting components (attempt {attempt + 1}/{self.config.retry_attempts}): {e}")
                 
-                if attempt < self.config.retry_attempts - 1:
-                    time.sleep(self.config.retry_delay)
+                throttled = '429' in error_msg or 'ResourceExhausted' in error_msg
+                if attempt < self.config.retry_attempts - 1 and get_gateway().backoff('step6_selection', attempt, throttled=throttled):
                     continue
                 else:
                     return self._get_fallback_selection(article_title)
@@ -723,6 +765,107 @@ class GeminiComponentSelector:
                 'article_type': 'standard'
             }
     
+    def select_components_many(self, articles: List[Dict]) -> List[Dict]:
+        """
+        Select components for several articles with one Gemini request per
+        batch_size articles.
+
+        Each returned selection goes through _validate_and_fix_selection.
+        Articles the batched response leaves out (or returns unusable) are
+        selected one by one with select_components, so every article still
+        gets a selection.
+
+        Args:
+            articles: Dicts with 'title' and 'text' / 'summary_bullets_news'
+
+        Returns:
+            Selections in the same order as articles
+        """
+        if len(articles) == 1:
+            return [self.select_components(articles[0])]
+
+        selections = [None] * len(articles)
+        size = max(self.config.batch_size, 1)
+        for start in range(0, len(articles), size):
+            chunk = articles[start:start + size]
+            for offset, selection in enumerate(self._select_chunk(chunk)):
+                selections[start + offset] = selection
+
+        missing = [i for i, selection in enumerate(selections) if selection is None]
+        if missing:
+            print(f"  ⚠ Batched selection missed {len(missing)}/{len(articles)} articles - selecting individually")
+        for i in missing:
+            selections[i] = self.select_components(articles[i])
+        return selections
+
+    def _select_chunk(self, chunk: List[Dict]) -> List[Optional[Dict]]:
+        """One batched request. Returns a selection or None per article."""
+        lines = []
+        for n, article in enumerate(chunk, 1):
+            bullets = article.get('summary_bullets_news', article.get('summary_bullets', []))
+            if isinstance(bullets, list):
+                bullets_text = ' '.join(bullets)
+            else:
+                bullets_text = str(bullets) if bullets else article.get('text', '')[:500]
+            lines.append(f"[{n}] TITLE: {article.get('title', 'No title')}\n    BULLETS: {bullets_text}")
+
+        user_prompt = BATCH_COMPONENT_SELECTION_PROMPT.replace('{articles}', '\n\n'.join(lines))
+        user_prompt += "\n\nAnalyze and return ONLY a valid JSON array."
+
+        for attempt in range(self.config.retry_attempts):
+            try:
+                with get_gateway().slot('step6_selection'):
+                    response = self.batch_model.generate_content(user_prompt)
+                items = self._parse_batch_response(response.text or '')
+
+                results = [None] * len(chunk)
+                for position, item in enumerate(items):
+                    if not isinstance(item, dict):
+                        continue
+                    try:
+                        idx = int(item.pop('id', position + 1)) - 1
+                    except (TypeError, ValueError):
+                        idx = position
+                    if 0 <= idx < len(chunk) and results[idx] is None and 'components' in item:
+                        results[idx] = self._validate_and_fix_selection(item)
+
+                selected = sum(1 for r in results if r is not None)
+                print(f"  ✓ Batched component selection: {selected}/{len(chunk)} articles in one request")
+                return results
+
+            except Exception as e:
+                error_msg = str(e)
+                print(f"  ⚠ Batched selection failed (attempt {attempt + 1}/{self.config.retry_attempts}): {e}")
+                throttled = '429' in error_msg or 'ResourceExhausted' in error_msg
+                if attempt < self.config.retry_attempts - 1 and get_gateway().backoff('step6_selection', attempt, throttled=throttled):
+                    continue
+                break
+
+        return [None] * len(chunk)
+
+    @staticmethod
+    def _parse_batch_response(result_text: str) -> List:
+        """Extract the JSON array of selections from a batched response."""
+        result_text = result_text.strip()
+        json_match = re.search(r'```(?:json)?\s*([\s\S]*?)\s*```', result_text)
+        if json_match:
+            result_text = json_match.group(1).strip()
+        if not result_text.startswith('['):
+            array_match = re.search(r'\[[\s\S]*\]', result_text)
+            if array_match and not result_text.startswith('{'):
+                result_text = array_match.group(0)
+        result_text = re.sub(r',\s*}', '}', result_text)
+        result_text = re.sub(r',\s*]', ']', result_text)
+
+        result = json.loads(result_text)
+        if isinstance(result, dict):
+            # {"selections": [...]} / {"articles": [...]} wrappers
+            for value in result.values():
+                if isinstance(value, list):
+                    return value
+            return [result]
+        return result if isinstance(result, list) else []
+
     def select_components_batch(self, articles: List[Dict]) -> List[Dict]:
         """
         Select components for multiple articles
@@ -748,17 +891,21 @@ class GeminiComponentSelector:
             'recipe': 0
         }
         
+        valid_articles = []
         for i, article in enumerate(articles, 1):
             # Ensure article is a dictionary
             if not isinstance(article, dict):
                 print(f"✗ Error: Article {i} is not a dictionary: {type(article)}")
                 continue
-                
-            print(f"[{i}/{len(articles)}] Analyzing: {article.get('title', 'No title')[:60]}...", end=' ')
+            valid_articles.append(article)
+        
+        # One request per batch_size articles instead of one per article
+        selections = self.select_components_many(valid_articles) if valid_articles else []
+        
+        for i, (article, selection) in enumerate(zip(valid_articles, selections), 1):
+            print(f"[{i}/{len(valid_articles)}] {article.get('title', 'No title')[:60]}...", end=' ')
             
             try:
-                # Select components
-                selection = self.select_components(article)
                 
                 # Ensure selection is valid
                 if not isinstance(selection, dict) or 'components' not in selection:
@@ -787,10 +934,6 @@ class GeminiComponentSelector:
             except Exception as e:
                 print(f"✗ Error processing article: {e}")
                 continue
-            
-            # Small delay to avoid rate limits
-            if i < len(articles):
-                time.sleep(0.1)
         
         # Print statistics
         print(f"\n{'='*60}")
@@ -810,6 +953,83 @@ class GeminiComponentSelector:
         return results
 
 
+# ==========================================
+# CROSS-CLUSTER MICRO-BATCHING
+# ==========================================
+
+class _PendingSelection:
+    __slots__ = ('article', 'claimed', 'done', 'result')
+
+    def __init__(self, article: Dict):
+        self.article = article
+        self.claimed = False
+        self.done = False
+        self.result = None
+
+
+class SelectionBatcher:
+    """
+    Coalesces select_components calls from concurrent cluster workers into
+    batched requests.
+
+    A worker's article waits up to batch_max_wait_s for other workers to
+    reach Step 6; whichever worker finds a full batch (or its own wait
+    expired) sends the whole batch through select_components_many and hands
+    each worker its own selection. A worker alone at Step 6 pays at most the
+    wait on top of a normal single-article request.
+    """
+
+    def __init__(self, selector: GeminiComponentSelector):
+        self.selector = selector
+        self.batch_size = max(selector.config.batch_size, 1)
+        self.max_wait_s = selector.config.batch_max_wait_s
+        self._cond = threading.Condition()
+        self._pending: List[_PendingSelection] = []
+
+    def select_components(self, article: Dict) -> Dict:
+        """Drop-in replacement for GeminiComponentSelector.select_components."""
+        item = _PendingSelection(article)
+        deadline = time.time() + self.max_wait_s
+        with self._cond:
+            self._pending.append(item)
+            if len(self._pending) >= self.batch_size:
+                self._cond.notify_all()
+
+        while not item.done:
+            batch = self._claim_batch(item, deadline)
+            if batch:
+                self._run_batch(batch)
+
+        if item.result is None:
+            return self.selector.select_components(article)
+        return item.result
+
+    def _claim_batch(self, item: _PendingSelection, deadline: float) -> List[_PendingSelection]:
+        """Wait until item is done or this worker should send a batch."""
+        with self._cond:
+            while not item.done:
+                if not item.claimed and (len(self._pending) >= self.batch_size or time.time() >= deadline):
+                    batch = self._pending[:self.batch_size]
+                    del self._pending[:self.batch_size]
+                    for pending in batch:
+                        pending.claimed = True
+                    return batch
+                self._cond.wait(None if item.claimed else max(deadline - time.time(), 0))
+        return []
+
+    def _run_batch(self, batch: List[_PendingSelection]):
+        try:
+            results = self.selector.select_components_many([p.article for p in batch])
+        except Exception as e:
+            print(f"  ⚠ Batched component selection failed: {e}")
+            results = [None] * len(batch)
+        with self._cond:
+            for pending, result in zip(batch, results):
+                pending.result = result
+                pending.done = True
+            self._cond.notify_all()
+
+
 # ==========================================
 # VALIDATION
 # ==========================================
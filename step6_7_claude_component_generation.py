@@ -10,11 +10,15 @@
 
 import requests
 import json
+import re
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone
 from typing import List, Dict, Optional
 from dataclasses import dataclass
 
+from llm_gateway import get_gateway
+
 
 # ==========================================
 # CONFIGURATION
@@ -30,6 +34,8 @@ class ComponentWriterConfig:
     retry_attempts: int = 3
     retry_delay: float = 2.0
     delay_between_requests: float = 0.3
+    parallel_components: bool = True  # One concurrent request per component (False = one combined request)
+    component_max_tokens: int = 1024  # Per-component request (largest: map / timeline)
 
 
 # ==========================================
@@ -515,6 +521,69 @@ CHECKLIST BEFORE SUBMITTING
 """
 
 
+# Per-component prompts: each component's section of COMPONENT_PROMPT (plus its
+# item from the closing checklist), sent as its own request so components
+# generate concurrently and retry independently.
+COMPONENT_SECTION_TITLES = {
+    'details': '📋 DETAILS',
+    'timeline': '📅 TIMELINE',
+    'map': '🗺️ MAP',
+    'graph': '📊 GRAPH',
+    'scorecard': '🏆 SCORE CARD',
+    'recipe': '🍳 RECIPE CARD',
+}
+
+_RULE = '═' * 63
+
+
+def _split_checklist(prompt: str) -> Dict[str, str]:
+    """Cut the CHECKLIST BEFORE SUBMITTING block into one item per component."""
+    checklist = prompt.split(f"{_RULE}\nCHECKLIST BEFORE SUBMITTING\n{_RULE}", 1)[1]
+    items = {}
+    for item in checklist.split('□ ')[1:]:
+        name = item.split(':', 1)[0].strip().lower()
+        items[name] = '□ ' + item.strip()
+    return items
+
+
+def _split_component_sections(prompt: str) -> Dict[str, str]:
+    """Cut COMPONENT_PROMPT into one instruction block per component."""
+    starts = sorted(
+        (prompt.index(f"{_RULE}\n{title}\n{_RULE}"), name)
+        for name, title in COMPONENT_SECTION_TITLES.items()
+    )
+    end = prompt.index(f"{_RULE}\nFINAL OUTPUT\n{_RULE}")
+    checklist = _split_checklist(prompt)
+    sections = {}
+    for i, (start, name) in enumerate(starts):
+        stop = starts[i + 1][0] if i + 1 < len(starts) else end
+        sections[name] = prompt[start:stop].rstrip()
+        if name in checklist:
+            sections[name] += f"\n\n{_RULE}\nCHECKLIST BEFORE SUBMITTING\n{_RULE}\n\n{checklist[name]}"
+    return sections
+
+
+COMPONENT_SECTIONS = _split_component_sections(COMPONENT_PROMPT)
+
+SINGLE_COMPONENT_PROMPT = """Generate the {component_title} component for this news article.
+
+TODAY'S DATE: {today}
+ARTICLE TITLE: {title}
+BULLET SUMMARY: {bullets}
+SEARCH CONTEXT: {context}
+
+{section}
+
+""" + _RULE + """
+FINAL OUTPUT
+""" + _RULE + """
+
+Return ONLY valid JSON with a single key:
+
+{"{component}": ...}
+"""
+
+
 # ==========================================
 # CLAUDE COMPONENT WRITER CLASS
 # ==========================================
@@ -542,6 +611,10 @@ class GeminiComponentWriter:
         """
         Generate components for a single article
         
+        Each selected component is generated by its own concurrent request
+        with its own validation and retries, so a component that fails is
+        retried alone and the slowest single component bounds latency.
+        
         Args:
             article: Article dict with:
                 - title_news: Article title (for context)
@@ -549,93 +622,84 @@ class GeminiComponentWriter:
                 - context_data: Perplexity search results
         
         Returns:
-            Dict with generated components or None if failed
+            Dict with generated components (only those that succeeded) or None if all failed
         """
-        print(f"   🔧 DEBUG: Starting component generation...")
-        
         # Get selected components
         components = article.get('components', article.get('selected_components', []))
-        print(f"   🔧 DEBUG: Components to generate: {components}")
         
         if not components:
             return {}  # No components selected
         
-        # Build formatted system prompt with article data
-        print(f"   🔧 DEBUG: Building system prompt...")
-        system_prompt = self._build_system_prompt(article, components)
-        print(f"   🔧 DEBUG: System prompt built ({len(system_prompt)} chars)")
+        if not self.config.parallel_components:
+            return self._write_components_combined(article, components)
+        
+        result = {}
+        with ThreadPoolExecutor(max_workers=len(components)) as pool:
+            futures = {pool.submit(self._write_single_component, article, c): c for c in components}
+            for future in as_completed(futures):
+                component = futures[future]
+                try:
+                    value = future.result()
+                except Exception as e:
+                    print(f"   ❌ {component}: {e}")
+                    value = None
+                if value is not None:
+                    result[component] = value
+        
+        failed = [c for c in components if c not in result]
+        if failed:
+            print(f"   ⚠️ Components failed after retries: {failed}")
+        
+        # Keep the selection order
+        return {c: result[c] for c in components if c in result} or None
+    
+    def _write_single_component(self, article: Dict, component: str):
+        """Generate and validate one component. Returns its value or None."""
+        prompt = self._build_component_prompt(article, component)
         
-        # Try up to retry_attempts times
         for attempt in range(self.config.retry_attempts):
             try:
-                print(f"   🔧 DEBUG: Calling Gemini API (attempt {attempt + 1})...")
-                
-                request_data = {
-                    "contents": [
-                        {
-                            "role": "user",
-                            "parts": [{"text": system_prompt + "\n\nGenerate the components now. Return ONLY valid JSON."}]
-                        }
-                    ],
-                    "generationConfig": {
-                        "temperature": self.config.temperature,
-                        "maxOutputTokens": self.config.max_tokens,
-                        "responseMimeType": "application/json"
-                    }
-                }
-                
-                response = requests.post(
-                    self.api_url,
-                    json=request_data,
-                    timeout=self.config.timeout
-                )
+                response = self._post(prompt, self.config.component_max_tokens)
                 
-                # Handle rate limiting
                 if response.status_code == 429:
-                    wait_time = 15 * (attempt + 1)
-                    print(f"   ⚠️ Rate limited, waiting {wait_time}s...")
-                    time.sleep(wait_time)
-                    continue
+                    print(f"   ⚠️ Rate limited after gateway retries - giving up on {component}")
+                    return None
                 
                 response.raise_for_status()
-                result = response.json()
-                
-                # Extract response text from Gemini format
-                if 'candidates' not in result or len(result['candidates']) == 0:
-                    raise Exception("No candidates in Gemini response")
-                
-                response_text = result['candidates'][0]['content']['parts'][0]['text']
-                print(f"   📝 Raw Claude response: {response_text[:300]}...")
-                
-                # Remove markdown code blocks if present
-                import re
-                json_match = re.search(r'```(?:json)?\s*([\s\S]*?)\s*```', response_text)
-                if json_match:
-                    response_text = json_match.group(1).strip()
-                else:
-                    response_text = response_text.replace('```json', '').replace('```', '')
-                    response_text = response_text.strip()
+                result = self._parse_json_response(self._response_text(response.json()))
                 
-                # Try to find JSON object with braces if not starting with {
-                if not response_text.startswith('{'):
-                    json_obj_match = re.search(r'\{[\s\S]*\}', response_text)
-                    if json_obj_match:
-                        response_text = json_obj_match.group(0)
-                    elif '"timeline"' in response_text or '"details"' in response_text or '"map"' in response_text or '"graph"' in response_text:
-                        # Wrap bare JSON content in braces
-                        response_text = '{' + response_text.strip() + '}'
+                # Model sometimes returns the bare component instead of {"component": ...}
+                if not isinstance(result, dict) or component not in result:
+                    result = {component: result}
                 
-                # Clean up trailing commas
-                response_text = re.sub(r',\s*}', '}', response_text)
-                response_text = re.sub(r',\s*]', ']', response_text)
-                
-                # Remove any leading/trailing whitespace and newlines inside the JSON
-                response_text = response_text.strip()
+                is_valid, errors = self._validate_output(result, [component])
+                if is_valid:
+                    return result[component]
+                print(f"  ⚠ {component} validation issues (attempt {attempt + 1}): {errors[:2]}")
+            
+            except Exception as e:
+                print(f"   ❌ {component} error (attempt {attempt + 1}): {e}")
+            
+            if attempt < self.config.retry_attempts - 1 and not get_gateway().backoff('step7_components', attempt):
+                break
+        
+        return None
+    
+    def _write_components_combined(self, article: Dict, components: List[str]) -> Optional[Dict]:
+        """All components in one request (parallel_components=False)."""
+        system_prompt = self._build_system_prompt(article, components)
+        
+        # Try up to retry_attempts times
+        for attempt in range(self.config.retry_attempts):
+            try:
+                response = self._post(system_prompt, self.config.max_tokens)
                 
-                print(f"   📝 Cleaned JSON: {response_text[:200]}...")
+                if response.status_code == 429:
+                    print(f"   ⚠️ Rate limited after gateway retries - giving up on this article")
+                    return None
                 
-                # Parse JSON
-                result = json.loads(response_text)
+                response.raise_for_status()
+                result = self._parse_json_response(self._response_text(response.json()))
                 
                 # Validate
                 is_valid, errors = self._validate_output(result, components)
@@ -644,23 +708,79 @@ class GeminiComponentWriter:
                     return result
                 else:
                     print(f"  ⚠ Validation issues (attempt {attempt + 1}): {errors[:2]}")
-                    if attempt < self.config.retry_attempts - 1:
-                        time.sleep(self.config.retry_delay)
+                    if attempt < self.config.retry_attempts - 1 and not get_gateway().backoff('step7_components', attempt):
+                        break
                 
             except json.JSONDecodeError as e:
                 print(f"❌ JSON decode error: {e}")
-                print(f"   Response text: {response_text[:200]}...")
-                if attempt < self.config.retry_attempts - 1:
-                    time.sleep(self.config.retry_delay)
+                if attempt < self.config.retry_attempts - 1 and not get_gateway().backoff('step7_components', attempt):
+                    break
             except Exception as e:
                 print(f"❌ Error: {e}")
-                if attempt < self.config.retry_attempts - 1:
-                    time.sleep(self.config.retry_delay)
+                if attempt < self.config.retry_attempts - 1 and not get_gateway().backoff('step7_components', attempt):
+                    break
         
         return None  # Failed after all retries
     
-    def _build_system_prompt(self, article: Dict, components: List[str]) -> str:
-        """Build system prompt with article data filled in"""
+    def _post(self, prompt: str, max_tokens: int) -> requests.Response:
+        """Send one generation request through the gateway."""
+        request_data = {
+            "contents": [
+                {
+                    "role": "user",
+                    "parts": [{"text": prompt + "\n\nGenerate the components now. Return ONLY valid JSON."}]
+                }
+            ],
+            "generationConfig": {
+                "temperature": self.config.temperature,
+                "maxOutputTokens": max_tokens,
+                "responseMimeType": "application/json"
+            }
+        }
+        
+        # Gateway retries 429/5xx with adaptive backoff (no fixed 15-45s sleeps)
+        return get_gateway().post(
+            self.api_url,
+            json=request_data,
+            timeout=self.config.timeout,
+            stage='step7_components'
+        )
+    
+    @staticmethod
+    def _response_text(result: Dict) -> str:
+        # Extract response text from Gemini format
+        if 'candidates' not in result or len(result['candidates']) == 0:
+            raise Exception("No candidates in Gemini response")
+        return result['candidates'][0]['content']['parts'][0]['text']
+    
+    @staticmethod
+    def _parse_json_response(response_text: str):
+        """Parse model output, tolerating code fences, bare content and trailing commas."""
+        # Remove markdown code blocks if present
+        json_match = re.search(r'```(?:json)?\s*([\s\S]*?)\s*```', response_text)
+        if json_match:
+            response_text = json_match.group(1).strip()
+        else:
+            response_text = response_text.replace('```json', '').replace('```', '')
+            response_text = response_text.strip()
+        
+        # Try to find JSON object with braces if not starting with { (or a bare [ array)
+        if not response_text.startswith(('{', '[')):
+            json_obj_match = re.search(r'\{[\s\S]*\}', response_text)
+            if json_obj_match:
+                response_text = json_obj_match.group(0)
+            elif any(f'"{name}"' in response_text for name in COMPONENT_SECTION_TITLES):
+                # Wrap bare JSON content in braces
+                response_text = '{' + response_text.strip() + '}'
+        
+        # Clean up trailing commas
+        response_text = re.sub(r',\s*}', '}', response_text)
+        response_text = re.sub(r',\s*]', ']', response_text)
+        
+        return json.loads(response_text.strip())
+    
+    def _prompt_fields(self, article: Dict, components: List[str]) -> tuple[str, str, str]:
+        """Title, bullet text and search context for the given components"""
 
         title = article.get('title_news', article.get('title', 'Unknown'))
 
@@ -689,6 +809,12 @@ class GeminiComponentWriter:
                 map_hint += f"• {loc}\n"
             context_str += map_hint
 
+        return title, bullets_text, context_str
+    
+    def _build_system_prompt(self, article: Dict, components: List[str]) -> str:
+        """Build system prompt with article data filled in"""
+        title, bullets_text, context_str = self._prompt_fields(article, components)
+
         # Format the prompt template with article data using replace (not .format()
         # because the prompt contains JSON examples with braces)
         today = datetime.now(timezone.utc).strftime('%B %d, %Y')
@@ -701,6 +827,22 @@ class GeminiComponentWriter:
 
         return formatted_prompt
     
+    def _build_component_prompt(self, article: Dict, component: str) -> str:
+        """Prompt for one component: its own section and search context only"""
+        title, bullets_text, context_str = self._prompt_fields(article, [component])
+
+        today = datetime.now(timezone.utc).strftime('%B %d, %Y')
+        formatted_prompt = SINGLE_COMPONENT_PROMPT
+        formatted_prompt = formatted_prompt.replace('{section}', COMPONENT_SECTIONS[component])
+        formatted_prompt = formatted_prompt.replace('{component_title}', COMPONENT_SECTION_TITLES[component])
+        formatted_prompt = formatted_prompt.replace('{component}', component)
+        formatted_prompt = formatted_prompt.replace('{today}', today)
+        formatted_prompt = formatted_prompt.replace('{title}', title)
+        formatted_prompt = formatted_prompt.replace('{bullets}', bullets_text)
+        formatted_prompt = formatted_prompt.replace('{context}', context_str)
+
+        return formatted_prompt
+    
     def _validate_output(self, result: Dict, selected_components: List[str]) -> tuple[bool, List[str]]:
         """
         Validate component output PER-COMPONENT.
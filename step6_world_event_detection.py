@@ -12,11 +12,14 @@ import json
 import os
 import time
 import requests
+import numpy as np
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from dataclasses import dataclass
-from supabase import create_client, Client
+from supabase import Client
+from supabase_pool import get_supabase_client
 from event_components import generate_event_components, refresh_all_event_components
+from llm_gateway import get_gateway
 
 # ==========================================
 # CONFIGURATION
@@ -30,25 +33,31 @@ class WorldEventConfig:
     max_output_tokens: int = 1024
     retry_attempts: int = 3
     retry_delay: float = 2.0
+    # Batched detection
+    batch_size: int = 12                 # Articles classified per Gemini call
+    batch_max_output_tokens: int = 8192
+    batch_content_chars: int = 1500      # Article content included per article
+    # Embedding prefilter (MiniLM cosine vs event topic_prompt)
+    prefilter_threshold: float = 0.30    # Below this no existing event is plausible...
+    new_event_min_score: float = 800     # ...and only high-scoring articles may start a new one
+    catalogue_ttl_s: float = 600.0       # Reload ongoing events after this long
+    # Historical backfill for new events (ANN over published_articles MiniLM vectors)
+    backfill_days: int = 90
+    backfill_candidates: int = 60
+    backfill_min_similarity: float = 0.35
+    backfill_verify_max: int = 40        # Candidates sent to the verification call
 
 # Initialize Supabase (check both env var names for compatibility)
 SUPABASE_URL = os.environ.get('NEXT_PUBLIC_SUPABASE_URL') or os.environ.get('SUPABASE_URL')
 SUPABASE_KEY = os.environ.get('SUPABASE_SERVICE_KEY') or os.environ.get('SUPABASE_KEY')
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY) if SUPABASE_URL and SUPABASE_KEY else None
+supabase: Client = get_supabase_client(SUPABASE_URL, SUPABASE_KEY) if SUPABASE_URL and SUPABASE_KEY else None
 
 # ==========================================
 # PROMPTS
 # ==========================================
 
-EVENT_DETECTION_PROMPT = """Analyze this news article and determine if it relates to a MAJOR ONGOING WORLD EVENT.
-
-ARTICLE TITLE: {title}
-ARTICLE CONTENT: {content}
-
-EXISTING WORLD EVENTS:
-{existing_events}
-
-═══════════════════════════════════════════════════════════════
+# Shared by the single-article and batched detection prompts
+EVENT_CRITERIA = """═══════════════════════════════════════════════════════════════
 TASK 1: Does this article match any EXISTING world event?
 ═══════════════════════════════════════════════════════════════
 
@@ -160,18 +169,10 @@ Use simple, recognizable names that fit in a small UI card.
 - "Annual World Economic Forum Meeting in Davos Switzerland"
 - "United States and China Engage in Trade Dispute Over Technology"
 
-═══════════════════════════════════════════════════════════════
-RESPONSE FORMAT (JSON):
-═══════════════════════════════════════════════════════════════
+"""
 
-{{
-  "matches_existing": true/false,
-  "existing_event_id": "uuid or null",
-  "existing_event_name": "name or null",
-  "match_confidence": 0-100,
-
-  "is_new_world_event": true/false,
-  "new_event": {{
+# Schema of "new_event" in both response formats
+NEW_EVENT_SCHEMA = """{{
     "name": "G20 Summit",
     "slug": "g20-summit",
     "topic_prompt": "G20 Summit world leaders meeting global economy",
@@ -214,7 +215,29 @@ RESPONSE FORMAT (JSON):
   - General industry topics (AI water demand, tech regulations, etc.)
   - Anything where "Day X" doesn't make intuitive sense
   
-  IMPORTANT: When in doubt, set show_day_counter to FALSE. Most events should NOT have a day counter.
+  IMPORTANT: When in doubt, set show_day_counter to FALSE. Most events should NOT have a day counter."""
+
+
+EVENT_DETECTION_PROMPT = """Analyze this news article and determine if it relates to a MAJOR ONGOING WORLD EVENT.
+
+ARTICLE TITLE: {title}
+ARTICLE CONTENT: {content}
+
+EXISTING WORLD EVENTS:
+{existing_events}
+
+""" + EVENT_CRITERIA + """═══════════════════════════════════════════════════════════════
+RESPONSE FORMAT (JSON):
+═══════════════════════════════════════════════════════════════
+
+{{
+  "matches_existing": true/false,
+  "existing_event_id": "uuid or null",
+  "existing_event_name": "name or null",
+  "match_confidence": 0-100,
+
+  "is_new_world_event": true/false,
+  "new_event": """ + NEW_EVENT_SCHEMA + """
   
   "reasoning": "Brief explanation of your decision"
 }}
@@ -226,6 +249,49 @@ If neither (regular news), set both matches_existing and is_new_world_event to f
 Respond with valid JSON only."""
 
 
+# Catalogue and rules come first and articles last, so consecutive batches
+# share a long identical prefix (Gemini implicit prompt caching).
+BATCH_EVENT_DETECTION_PROMPT = """Analyze a BATCH of news articles and determine, for EACH article independently, if it relates to a MAJOR ONGOING WORLD EVENT.
+
+EXISTING WORLD EVENTS:
+{existing_events}
+
+""" + EVENT_CRITERIA + """═══════════════════════════════════════════════════════════════
+RESPONSE FORMAT (JSON):
+═══════════════════════════════════════════════════════════════
+
+{{
+  "results": [
+    {{
+      "index": 0,
+      "matches_existing": true/false,
+      "existing_event_id": "uuid or null",
+      "existing_event_name": "name or null",
+      "match_confidence": 0-100,
+      "is_new_world_event": true/false,
+      "new_event": null or a NEW EVENT object (below),
+      "reasoning": "Brief explanation of your decision"
+    }}
+  ]
+}}
+
+NEW EVENT object:
+""" + NEW_EVENT_SCHEMA + """
+
+Return exactly ONE result per article, with the article's index.
+If an article matches an existing event, set is_new_world_event to false and new_event to null.
+If several articles in the batch describe the same NEW event, use the exact same new_event name for all of them.
+If neither (regular news), set both matches_existing and is_new_world_event to false.
+
+═══════════════════════════════════════════════════════════════
+ARTICLES:
+═══════════════════════════════════════════════════════════════
+
+{articles}
+
+Respond with valid JSON only."""
+
+
 LATEST_DEVELOPMENT_PROMPT = """Write the Latest Development section for a world event.
 
 EVENT: {event_name}
@@ -296,6 +362,133 @@ def format_existing_events(events: List[Dict]) -> str:
     return "\n".join(lines)
 
 
+def _parse_json_response(text: str):
+    text = text.strip()
+    if text.startswith('```'):
+        text = text.split('```')[1]
+        if text.startswith('json'):
+            text = text[4:]
+    return json.loads(text)
+
+
+def _normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+class EventCatalogue:
+    """
+    Ongoing world events plus their derived prompt text and embeddings.
+
+    Both are computed once and extended in place when an event is added,
+    so the prompt prefix stays byte-identical between batches.
+    """
+
+    def __init__(self, events: List[Dict]):
+        self.events = list(events)
+        self.loaded_at = time.time()
+        self._text = None
+        self._vectors = None  # Normalized MiniLM vectors of topic prompts (rows match events)
+
+    def __len__(self):
+        return len(self.events)
+
+    @property
+    def text(self) -> str:
+        if self._text is None:
+            self._text = format_existing_events(self.events)
+        return self._text
+
+    @staticmethod
+    def _event_text(event: Dict) -> str:
+        return f"{event.get('name', '')}. {event.get('topic_prompt', '')}"
+
+    def vectors(self) -> Optional[np.ndarray]:
+        if self._vectors is None and self.events:
+            from step1_5_event_clustering import get_embeddings_minilm_batch
+            embs = get_embeddings_minilm_batch([self._event_text(e) for e in self.events])
+            if any(e is None for e in embs):
+                return None
+            self._vectors = _normalize_rows(np.asarray(embs, dtype=np.float32))
+        return self._vectors
+
+    def add(self, event: Dict):
+        had_events = bool(self.events)
+        self.events.append(event)
+        if self._text is not None:
+            addition = format_existing_events([event])
+            self._text = (self._text + "\n" + addition) if had_events else addition
+        if self._vectors is not None:
+            from step1_5_event_clustering import get_embedding_minilm
+            emb = get_embedding_minilm(self._event_text(event))
+            if emb is None:
+                self._vectors = None  # Recomputed on next use
+            else:
+                row = _normalize_rows(np.asarray([emb], dtype=np.float32))
+                self._vectors = np.vstack([self._vectors, row])
+
+
+_catalogue: Optional[EventCatalogue] = None
+
+
+def get_event_catalogue(config: Optional[WorldEventConfig] = None) -> EventCatalogue:
+    """Process-wide catalogue of ongoing events, reloaded after catalogue_ttl_s."""
+    global _catalogue
+    config = config or WorldEventConfig()
+    if _catalogue is None or time.time() - _catalogue.loaded_at > config.catalogue_ttl_s:
+        _catalogue = EventCatalogue(get_existing_events())
+    return _catalogue
+
+
+def _article_score(article: Dict) -> Optional[float]:
+    for key in ('ai_final_score', 'score', 'importance_score'):
+        if article.get(key) is not None:
+            try:
+                return float(article[key])
+            except (TypeError, ValueError):
+                pass
+    return None
+
+
+def prefilter_articles(articles: List[Dict], catalogue: EventCatalogue,
+                       config: Optional[WorldEventConfig] = None) -> List[int]:
+    """
+    Indexes of articles worth sending to Gemini.
+
+    An article is kept if its MiniLM embedding is close to some ongoing
+    event's topic, or if its score is high enough (or unknown) for it to
+    start a new event. Fails open: without embeddings every article is kept.
+    """
+    config = config or WorldEventConfig()
+
+    best = np.zeros(len(articles), dtype=np.float32)
+    event_vectors = catalogue.vectors() if len(catalogue) else None
+    if len(catalogue) and event_vectors is None:
+        return list(range(len(articles)))
+
+    if event_vectors is not None:
+        from step1_5_event_clustering import get_embeddings_minilm_batch
+        vectors = [a.get('embedding_minilm') for a in articles]
+        missing = [i for i, v in enumerate(vectors) if v is None]
+        if missing:
+            texts = [f"{articles[i].get('title', '')}. {str(articles[i].get('content', articles[i].get('bullets', '')))[:300]}"
+                     for i in missing]
+            for i, emb in zip(missing, get_embeddings_minilm_batch(texts)):
+                vectors[i] = emb
+        if any(v is None for v in vectors):
+            return list(range(len(articles)))
+        article_vectors = _normalize_rows(np.asarray(vectors, dtype=np.float32))
+        best = (article_vectors @ event_vectors.T).max(axis=1)
+
+    keep = []
+    for i, article in enumerate(articles):
+        score = _article_score(article)
+        if best[i] >= config.prefilter_threshold or score is None or score >= config.new_event_min_score:
+            keep.append(i)
+    return keep
+
+
 def extract_blur_color_from_base64(base64_data: str) -> str:
     """Extract a dominant color from base64 image data for blur effect"""
     import base64
@@ -721,73 +914,114 @@ def tag_article_to_event(article_id, event_id: str):
         print(f"  Failed to tag article: {e}")
 
 
-def search_historical_articles_for_event(event: Dict, event_data: Dict):
-    """
-    Search historical articles (last 3 months) that might relate to this new event.
-    Uses keyword matching first (efficient), then AI verification (accurate).
-    """
-    if not supabase:
-        return
+def tag_articles_to_event(article_ids: List, event_id: str) -> int:
+    """Tag several articles to a world event in one upsert. Returns rows written."""
+    if not supabase or not article_ids:
+        return 0
     
-    print(f"\n  🔍 Searching historical articles for: {event['name']}")
+    rows = [{'article_id': str(aid), 'event_id': event_id} for aid in dict.fromkeys(article_ids)]
+    try:
+        supabase.table('article_world_events').upsert(
+            rows, on_conflict='article_id,event_id'
+        ).execute()
+        return len(rows)
+    except Exception as e:
+        print(f"  Failed to tag {len(rows)} articles: {e}")
+        return 0
+
+
+def _find_event_candidates_by_embedding(event: Dict, topic_prompt: str,
+                                        config: WorldEventConfig) -> Optional[List[Dict]]:
+    """
+    Nearest published articles to the event topic (MiniLM ANN).
     
-    # Extract keywords from event name and topic
-    event_name = event['name'].lower()
-    topic_prompt = event_data.get('topic_prompt', '').lower()
+    Returns None if the event can't be embedded or the RPC fails, so the
+    caller can fall back to keyword search.
+    """
+    from step1_5_event_clustering import get_embedding_minilm
     
-    # Build search keywords (split by spaces, remove common words)
+    query = get_embedding_minilm(f"{event['name']}. {topic_prompt}")
+    if query is None:
+        return None
+    try:
+        result = supabase.rpc('match_articles_for_event_minilm', {
+            'query_embedding': query,
+            'match_count': config.backfill_candidates,
+            'days_window': config.backfill_days,
+            'min_similarity': config.backfill_min_similarity
+        }).execute()
+    except Exception as e:
+        print(f"    ANN search error: {e}")
+        return None
+    return result.data or []
+
+
+def _find_event_candidates_by_keywords(event: Dict, topic_prompt: str,
+                                       config: WorldEventConfig) -> List[Dict]:
+    """Fallback: one OR'ed title ILIKE query over the backfill window."""
     stop_words = {'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 'is', 'are', 'was', 'were'}
     
-    words = set()
-    for text in [event_name, topic_prompt]:
+    words = []
+    for text in [event['name'].lower(), topic_prompt.lower()]:
         for word in text.split():
             word = word.strip('.,!?()[]{}"\'-')
-            if len(word) > 2 and word not in stop_words:
-                words.add(word)
-    
-    keywords = list(words)[:10]  # Limit to 10 keywords
-    
+            if len(word) > 2 and word not in stop_words and word.replace('-', '').isalnum():
+                words.append(word)
+    keywords = list(dict.fromkeys(words))[:5]
     if not keywords:
-        print(f"    No keywords extracted, skipping historical search")
-        return
+        return []
     
     print(f"    Keywords: {', '.join(keywords)}")
+    since = (datetime.utcnow() - timedelta(days=config.backfill_days)).isoformat()
+    try:
+        result = supabase.table('published_articles').select(
+            'id, title_news, summary_bullets_news, published_at, created_at'
+        ).or_(','.join(f'title_news.ilike.%{k}%' for k in keywords)).gte(
+            'created_at', since
+        ).order('created_at', desc=True).limit(config.backfill_candidates).execute()
+        return result.data or []
+    except Exception as e:
+        print(f"    Keyword search error: {e}")
+        return []
+
+
+def search_historical_articles_for_event(event: Dict, event_data: Dict):
+    """
+    Find historical articles (last `backfill_days`) about a new event and
+    add them to its timeline.
     
-    # Search articles from last 3 months using keywords
-    from datetime import timedelta
-    three_months_ago = (datetime.utcnow() - timedelta(days=90)).isoformat()
+    Candidates come from an ANN search over published_articles MiniLM
+    vectors (keyword search only if the event can't be embedded), are
+    verified in one Gemini call, and are written with one bulk upsert into
+    article_world_events and one bulk insert into world_event_timeline.
+    """
+    if not supabase:
+        return
     
-    # Build OR query for keyword matching in title
-    matched_articles = []
+    config = WorldEventConfig()
+    print(f"\n  🔍 Searching historical articles for: {event['name']}")
+    topic_prompt = event_data.get('topic_prompt', '')
     
-    for keyword in keywords[:5]:  # Use top 5 keywords for efficiency
-        try:
-            result = supabase.table('published_articles').select(
-                'id, title_news, summary_bullets_news, published_at, created_at'
-            ).ilike('title_news', f'%{keyword}%').gte(
-                'created_at', three_months_ago
-            ).limit(20).execute()
-            
-            if result.data:
-                for article in result.data:
-                    # Avoid duplicates
-                    if not any(a['id'] == article['id'] for a in matched_articles):
-                        matched_articles.append(article)
-        except Exception as e:
-            print(f"    Search error for '{keyword}': {e}")
+    candidates = _find_event_candidates_by_embedding(event, topic_prompt, config)
+    if candidates is None:
+        candidates = _find_event_candidates_by_keywords(event, topic_prompt, config)
+    
+    # Deduplicate by ID, keeping best-first order
+    articles_to_check = list({a['id']: a for a in candidates}.values())
+    articles_to_check = articles_to_check[:config.backfill_verify_max]
     
-    if not matched_articles:
-        print(f"    No historical articles found matching keywords")
+    if not articles_to_check:
+        print(f"    No historical candidates found")
         return
     
-    print(f"    Found {len(matched_articles)} potential matches, verifying with AI...")
+    print(f"    Found {len(articles_to_check)} potential matches, verifying with AI...")
     
     # Configure Gemini for verification
     genai.configure(api_key=os.environ.get('GEMINI_API_KEY'))
-    model = genai.GenerativeModel('gemini-2.5-flash-lite')
-    
-    # Batch verify articles with AI (check up to 30 at a time)
-    articles_to_check = matched_articles[:30]
+    model = genai.GenerativeModel(
+        'gemini-2.5-flash-lite',
+        generation_config={'response_mime_type': 'application/json'}
+    )
     
     article_list = "\n".join([
         f"- ID: {a['id']}, Title: {(a.get('title_news') or a.get('title', ''))[:100]}"
@@ -811,17 +1045,10 @@ If none are related, return: {{"related_ids": []}}
 Respond with valid JSON only."""
 
     try:
-        response = model.generate_content(verification_prompt)
-        text = response.text.strip()
-        
-        # Parse JSON
-        if text.startswith('```'):
-            text = text.split('```')[1]
-            if text.startswith('json'):
-                text = text[4:]
-        
-        result = json.loads(text)
-        related_ids = result.get('related_ids', [])
+        with get_gateway().slot('world_events'):
+            response = model.generate_content(verification_prompt)
+        result = _parse_json_response(response.text)
+        related_ids = {str(rid) for rid in result.get('related_ids', [])}
         
         if not related_ids:
             print(f"    AI found no related historical articles")
@@ -829,30 +1056,34 @@ Respond with valid JSON only."""
         
         print(f"    AI verified {len(related_ids)} related articles")
         
-        # Tag related articles to event and add to timeline
-        tagged_count = 0
-        for article in articles_to_check:
-            article_id = str(article['id'])
-            if article_id in related_ids or article['id'] in related_ids:
-                # Tag article to event
-                tag_article_to_event(article_id, event['id'])
-                
-                # Add timeline entry
-                article_date = article.get('published_at') or article.get('created_at')
-                if article_date:
-                    try:
-                        date_obj = datetime.fromisoformat(article_date.replace('Z', '+00:00'))
-                        supabase.table('world_event_timeline').insert({
-                            'event_id': event['id'],
-                            'date': date_obj.date().isoformat(),
-                            'headline': (article.get('title_news') or article.get('title', ''))[:200],
-                            'summary': (article.get('summary_bullets_news', [''])[0][:500] if isinstance(article.get('summary_bullets_news'), list) and article.get('summary_bullets_news') else '')
-                        }).execute()
-                        tagged_count += 1
-                    except Exception as e:
-                        print(f"    Failed to add timeline entry: {e}")
+        related = [a for a in articles_to_check if str(a['id']) in related_ids]
+        tag_articles_to_event([a['id'] for a in related], event['id'])
+        
+        timeline_rows = []
+        for article in related:
+            article_date = article.get('published_at') or article.get('created_at')
+            if not article_date:
+                continue
+            try:
+                date_obj = datetime.fromisoformat(article_date.replace('Z', '+00:00'))
+            except ValueError:
+                continue
+            bullets = article.get('summary_bullets_news')
+            timeline_rows.append({
+                'event_id': event['id'],
+                'date': date_obj.date().isoformat(),
+                'headline': (article.get('title_news') or article.get('title', ''))[:200],
+                'summary': (bullets[0][:500] if isinstance(bullets, list) and bullets else '')
+            })
+        
+        if timeline_rows:
+            try:
+                supabase.table('world_event_timeline').insert(timeline_rows).execute()
+            except Exception as e:
+                print(f"    Failed to add timeline entries: {e}")
+                timeline_rows = []
         
-        print(f"    ✅ Added {tagged_count} historical articles to event timeline")
+        print(f"    ✅ Added {len(timeline_rows)} historical articles to event timeline")
         
     except json.JSONDecodeError as e:
         print(f"    AI response parse error: {e}")
@@ -923,12 +1154,123 @@ def update_latest_development(event_id: str, event_name: str, article: Dict, art
 # MAIN DETECTION FUNCTION
 # ==========================================
 
-def detect_world_events(articles: List[Dict]) -> List[Dict]:
+def classify_article(model, article: Dict, catalogue: EventCatalogue) -> Dict:
+    """Single-article detection (fallback when a batch response is unusable)."""
+    content = article.get('content', article.get('bullets', ''))[:2000]
+    prompt = EVENT_DETECTION_PROMPT.format(
+        title=article.get('title', ''),
+        content=content,
+        existing_events=catalogue.text
+    )
+    with get_gateway().slot('world_events'):
+        response = model.generate_content(prompt)
+    return _parse_json_response(response.text)
+
+
+def classify_articles_batch(model, batch: List[Tuple[int, Dict]], catalogue: EventCatalogue,
+                            config: Optional[WorldEventConfig] = None) -> Dict[int, Dict]:
+    """
+    Classify several articles against the catalogue in one structured call.
+
+    Args:
+        batch: (index, article) pairs; the index is echoed back by the model
+
+    Returns:
+        Dict of index -> detection result (articles missing from the response are absent)
+    """
+    config = config or WorldEventConfig()
+    blocks = []
+    for idx, article in batch:
+        content = str(article.get('content', article.get('bullets', '')))[:config.batch_content_chars]
+        blocks.append(f"[{idx}] TITLE: {article.get('title', '')}\nCONTENT: {content}")
+
+    prompt = BATCH_EVENT_DETECTION_PROMPT.format(
+        existing_events=catalogue.text,
+        articles="\n\n".join(blocks)
+    )
+    with get_gateway().slot('world_events'):
+        response = model.generate_content(prompt)
+    data = _parse_json_response(response.text)
+
+    results = {}
+    wanted = {idx for idx, _ in batch}
+    for item in data.get('results', []) if isinstance(data, dict) else []:
+        try:
+            idx = int(item.get('index'))
+        except (TypeError, ValueError):
+            continue
+        if idx in wanted:
+            results[idx] = item
+    return results
+
+
+def _apply_detection(article: Dict, article_id, result: Dict, catalogue: EventCatalogue,
+                     pending_updates: Dict, stats: Dict):
+    """Tag/create events for one detection result. Latest-development updates are deferred."""
+    if result.get('matches_existing') and result.get('existing_event_id'):
+        # Check confidence threshold — skip weak matches
+        confidence = result.get('match_confidence', 50)
+        event_id = result['existing_event_id']
+        event_name = result.get('existing_event_name', 'Unknown')
+
+        if confidence < 70:
+            print(f"  → Skipped weak match to '{event_name}' (confidence: {confidence}%)")
+        else:
+            tag_article_to_event(article_id, event_id)
+            pending_updates[event_id] = (event_name, article, article_id)
+
+            article['world_event_id'] = event_id
+            stats['articles_tagged'] += 1
+            print(f"  → Matched existing event: {event_name} (confidence: {confidence}%)")
+
+    elif result.get('is_new_world_event') and result.get('new_event'):
+        # DEDUP GUARD: Check if proposed event is too similar to an existing one
+        proposed_name = result['new_event'].get('name', '')
+        duplicate = find_duplicate_event(proposed_name, catalogue.events)
+
+        if duplicate:
+            # Match to existing event instead of creating a duplicate
+            print(f"  → DEDUP: \"{proposed_name}\" matches existing \"{duplicate['name']}\" — tagging instead of creating")
+            tag_article_to_event(article_id, duplicate['id'])
+            pending_updates[duplicate['id']] = (duplicate['name'], article, article_id)
+            article['world_event_id'] = duplicate['id']
+            stats['articles_tagged'] += 1
+        else:
+            # Create new event
+            new_event = create_world_event(result['new_event'], article_id)
+
+            if new_event:
+                tag_article_to_event(article_id, new_event['id'])
+                article['world_event_id'] = new_event['id']
+
+                # Add to the catalogue for subsequent articles
+                catalogue.add({
+                    'id': new_event['id'],
+                    'name': new_event['name'],
+                    'slug': new_event['slug'],
+                    'topic_prompt': new_event['topic_prompt']
+                })
+
+                stats['new_events_created'] += 1
+                stats['articles_tagged'] += 1
+                print(f"  → Created NEW world event: {new_event['name']}")
+    else:
+        print(f"  → Not a world event (regular news)")
+
+
+def detect_world_events(articles: List[Dict], batch: bool = True) -> List[Dict]:
     """
     Process articles to detect and tag world events.
     
+    Articles with no plausible event match are dropped by an embedding
+    prefilter; the rest are classified `batch_size` at a time in one Gemini
+    call each (batch=False restores one call per article). The latest
+    development of each matched event is regenerated once per run, from its
+    last matching article.
+    
     Args:
         articles: List of processed articles with id, title, content/bullets
+        batch: Classify articles in batches
     
     Returns:
         List of articles with world_event_id added if applicable
@@ -941,109 +1283,61 @@ def detect_world_events(articles: List[Dict]) -> List[Dict]:
     print("STEP 6: WORLD EVENT DETECTION")
     print("="*60)
     
+    config = WorldEventConfig()
+    
     # Configure Gemini
     genai.configure(api_key=os.environ.get('GEMINI_API_KEY'))
     model = genai.GenerativeModel('gemini-2.5-flash-lite')
+    batch_model = genai.GenerativeModel(
+        config.model,
+        generation_config={
+            'temperature': config.temperature,
+            'max_output_tokens': config.batch_max_output_tokens,
+            'response_mime_type': 'application/json'
+        }
+    )
     
-    # Get existing events
-    existing_events = get_existing_events()
-    existing_events_text = format_existing_events(existing_events)
-    print(f"Found {len(existing_events)} existing world events")
+    # Get existing events (cached catalogue)
+    catalogue = get_event_catalogue(config)
+    print(f"Found {len(catalogue)} existing world events")
     
-    processed = []
-    new_events_created = 0
-    articles_tagged = 0
+    candidates = prefilter_articles(articles, catalogue, config)
+    print(f"Prefilter: {len(candidates)}/{len(articles)} articles may relate to a world event")
     
-    for i, article in enumerate(articles):
-        print(f"\n[{i+1}/{len(articles)}] Processing: {article.get('title', 'Untitled')[:50]}...")
-        
-        article_id = article.get('id', f'temp_{i}')
-        content = article.get('content', article.get('bullets', ''))[:2000]
-        
-        # Build prompt
-        prompt = EVENT_DETECTION_PROMPT.format(
-            title=article.get('title', ''),
-            content=content,
-            existing_events=existing_events_text
-        )
-        
-        try:
-            # Call Gemini
-            response = model.generate_content(prompt)
-            text = response.text.strip()
-            
-            # Parse JSON
-            if text.startswith('```'):
-                text = text.split('```')[1]
-                if text.startswith('json'):
-                    text = text[4:]
-            
-            result = json.loads(text)
-            
-            # Handle result
-            if result.get('matches_existing') and result.get('existing_event_id'):
-                # Check confidence threshold — skip weak matches
-                confidence = result.get('match_confidence', 50)
-                event_id = result['existing_event_id']
-                event_name = result.get('existing_event_name', 'Unknown')
-
-                if confidence < 70:
-                    print(f"  → Skipped weak match to '{event_name}' (confidence: {confidence}%)")
-                else:
-                    tag_article_to_event(article_id, event_id)
-                    update_latest_development(event_id, event_name, article, article_id)
-
-                    article['world_event_id'] = event_id
-                    articles_tagged += 1
-                    print(f"  → Matched existing event: {event_name} (confidence: {confidence}%)")
-                
-            elif result.get('is_new_world_event') and result.get('new_event'):
-                # DEDUP GUARD: Check if proposed event is too similar to an existing one
-                proposed_name = result['new_event'].get('name', '')
-                duplicate = find_duplicate_event(proposed_name, existing_events)
-
-                if duplicate:
-                    # Match to existing event instead of creating a duplicate
-                    print(f"  → DEDUP: \"{proposed_name}\" matches existing \"{duplicate['name']}\" — tagging instead of creating")
-                    tag_article_to_event(article_id, duplicate['id'])
-                    update_latest_development(duplicate['id'], duplicate['name'], article, article_id)
-                    article['world_event_id'] = duplicate['id']
-                    articles_tagged += 1
-                else:
-                    # Create new event
-                    new_event = create_world_event(result['new_event'], article_id)
-
-                    if new_event:
-                        tag_article_to_event(article_id, new_event['id'])
-                        article['world_event_id'] = new_event['id']
-
-                        # Add to existing events for subsequent articles
-                        existing_events.append({
-                            'id': new_event['id'],
-                            'name': new_event['name'],
-                            'slug': new_event['slug'],
-                            'topic_prompt': new_event['topic_prompt']
-                        })
-                        existing_events_text = format_existing_events(existing_events)
-
-                        new_events_created += 1
-                        articles_tagged += 1
-                        print(f"  → Created NEW world event: {new_event['name']}")
-            else:
-                print(f"  → Not a world event (regular news)")
-            
-        except json.JSONDecodeError as e:
-            print(f"  ❌ JSON parse error: {e}")
-        except Exception as e:
-            print(f"  ❌ Error: {e}")
+    stats = {'new_events_created': 0, 'articles_tagged': 0}
+    pending_updates = {}  # event_id -> (event_name, article, article_id)
+    step = config.batch_size if batch else 1
+    
+    for start in range(0, len(candidates), step):
+        chunk = [(i, articles[i]) for i in candidates[start:start + step]]
+        results = {}
+        if batch:
+            try:
+                results = classify_articles_batch(batch_model, chunk, catalogue, config)
+            except Exception as e:
+                print(f"  ⚠️ Batch detection failed ({len(chunk)} articles), falling back to single calls: {e}")
         
-        processed.append(article)
-        time.sleep(0.5)  # Rate limiting
+        for i, article in chunk:
+            print(f"\n[{i+1}/{len(articles)}] Processing: {article.get('title', 'Untitled')[:50]}...")
+            article_id = article.get('id', f'temp_{i}')
+            try:
+                result = results.get(i)
+                if result is None:
+                    result = classify_article(model, article, catalogue)
+                _apply_detection(article, article_id, result, catalogue, pending_updates, stats)
+            except json.JSONDecodeError as e:
+                print(f"  ❌ JSON parse error: {e}")
+            except Exception as e:
+                print(f"  ❌ Error: {e}")
+    
+    # One latest-development refresh per matched event
+    for event_id, (event_name, article, article_id) in pending_updates.items():
+        update_latest_development(event_id, event_name, article, article_id)
     
     print("\n" + "="*60)
     print(f"WORLD EVENT DETECTION COMPLETE")
-    print(f"  New events created: {new_events_created}")
-    print(f"  Articles tagged: {articles_tagged}")
+    print(f"  New events created: {stats['new_events_created']}")
+    print(f"  Articles tagged: {stats['articles_tagged']}")
     print("="*60)
     
     # ── AUTO-ARCHIVE: Mark stale events as 'ended' so they don't clog the homepage ──
@@ -1064,7 +1358,7 @@ def detect_world_events(articles: List[Dict]) -> List[Dict]:
     except Exception as e:
         print(f"  ⚠️ Component refresh error (non-critical): {e}")
     
-    return processed
+    return articles
 
 
 def refresh_stale_event_components(max_per_run: int = 3):
@@ -8,12 +8,18 @@ This module:
 2. Uses Gemini to identify any claims not supported by the sources
 3. Rejects articles with significant discrepancies
 4. Allows regeneration of rejected articles
+5. Repairs rejected articles in place: only the title/bullets a
+   discrepancy points at are sent back for patching, and every flagged
+   span is re-verified (a fraction of a full re-synthesis)
 """
 
 import os
+import re
 import json
-import requests
 from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from llm_gateway import get_gateway
 
 @dataclass
 class VerificationConfig:
@@ -23,6 +29,9 @@ class VerificationConfig:
     temperature: float = 0  # Deterministic for verification
     timeout: int = 60
     max_retries: int = 2  # How many times to regenerate if verification fails
+    repair_max_tokens: int = 800  # Patched spans only
+    span_match_threshold: float = 0.5  # Share of a claim's words a span must contain to be flagged
+    cache_ttl_s: float = 7 * 24 * 3600  # Temperature 0: same article + sources = same verdict
 
 
 VERIFICATION_SYSTEM_PROMPT = """You are a fact-checking editor verifying AI-generated news content against source articles.
@@ -68,8 +77,88 @@ IMPORTANT:
 - Be lenient with paraphrasing and stylistic choices"""
 
 
-def build_verification_prompt(sources: list, generated: dict) -> str:
-    """Build the verification prompt with source content and generated output"""
+REPAIR_SYSTEM_PROMPT = """You are a fact-checking editor correcting specific errors in a news summary.
+
+You receive some lines (title and/or bullets) from a summary, plus the errors a
+fact-checker found, each with what the sources actually say.
+
+RULES:
+- Rewrite ONLY the lines given, and only as much as needed to fix the errors
+- Use the "source fact" to correct a claim; if it says the claim is not in the
+  sources, remove that claim
+- Keep the style: present tense, active voice, same **bold** highlighting
+- Keep each line about the same length (title 40-60 chars, bullets under 190 chars)
+- Do not add new facts
+
+RESPONSE FORMAT (JSON):
+{
+  "patches": [
+    {"span": "bullet_2", "text": "Corrected bullet text"}
+  ]
+}
+Return a patch for every line you changed, using the span IDs given."""
+
+
+def _span_text(generated: dict) -> Dict[str, str]:
+    """Title and bullets of a generated article, keyed by span ID ('title', 'bullet_1', ...)."""
+    spans = {'title': generated.get('title', generated.get('title_news', ''))}
+    bullets = generated.get('summary_bullets', generated.get('summary_bullets_news', [])) or []
+    for i, bullet in enumerate(bullets, 1):
+        spans[f'bullet_{i}'] = bullet
+    return spans
+
+
+def _words(text: str) -> set:
+    return set(re.findall(r"[a-z0-9$%.,']+", (text or '').replace('**', '').lower())) - {'.', ','}
+
+
+def _place_discrepancies(generated: dict, discrepancies: list, threshold: float) -> Optional[List[str]]:
+    """Span IDs the discrepancies point at, or None if any can't be placed."""
+    span_words = {key: _words(text) for key, text in _span_text(generated).items()}
+    flagged = []
+    for d in discrepancies:
+        claim = _words(d.get('generated_claim', ''))
+        if not claim:
+            return None
+        best_key, best = None, 0.0
+        for key, words in span_words.items():
+            overlap = len(claim & words) / len(claim)
+            if overlap > best:
+                best_key, best = key, overlap
+        if best_key is None or best < threshold:
+            return None
+        if best_key not in flagged:
+            flagged.append(best_key)
+    return flagged
+
+
+def build_repair_prompt(generated: dict, discrepancies: list, span_ids: List[str]) -> str:
+    """Repair prompt: flagged spans + the errors found in them (no source texts)."""
+    spans = _span_text(generated)
+    lines_text = '\n'.join(f"[{key}] {spans[key]}" for key in span_ids)
+    errors_text = ''
+    for i, d in enumerate(discrepancies, 1):
+        errors_text += f"""
+{i}. ERROR TYPE: {d.get('type', 'Unknown')}
+   ISSUE: {d.get('issue', 'N/A')}
+   WHAT WAS WRITTEN: {d.get('generated_claim', 'N/A')}
+   SOURCE FACT: {d.get('source_fact', 'N/A')}
+"""
+    return f"""LINES TO CORRECT:
+{lines_text}
+
+ERRORS FOUND:
+{errors_text}
+Return JSON with your patches."""
+
+
+def build_verification_prompt(sources: list, generated: dict, spans: Optional[List[str]] = None) -> str:
+    """
+    Build the verification prompt with source content and generated output.
+
+    If `spans` is given, only those span IDs (e.g. ['bullet_2']) are put up
+    for verification; the rest of the article already passed.
+    """
     
     # Build source content section
     sources_text = ""
@@ -104,7 +193,12 @@ CONTENT: {content if content else '[No content available]'}
     bullets_text = '\n'.join([f"  • {b}" for b in bullets]) if bullets else '[No bullets]'
     
     five_ws_text = ""
-    if five_ws:
+    if spans is not None:
+        span_map = _span_text(generated)
+        title = span_map['title'] if 'title' in spans else '[Already verified]'
+        bullets_text = '\n'.join(f"  • {span_map[key]}" for key in spans if key.startswith('bullet_') and key in span_map)
+        bullets_text = bullets_text or '[Already verified]'
+    elif five_ws:
         five_ws_text = f"""
 5 W's:
   WHO: {five_ws.get('who', 'N/A')}
@@ -152,10 +246,14 @@ class FactVerifier:
         self.config = config or VerificationConfig()
         self.api_url = f"https://generativelanguage.googleapis.com/v1beta/models/{self.config.model}:generateContent?key={self.api_key}"
     
-    def verify_article(self, sources: list, generated: dict, debug: bool = True) -> tuple:
+    def verify_article(self, sources: list, generated: dict, debug: bool = True,
+                       spans: Optional[List[str]] = None) -> tuple:
         """
         Verify generated article against sources.
         
+        Args:
+            spans: Only verify these span IDs (after repair_article)
+        
         Returns:
             tuple: (is_verified: bool, discrepancies: list, summary: str)
         """
@@ -171,7 +269,7 @@ class FactVerifier:
             print(f"      Generated title: {generated.get('title', generated.get('title_news', ''))[:50]}...")
         
         try:
-            prompt = build_verification_prompt(sources, generated)
+            prompt = build_verification_prompt(sources, generated, spans=spans)
             
             request_data = {
                 "contents": [
@@ -187,10 +285,12 @@ class FactVerifier:
                 }
             }
             
-            response = requests.post(
+            response = get_gateway().post(
                 self.api_url,
                 json=request_data,
-                timeout=self.config.timeout
+                timeout=self.config.timeout,
+                stage='step8_verification',
+                cache_ttl_s=self.config.cache_ttl_s
             )
             response.raise_for_status()
             result = response.json()
@@ -227,6 +327,79 @@ class FactVerifier:
             # On error, assume verified to avoid blocking pipeline
             return True, [], f"Verification error: {str(e)[:50]}"
     
+    def repair_article(self, generated: dict, discrepancies: list) -> Optional[Tuple[dict, List[str]]]:
+        """
+        Patch only the spans the discrepancies point at.
+        
+        Every span a discrepancy was placed in must come back patched; a
+        flagged span the model left alone still carries a known error.
+        (When a discrepancy can't be placed, all spans are sent and any patch
+        is accepted, since re-verification covers all of them.)
+        
+        Returns:
+            (patched article copy, IDs of every flagged span to re-verify), or
+            None if the repair failed and the caller should fall back to
+            regeneration
+        """
+        if not discrepancies:
+            return None
+        placed = _place_discrepancies(generated, discrepancies, self.config.span_match_threshold)
+        span_ids = placed if placed is not None else list(_span_text(generated))
+        print(f"      🩹 Repairing {len(span_ids)} span(s): {', '.join(span_ids)}")
+        
+        try:
+            request_data = {
+                "contents": [
+                    {
+                        "role": "user",
+                        "parts": [{"text": REPAIR_SYSTEM_PROMPT + "\n\n" + build_repair_prompt(generated, discrepancies, span_ids)}]
+                    }
+                ],
+                "generationConfig": {
+                    "temperature": self.config.temperature,
+                    "maxOutputTokens": self.config.repair_max_tokens,
+                    "responseMimeType": "application/json"
+                }
+            }
+            
+            response = get_gateway().post(
+                self.api_url,
+                json=request_data,
+                timeout=self.config.timeout,
+                stage='step8_verification',
+                cache_ttl_s=self.config.cache_ttl_s
+            )
+            response.raise_for_status()
+            result = response.json()
+            response_text = result['candidates'][0]['content']['parts'][0]['text']
+            response_text = response_text.replace('```json', '').replace('```', '').strip()
+            patches = json.loads(response_text).get('patches', [])
+        except Exception as e:
+            print(f"   ⚠️  Repair error: {e}")
+            return None
+        
+        spans = _span_text(generated)
+        changed = []
+        for patch in patches:
+            key = patch.get('span')
+            text = (patch.get('text') or '').strip()
+            if key in span_ids and text and text != spans[key]:
+                spans[key] = text
+                changed.append(key)
+        if not changed:
+            print("   ⚠️  Repair returned no usable patches")
+            return None
+        unpatched = [key for key in (placed or []) if key not in changed]
+        if unpatched:
+            print(f"   ⚠️  Repair left flagged span(s) unpatched: {', '.join(unpatched)}")
+            return None
+        
+        repaired = dict(generated)
+        repaired['title'] = repaired['title_news'] = spans['title']
+        bullets = [spans[f'bullet_{i}'] for i in range(1, len(spans))]
+        repaired['summary_bullets'] = repaired['summary_bullets_news'] = bullets
+        return repaired, span_ids
+    
     def verify_and_regenerate(self, sources: list, generated: dict, 
                                regenerate_func: callable, max_attempts: int = None) -> tuple:
         """
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+STREAMING PIPELINE
+==========================================
+Purpose: Run Step 0 -> Step 1 -> Step 1.5 -> cluster workers as a pipeline
+         instead of a series of barriers.
+
+Each stage runs in its own thread and hands micro-batches to the next one
+through a bounded queue. A full queue blocks the upstream stage
+(backpressure), so a slow scorer or clusterer never builds an unbounded
+backlog. Fetching, scoring and clustering overlap, so a cycle's clusters
+are complete much sooner than with barriers between the steps.
+
+A ready cluster is held until it has been stable for one micro-batch: a
+later batch can still attach sources to it, and a cluster published before
+that would go out without them (process_single_cluster reads the sources
+once and published clusters are not reprocessed). After each batch, held
+clusters it did not touch go to a ClusterScheduler, so workers start while
+Steps 0-1.5 are still running; the rest wait for the next batch, and
+whatever is still held when Step 1.5 drains is dispatched then. Workers
+take the highest-value job first.
+
+Stage functions are injected by the caller, so each step keeps its existing
+semantics (dedup in Step 0, filtered-article logging in Step 1, unpublished
+check before dispatch, etc.).
+"""
+
+import queue
+import threading
+from typing import Callable, Dict, Iterable, List, Optional
+
+from cluster_scheduler import ClusterJob, ClusterScheduler, run_cluster_jobs
+
+
+# Marks the end of a stage's output
+_END = object()
+
+
+class StreamingPipeline:
+    """
+    Bounded-queue pipeline for one workflow cycle.
+
+    Args:
+        fetch_batches: Generator of NEW article micro-batches (Step 0)
+        score_batch: articles -> approved articles (Step 1)
+        cluster_batch: approved articles -> affected cluster IDs (Step 1.5)
+        select_clusters: cluster IDs -> IDs ready for processing
+        process_cluster: cluster_id -> bool (Steps 2-11)
+        build_jobs: cluster IDs -> ClusterJobs with priority metadata
+        scheduler: ClusterScheduler to dispatch through (default: new one)
+        max_workers: Number of concurrent cluster workers
+        queue_size: Max micro-batches buffered between stages
+    """
+
+    def __init__(self,
+                 fetch_batches: Callable[[], Iterable[List[Dict]]],
+                 score_batch: Callable[[List[Dict]], List[Dict]],
+                 cluster_batch: Callable[[List[Dict]], List[int]],
+                 select_clusters: Callable[[List[int]], List[int]],
+                 process_cluster: Callable[[int], bool],
+                 build_jobs: Optional[Callable[[List[int]], List[ClusterJob]]] = None,
+                 scheduler: Optional[ClusterScheduler] = None,
+                 max_workers: int = 10,
+                 queue_size: int = 4):
+        self.fetch_batches = fetch_batches
+        self.score_batch = score_batch
+        self.cluster_batch = cluster_batch
+        self.select_clusters = select_clusters
+        self.process_cluster = process_cluster
+        self.build_jobs = build_jobs or (lambda ids: [ClusterJob(cluster_id=cid) for cid in ids])
+        self.scheduler = scheduler or ClusterScheduler()
+        self.max_workers = max_workers
+
+        self._fetched = queue.Queue(maxsize=queue_size)
+        self._approved = queue.Queue(maxsize=queue_size)
+
+        self._lock = threading.Lock()
+        self._dispatched = set()  # Cluster IDs already sent to a worker this cycle
+        self.stats = {
+            'articles_fetched': 0,
+            'articles_approved': 0,
+            'clusters_dispatched': 0,
+            'clusters_succeeded': 0,
+            'clusters_failed': 0,
+            'stage_errors': 0,
+        }
+
+    def _count(self, key: str, n: int = 1):
+        with self._lock:
+            self.stats[key] += n
+
+    # ------------------------------------------
+    # Stages
+    # ------------------------------------------
+
+    def _stage_fetch(self):
+        try:
+            for batch in self.fetch_batches():
+                if batch:
+                    self._count('articles_fetched', len(batch))
+                    self._fetched.put(batch)
+        except Exception as e:
+            print(f"❌ [stream] Step 0 error: {e}")
+            self._count('stage_errors')
+        finally:
+            self._fetched.put(_END)
+
+    def _stage_score(self):
+        while True:
+            batch = self._fetched.get()
+            if batch is _END:
+                break
+            try:
+                approved = self.score_batch(batch)
+            except Exception as e:
+                print(f"❌ [stream] Step 1 error on batch of {len(batch)}: {e}")
+                self._count('stage_errors')
+                continue
+            if approved:
+                self._count('articles_approved', len(approved))
+                self._approved.put(approved)
+        self._approved.put(_END)
+
+    def _stage_cluster(self):
+        # Single thread: cluster_articles() keeps in-memory centroid state
+        # per call and must not run concurrently with itself.
+        held: List[int] = []  # Ready clusters, in the order they became ready
+        try:
+            while True:
+                batch = self._approved.get()
+                if batch is _END:
+                    break
+                try:
+                    touched = self.cluster_batch(batch)
+                    ready = self.select_clusters(touched)
+                except Exception as e:
+                    print(f"❌ [stream] Step 1.5 error on batch of {len(batch)}: {e}")
+                    self._count('stage_errors')
+                    continue
+                touched = set(touched)
+                with self._lock:
+                    new_ids = [cid for cid in ready if cid not in self._dispatched]
+                    self._dispatched.update(new_ids)
+                # Held clusters this batch left alone are stable: publish them
+                self._dispatch([cid for cid in held if cid not in touched])
+                held = [cid for cid in held if cid in touched] + new_ids
+
+            # Every batch is clustered: no cluster can gain more sources this cycle
+            self._dispatch(held)
+        finally:
+            # Always release the cluster workers, even if this stage dies
+            self.scheduler.close()
+
+    def _dispatch(self, cluster_ids: List[int]):
+        if not cluster_ids:
+            return
+        self._count('clusters_dispatched', len(cluster_ids))
+        self.scheduler.submit_many(self.build_jobs(cluster_ids))
+
+    # ------------------------------------------
+    # Run
+    # ------------------------------------------
+
+    def run(self) -> Dict:
+        """
+        Run all stages to completion.
+
+        Returns:
+            Statistics dict
+        """
+        threads = [
+            threading.Thread(target=self._stage_fetch, name='stream-step0', daemon=True),
+            threading.Thread(target=self._stage_score, name='stream-step1', daemon=True),
+            threading.Thread(target=self._stage_cluster, name='stream-step1.5', daemon=True),
+        ]
+        for t in threads:
+            t.start()
+
+        results = run_cluster_jobs(self.scheduler, self.process_cluster, self.max_workers)
+
+        for t in threads:
+            t.join()
+
+        self.stats['clusters_succeeded'] = results['succeeded']
+        self.stats['clusters_failed'] = results['failed']
+        return dict(self.stats)
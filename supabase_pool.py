@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+SHARED SUPABASE CLIENT
+==========================================
+Purpose: One Supabase client per process instead of one per call.
+
+Status helpers (update_cluster_status, update_source_article_status, ...)
+used to call create_client() on every update, so each update from each
+cluster worker paid for client construction plus a fresh TCP + TLS
+handshake. get_supabase_client() builds the client once (thread-safe) and
+every caller shares it, including its pool of keep-alive connections.
+
+PostgREST's default HTTP pool keeps only 20 idle connections, fewer than
+the cluster workers (MAX_PARALLEL_CLUSTERS) times their concurrent
+Steps 10/11 calls, so surplus connections were closed after each request
+and re-handshaked on the next one. The shared client's PostgREST session
+is rebuilt with a larger pool (SUPABASE_POOL_MAX_CONNECTIONS /
+SUPABASE_POOL_MAX_KEEPALIVE). If the installed supabase-py doesn't expose
+that session, the default pool is kept.
+
+Usage:
+    from supabase_pool import get_supabase_client
+    supabase = get_supabase_client()
+"""
+
+import os
+import threading
+from typing import Dict, Optional, Tuple
+
+from supabase import create_client, Client
+
+
+POOL_MAX_CONNECTIONS = int(os.getenv('SUPABASE_POOL_MAX_CONNECTIONS', '64'))
+POOL_MAX_KEEPALIVE = int(os.getenv('SUPABASE_POOL_MAX_KEEPALIVE', '40'))
+POOL_KEEPALIVE_EXPIRY_S = 60.0
+
+_clients: Dict[Tuple[str, str], Client] = {}
+_lock = threading.Lock()
+
+
+def _tune_postgrest_pool(client: Client):
+    """Swap the PostgREST session for one with a larger keep-alive pool."""
+    try:
+        import httpx
+        postgrest = client.postgrest
+        session = postgrest.session
+        if not isinstance(session, httpx.Client):
+            return
+        postgrest.session = httpx.Client(
+            base_url=session.base_url,
+            headers=session.headers,
+            timeout=session.timeout,
+            follow_redirects=True,
+            limits=httpx.Limits(
+                max_connections=POOL_MAX_CONNECTIONS,
+                max_keepalive_connections=POOL_MAX_KEEPALIVE,
+                keepalive_expiry=POOL_KEEPALIVE_EXPIRY_S,
+            ),
+        )
+        session.close()
+    except Exception as e:
+        print(f"   ⚠️ Supabase pool tuning skipped (using default pool): {e}")
+
+
+def get_supabase_client(url: Optional[str] = None, key: Optional[str] = None) -> Client:
+    """
+    Process-wide Supabase client (one per URL/key pair).
+
+    Reads SUPABASE_URL / NEXT_PUBLIC_SUPABASE_URL and SUPABASE_SERVICE_KEY /
+    SUPABASE_KEY when not given.
+    """
+    url = url or os.getenv('SUPABASE_URL') or os.getenv('NEXT_PUBLIC_SUPABASE_URL')
+    key = key or os.getenv('SUPABASE_SERVICE_KEY') or os.getenv('SUPABASE_KEY')
+    if not url or not key:
+        raise ValueError("SUPABASE_URL and SUPABASE_SERVICE_KEY must be set")
+
+    client = _clients.get((url, key))
+    if client is not None:
+        return client
+    with _lock:
+        client = _clients.get((url, key))
+        if client is None:
+            client = create_client(url, key)
+            # Built under the lock so worker threads never race the lazy init
+            _tune_postgrest_pool(client)
+            _clients[(url, key)] = client
+    return client
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+TRINITY VQ CODEBOOK
+==========================================
+Purpose: Shared loading and projection for the Trinity 2-level codebook
+         (256 primary x 8 sub = 2048 secondary), used by the workflow's
+         Step 12, backfills and scripts/train_rq_vae.py.
+
+Loading:
+  - The active vq_codebooks header (one small row) is checked at most every
+    check_interval_s. Its version is the cache key.
+  - The centroids of a version are fetched from vq_centroids once, parsed
+    in a single json pass, and saved as one float32 .npy file
+    (VQ_CACHE_DIR/vq_<version>.npy, level-1 rows then level-2 rows).
+  - Later loads (new process, restarted instance) memory-map that file after
+    checking its shape against the header, so nothing is re-parsed.
+
+Projection:
+  Embeddings are L2-normalized, then
+    vq_primary   = argmin_c1 ||v - L1[c1]||
+    vq_secondary = c1 * 8 + argmin_local ||(v - L1[c1]) - L2[c1 * 8 + local]||
+  computed as dot products against precomputed squared norms
+  (||c||^2 - 2 c.v, and for level 2 the residual terms folded into a per-slot
+  bias), so a batch of N articles costs one (N, 384) x (384, 256) matmul plus
+  an (N, 8, 384) contraction.
+"""
+
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+
+SUBCODEBOOK_K = 8
+
+
+@dataclass
+class VQCodebookConfig:
+    """Configuration for codebook loading"""
+    cache_dir: str = os.getenv('VQ_CACHE_DIR', os.path.join('.cache', 'vq'))
+    check_interval_s: float = 300.0  # How often the active version is re-checked
+    page_size: int = 1000            # PostgREST row cap per request
+
+
+def parse_vectors(values: List, dim: int) -> np.ndarray:
+    """pgvector values (text "[0.1,...]" or lists) -> (N, dim) float32, one json pass."""
+    parts = [v if isinstance(v, str) else json.dumps(v) for v in values]
+    arr = np.asarray(json.loads('[' + ','.join(parts) + ']'), dtype=np.float32)
+    return arr.reshape(len(values), dim)
+
+
+def l2_normalize(x: np.ndarray) -> np.ndarray:
+    """Row-wise L2 normalization (zero rows stay zero)."""
+    x = np.asarray(x, dtype=np.float32)
+    norms = np.linalg.norm(x, axis=-1, keepdims=True)
+    return x / np.where(norms == 0, 1.0, norms)
+
+
+class VQCodebook:
+    """One codebook version with its projection precomputations"""
+
+    def __init__(self, l1: np.ndarray, l2: np.ndarray, version: Optional[str] = None,
+                 codebook_id: Optional[int] = None):
+        self.id = codebook_id
+        self.version = version
+        self.l1 = l1
+        self.l2 = l2
+        self.dim = l1.shape[1]
+        # ||L1[c]||^2 for the level-1 argmin
+        self._l1_sq = np.einsum('ij,ij->i', l1, l1)
+        # ||v - L1[p] - L2[k]||^2 = const - 2 L2[k].v + (||L2[k]||^2 + 2 L2[k].L1[p])
+        parents = np.repeat(np.arange(l1.shape[0]), SUBCODEBOOK_K)[:l2.shape[0]]
+        self._l2_bias = (np.einsum('ij,ij->i', l2, l2)
+                         + 2.0 * np.einsum('ij,ij->i', l2, l1[parents])).reshape(-1, SUBCODEBOOK_K)
+        self._l2_blocks = l2.reshape(-1, SUBCODEBOOK_K, self.dim)
+
+    def project_batch(self, embeddings: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """(N, dim) embeddings -> (vq_primary, vq_secondary) int arrays."""
+        v = l2_normalize(embeddings)
+        if v.ndim == 1:
+            v = v[None, :]
+        primary = np.argmin(self._l1_sq[None, :] - 2.0 * (v @ self.l1.T), axis=1)
+        sub = self._l2_blocks[primary]                       # (N, 8, dim)
+        d2 = self._l2_bias[primary] - 2.0 * np.einsum('nkd,nd->nk', sub, v)
+        secondary = primary * SUBCODEBOOK_K + np.argmin(d2, axis=1)
+        return primary, secondary
+
+    def project(self, embedding) -> Tuple[Optional[int], Optional[int]]:
+        """One embedding -> (vq_primary, vq_secondary), or (None, None) on a dim mismatch."""
+        v = np.asarray(embedding, dtype=np.float32)
+        if v.shape != (self.dim,):
+            return None, None
+        primary, secondary = self.project_batch(v[None, :])
+        return int(primary[0]), int(secondary[0])
+
+
+class VQCodebookStore:
+    """Active-codebook loader with a version-checked .npy cache"""
+
+    def __init__(self, get_client: Callable, config: Optional[VQCodebookConfig] = None):
+        self._get_client = get_client
+        self.config = config or VQCodebookConfig()
+        self._lock = threading.Lock()
+        self._codebook: Optional[VQCodebook] = None
+        self._checked_at = 0.0
+
+    def active(self) -> Optional[VQCodebook]:
+        """Active codebook; the header is re-checked every check_interval_s."""
+        with self._lock:
+            now = time.time()
+            if self._codebook is not None and now - self._checked_at < self.config.check_interval_s:
+                return self._codebook
+            try:
+                header = self._fetch_header()
+                if header is None:
+                    return self._codebook
+                if self._codebook is None or self._codebook.version != header['version']:
+                    codebook = self._load(header)
+                    if codebook is not None:
+                        self._codebook = codebook
+                self._checked_at = now
+            except Exception as e:
+                print(f"   ⚠️ [Trinity Step 12] codebook fetch failed: {e}")
+                # Keep the previous codebook; retry after another interval
+                self._checked_at = now
+            return self._codebook
+
+    def _fetch_header(self) -> Optional[dict]:
+        resp = (self._get_client().table('vq_codebooks')
+                .select('id, version, parent_map, dim')
+                .eq('is_active', True)
+                .order('trained_at', desc=True)
+                .limit(1)
+                .execute())
+        rows = resp.data or []
+        return rows[0] if rows else None
+
+    def _cache_path(self, version: str) -> str:
+        return os.path.join(self.config.cache_dir, f"vq_{version}.npy")
+
+    def _load(self, header: dict) -> Optional[VQCodebook]:
+        dim = header['dim']
+        l2_size = len(header['parent_map'])
+        l1_size = l2_size // SUBCODEBOOK_K
+        path = self._cache_path(header['version'])
+
+        try:
+            stacked = np.load(path, mmap_mode='r')
+            if stacked.shape != (l1_size + l2_size, dim) or stacked.dtype != np.float32:
+                stacked = None
+        except (OSError, ValueError):
+            stacked = None
+
+        if stacked is None:
+            stacked = self._fetch_centroids(header['id'], l1_size, l2_size, dim)
+            if stacked is None:
+                return None
+            self._save(path, stacked)
+
+        return VQCodebook(np.asarray(stacked[:l1_size]), np.asarray(stacked[l1_size:]),
+                          version=header['version'], codebook_id=header['id'])
+
+    def _fetch_centroids(self, codebook_id: int, l1_size: int, l2_size: int, dim: int) -> Optional[np.ndarray]:
+        rows = []
+        offset = 0
+        while True:
+            resp = (self._get_client().table('vq_centroids')
+                    .select('level, idx, vec')
+                    .eq('codebook_id', codebook_id)
+                    .order('level')
+                    .order('idx')
+                    .range(offset, offset + self.config.page_size - 1)
+                    .execute())
+            page = resp.data or []
+            rows.extend(page)
+            offset += self.config.page_size
+            if len(page) < self.config.page_size:
+                break
+        if len(rows) != l1_size + l2_size:
+            print(f"   ⚠️ [Trinity Step 12] codebook {codebook_id} has {len(rows)} centroid rows, "
+                  f"expected {l1_size + l2_size}")
+            return None
+
+        vectors = parse_vectors([r['vec'] for r in rows], dim)
+        stacked = np.zeros((l1_size + l2_size, dim), dtype=np.float32)
+        positions = np.asarray([r['idx'] if r['level'] == 1 else l1_size + r['idx'] for r in rows])
+        stacked[positions] = vectors
+        return stacked
+
+    def _save(self, path: str, stacked: np.ndarray):
+        try:
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+            tmp = f"{path}.{os.getpid()}.tmp.npy"
+            np.save(tmp, stacked)
+            os.replace(tmp, path)
+        except OSError as e:
+            # The cache only saves a re-fetch next time
+            print(f"   ⚠️ [Trinity Step 12] could not cache codebook: {e}")
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_vq_store(get_client: Optional[Callable] = None) -> VQCodebookStore:
+    """Process-wide store (the first caller supplies the client getter)."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            if get_client is None:
+                from supabase_pool import get_supabase_client as get_client
+            _store = VQCodebookStore(get_client)
+        return _store